@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for the logging service.
+
+Benchmarks are standalone scripts run against a live PostgreSQL using the
+same environment variables as the service, e.g.::
+
+    python -m benchmarks.bench_copy_vs_orm --rows 50000
+"""
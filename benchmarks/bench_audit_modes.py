@@ -0,0 +1,73 @@
+"""
+Compare row-level and statement-level audit triggers.
+
+Requires a database initialized with the scripts in ``init-scripts/``.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from src.database import engine
+
+TABLE = "public.audit_bench"
+
+STATEMENTS = {
+    "insert": (
+        f"INSERT INTO {TABLE} (id, payload) "
+        "SELECT uuid_generate_v4(), md5(g::text) FROM generate_series(1, :rows) g"
+    ),
+    "update": f"UPDATE {TABLE} SET payload = upper(payload)",
+    "delete": f"DELETE FROM {TABLE}",
+}
+
+
+async def run_mode(mode: str, rows: int) -> dict:
+    """Run insert/update/delete under one audit mode.
+
+    Args:
+        mode (str): 'none', 'row' or 'statement'
+        rows (int): Rows per statement
+
+    Returns:
+        dict: rows/sec per operation
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        await conn.execute(
+            text(f"CREATE TABLE {TABLE} (id uuid PRIMARY KEY, payload text)")
+        )
+        if mode != "none":
+            await conn.execute(
+                text("SELECT audit.enable_audit(CAST(:t AS regclass), :mode)"),
+                {"t": TABLE, "mode": mode},
+            )
+    results = {}
+    for operation, sql in STATEMENTS.items():
+        async with engine.begin() as conn:
+            started = time.perf_counter()
+            await conn.execute(text(sql), {"rows": rows})
+            results[operation] = rows / (time.perf_counter() - started)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE {TABLE}"))
+        await conn.execute(
+            text("DELETE FROM audit.audit_log WHERE table_name = 'audit_bench'")
+        )
+    return results
+
+
+async def main(rows: int) -> None:
+    """Print rows/sec for each audit mode."""
+    print(f"{'mode':>10} {'insert':>12} {'update':>12} {'delete':>12}  (rows/sec)")
+    for mode in ("none", "row", "statement"):
+        results = await run_mode(mode, rows)
+        columns = (f"{results[op]:>12,.0f}" for op in ("insert", "update", "delete"))
+        print(f"{mode:>10} " + " ".join(columns))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    asyncio.run(main(parser.parse_args().rows))
@@ -0,0 +1,50 @@
+"""
+Measure how long importing src.config takes in a fresh interpreter, and how
+long rebuilding the configuration from the environment takes.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def import_time(module: str) -> tuple:
+    """Import a module in a new interpreter and return its -X importtime row.
+
+    Returns:
+        tuple: Self and cumulative import time of the module in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        self_us, cumulative_us, name = line.split("|")
+        if name.strip() == module:
+            return int(self_us.rsplit(":", 1)[1]), int(cumulative_us)
+    raise RuntimeError(f"{module} was not imported")
+
+
+def main(runs: int, module: str) -> None:
+    """Print median import times and the cost of Config()."""
+    self_us, cumulative_us = zip(*(import_time(module) for _ in range(runs)))
+    print(f"      self: {statistics.median(self_us) / 1000:.2f} ms")
+    print(f"cumulative: {statistics.median(cumulative_us) / 1000:.2f} ms")
+
+    from src.config import Config
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        Config()
+    print(f"  Config(): {(time.perf_counter() - started) * 1000:.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--module", default="src.config")
+    args = parser.parse_args()
+    main(args.runs, args.module)
@@ -0,0 +1,62 @@
+"""
+Compare ORM ``session.add()`` inserts with the writer's binary COPY path.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from src.database import AsyncSessionLocal, engine, init_db
+from src.models import LogEvent
+from src.schemas import LogRecord
+from src.writer import write_log_records
+
+
+def make_records(count: int) -> list:
+    """Build validated records for the benchmark."""
+    now = datetime.now(timezone.utc)
+    return [
+        LogRecord(
+            timestamp=now,
+            level="INFO",
+            service="bench",
+            message=f"benchmark event {i}",
+            attributes={"i": i},
+        )
+        for i in range(count)
+    ]
+
+
+async def orm_insert(records: list) -> None:
+    """Insert records one ORM object at a time, committing once."""
+    async with AsyncSessionLocal() as session:
+        for record in records:
+            session.add(LogEvent(**record.model_dump()))
+        await session.commit()
+
+
+async def main(rows: int) -> None:
+    """Run both insert paths and print rows/sec."""
+    await init_db()
+    records = make_records(rows)
+    results = {}
+    for name, insert in (("orm", orm_insert), ("copy", write_log_records)):
+        async with engine.begin() as conn:
+            await conn.execute(text("TRUNCATE logging.log_events"))
+        started = time.perf_counter()
+        await insert(records)
+        elapsed = time.perf_counter() - started
+        results[name] = rows / elapsed
+        print(
+            f"{name:>5}: {rows} rows in {elapsed:.2f}s ({results[name]:,.0f} rows/sec)"
+        )
+    print(f"speedup: {results['copy'] / results['orm']:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    asyncio.run(main(parser.parse_args().rows))
@@ -0,0 +1,70 @@
+"""
+Measure the per-request overhead of HTTPMetricsMiddleware on a trivial ASGI
+app, compared with calling the app directly.
+"""
+import argparse
+import asyncio
+import time
+
+from src.http_metrics import HTTPMetricsMiddleware
+
+BODY = b'{"status": "healthy"}'
+
+
+class Route:
+    """Stand-in for the route FastAPI records in the scope while routing."""
+
+    path = "/health"
+
+
+ROUTE = Route()
+HEADERS = [
+    (b"host", b"logging.local"),
+    (b"user-agent", b"bench"),
+    (b"accept", b"*/*"),
+    (b"x-real-ip", b"10.0.0.1"),
+]
+
+
+async def endpoint(scope, receive, send) -> None:
+    """Answer like a small JSON endpoint, marking the matched route."""
+    scope["route"] = ROUTE
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": BODY})
+
+
+async def receive() -> dict:
+    """Return an empty request body."""
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None:
+    """Discard response messages."""
+
+
+async def run(app, requests: int) -> float:
+    """Call the app repeatedly and return seconds per request."""
+    started = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/health", "headers": HEADERS}
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def main(requests: int, repeat: int) -> None:
+    """Print the time per request with and without the middleware."""
+    middleware = HTTPMetricsMiddleware(endpoint)
+    bare = min([await run(endpoint, requests) for _ in range(repeat)])
+    wrapped = min([await run(middleware, requests) for _ in range(repeat)])
+    print(f"   bare: {bare * 1e6:.2f} us/request")
+    print(f"metrics: {wrapped * 1e6:.2f} us/request")
+    print(f"overhead: {(wrapped - bare) * 1e6:.2f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.repeat))
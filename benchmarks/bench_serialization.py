@@ -0,0 +1,92 @@
+"""
+Compare the column-walking ``to_dict()`` + ``jsonable_encoder`` response path
+with the cached per-model serializer and orjson, for ORM instances and Core
+row tuples.
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from src.models import LogEvent
+from src.search import SEARCH_COLUMNS
+from src.serialization import dumps, rows_to_dicts, serialize_models
+
+
+def make_events(count: int) -> list:
+    """Build transient log events with every column set."""
+    now = datetime.now(timezone.utc)
+    return [
+        LogEvent(
+            id=uuid.uuid4(),
+            timestamp=now - timedelta(milliseconds=i),
+            level="INFO",
+            service="bench",
+            message=f"benchmark event {i}",
+            attributes={"i": i, "path": "/logs/search"},
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def column_walk(events: list) -> bytes:
+    """Serialize the way ``Base.to_dict()`` and FastAPI used to."""
+    dicts = [
+        {column.name: getattr(event, column.name) for column in event.__table__.columns}
+        for event in events
+    ]
+    return json.dumps(jsonable_encoder(dicts)).encode()
+
+
+def cached_serializer(events: list) -> bytes:
+    """Serialize ORM instances with the cached serializer and orjson."""
+    return dumps(serialize_models(events))
+
+
+def core_rows(rows: list) -> bytes:
+    """Serialize Core row tuples without ORM hydration."""
+    keys = [column.key for column in SEARCH_COLUMNS]
+    return dumps(rows_to_dicts(keys, rows))
+
+
+def best_of(func, arg, repeat: int) -> float:
+    """Return the fastest of several timed runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(rows: int, repeat: int) -> None:
+    """Run every serialization path and print rows/sec."""
+    events = make_events(rows)
+    tuples = [
+        tuple(getattr(event, column.key) for column in SEARCH_COLUMNS)
+        for event in events
+    ]
+    baseline = best_of(column_walk, events, repeat)
+    print(f"{'to_dict':>8}: {rows / baseline:>12,.0f} rows/sec")
+    for name, func, arg in (
+        ("cached", cached_serializer, events),
+        ("rows", core_rows, tuples),
+    ):
+        elapsed = best_of(func, arg, repeat)
+        print(
+            f"{name:>8}: {rows / elapsed:>12,.0f} rows/sec "
+            f"({baseline / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
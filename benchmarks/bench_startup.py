@@ -0,0 +1,81 @@
+"""
+Measure worker startup: importing src.main in a fresh interpreter with
+-X importtime, then building the application with create_app().
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Tuple
+
+# Modules a worker should not import until the feature using them runs
+DEFERRED_MODULES = (
+    "opentelemetry",
+    "grpc",
+    "asyncpg",
+)
+
+
+def is_deferred(name: str) -> bool:
+    """Tell whether a module belongs to one of DEFERRED_MODULES."""
+    return any(
+        name == prefix or name.startswith(prefix + ".") for prefix in DEFERRED_MODULES
+    )
+
+
+def import_profile(module: str = "src.main") -> Dict[str, Tuple[int, int]]:
+    """Import a module in a new interpreter and collect its -X importtime rows.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Dict[str, Tuple[int, int]]: Self and cumulative import time in
+        microseconds for every module imported, by name
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.split("|")
+        try:
+            profile[name.strip()] = (int(self_us.rsplit(":", 1)[1]), int(cumulative_us))
+        except ValueError:
+            continue  # header row
+    return profile
+
+
+def main(runs: int, module: str, top: int) -> None:
+    """Print the median import time, the slowest imports and create_app()."""
+    profiles = [import_profile(module) for _ in range(runs)]
+    total = statistics.median(profile[module][1] for profile in profiles)
+    print(f"import {module}: {total / 1000:.1f} ms")
+
+    slowest = sorted(profiles[-1].items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_us, _) in slowest[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    deferred = [name for name in profiles[-1] if is_deferred(name)]
+    print(f"deferred modules imported: {len(deferred)}")
+
+    from src.main import create_app
+
+    started = time.perf_counter()
+    create_app()
+    print(f"create_app(): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.runs, args.module, args.top)
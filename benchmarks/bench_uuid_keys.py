@@ -0,0 +1,84 @@
+"""
+Compare UUIDv4 and UUIDv7 primary keys: insert throughput and B-tree index
+size on a multi-million-row table.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, Text, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.database import copy_records, engine
+from src.models.ids import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def make_table(metadata: MetaData, name: str) -> Table:
+    """Define an unpartitioned table keyed only by a UUID."""
+    return Table(
+        f"bench_keys_{name}",
+        metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("payload", Text, nullable=False),
+    )
+
+
+async def load(table: Table, generate, rows: int, batch_size: int) -> float:
+    """COPY rows in batches and return the elapsed seconds.
+
+    Throughput of the last tenth of the load is printed as well: once the
+    index outgrows shared_buffers, random v4 keys touch a different leaf
+    page on almost every insert while v7 keys keep appending to one.
+    """
+    started = time.perf_counter()
+    tail_from = rows - rows // 10
+    tail_started = None
+    for offset in range(0, rows, batch_size):
+        if tail_started is None and offset >= tail_from:
+            tail_started = time.perf_counter()
+        count = min(batch_size, rows - offset)
+        await copy_records(
+            table, ("id", "payload"), [(generate(), "x") for _ in range(count)]
+        )
+    finished = time.perf_counter()
+    if tail_started is not None:
+        tail_rate = (rows - tail_from) / (finished - tail_started)
+        print(f"{'':>7}last 10%: {tail_rate:,.0f} rows/sec")
+    return finished - started
+
+
+async def main(rows: int, batch_size: int) -> None:
+    """Load each table and print rows/sec and primary key index size."""
+    metadata = MetaData()
+    tables = {name: make_table(metadata, name) for name in GENERATORS}
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+    try:
+        for name, generate in GENERATORS.items():
+            elapsed = await load(tables[name], generate, rows, batch_size)
+            async with engine.connect() as conn:
+                size = await conn.scalar(
+                    text("SELECT pg_relation_size(:index)"),
+                    {"index": f"{tables[name].name}_pkey"},
+                )
+            print(
+                f"{name:>7}: {rows} rows in {elapsed:.2f}s "
+                f"({rows / elapsed:,.0f} rows/sec), "
+                f"pkey {size / 2**20:,.1f} MiB"
+            )
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch_size))
@@ -31,11 +31,21 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- Create trigger for client info
+-- Statement-level auditing fills client_info itself, so skip the call then
 CREATE TRIGGER set_client_info_trigger
     BEFORE INSERT ON audit.audit_log
     FOR EACH ROW
+    WHEN (NEW.client_info IS NULL)
     EXECUTE FUNCTION audit.set_client_info();
 
+-- Create function returning keys whose values differ between two objects
+CREATE OR REPLACE FUNCTION jsonb_diff_val(val1 jsonb, val2 jsonb)
+RETURNS jsonb AS $$
+    SELECT COALESCE(jsonb_object_agg(n.key, n.value), '{}'::jsonb)
+    FROM jsonb_each(val2) n
+    WHERE val1 -> n.key IS DISTINCT FROM n.value;
+$$ LANGUAGE sql IMMUTABLE;
+
 -- Create view for recent changes
 CREATE OR REPLACE VIEW audit.recent_changes AS
 SELECT 
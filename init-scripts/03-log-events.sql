@@ -0,0 +1,20 @@
+-- Create log events table, range-partitioned by day on timestamp.
+-- Daily partitions are created ahead of time and dropped after
+-- LOG_RETENTION_DAYS by the service's partition maintenance task.
+CREATE TABLE IF NOT EXISTS logging.log_events (
+    id uuid DEFAULT uuid_generate_v4(),
+    timestamp timestamp with time zone NOT NULL,
+    level varchar(16) NOT NULL,
+    service varchar(255) NOT NULL,
+    message text NOT NULL,
+    attributes jsonb NOT NULL DEFAULT '{}'::jsonb,
+    created_at timestamp with time zone NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at timestamp with time zone NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_by varchar,
+    updated_by varchar,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Create indexes for log events (cascaded to every partition).
+-- (timestamp, id) serves time-range scans and keyset pagination.
+CREATE INDEX IF NOT EXISTS idx_log_events_timestamp_id ON logging.log_events(timestamp, id);
\ No newline at end of file
@@ -0,0 +1,102 @@
+-- Statement-level audit function using transition tables.
+-- Writes one set-based INSERT per statement instead of one INSERT per row.
+-- Audited tables must have an "id" column to pair old and new rows on UPDATE.
+CREATE OR REPLACE FUNCTION audit.log_changes_statement()
+RETURNS trigger AS $$
+DECLARE
+    info jsonb := jsonb_build_object(
+        'application_name', current_setting('application_name', true),
+        'ip_address', current_setting('log_service.client_ip', true),
+        'user_agent', current_setting('log_service.user_agent', true),
+        'session_id', current_setting('log_service.session_id', true)
+    );
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO audit.audit_log (
+            table_name,
+            operation,
+            new_data,
+            changed_by,
+            client_info
+        )
+        SELECT TG_TABLE_NAME::text, 'INSERT', to_jsonb(n), current_user, info
+        FROM new_rows n;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO audit.audit_log (
+            table_name,
+            operation,
+            old_data,
+            new_data,
+            changed_by,
+            client_info
+        )
+        SELECT TG_TABLE_NAME::text, 'UPDATE', to_jsonb(o), to_jsonb(n), current_user, info
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO audit.audit_log (
+            table_name,
+            operation,
+            old_data,
+            changed_by,
+            client_info
+        )
+        SELECT TG_TABLE_NAME::text, 'DELETE', to_jsonb(o), current_user, info
+        FROM old_rows o;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Enable auditing on a table in 'row' or 'statement' mode.
+-- Re-running switches modes; existing audit triggers are replaced.
+CREATE OR REPLACE FUNCTION audit.enable_audit(target regclass, mode text DEFAULT 'row')
+RETURNS void AS $$
+BEGIN
+    IF mode NOT IN ('row', 'statement') THEN
+        RAISE EXCEPTION 'Invalid audit mode: %', mode;
+    END IF;
+
+    PERFORM audit.disable_audit(target);
+
+    IF mode = 'row' THEN
+        EXECUTE format(
+            'CREATE TRIGGER audit_row_trigger '
+            'AFTER INSERT OR UPDATE OR DELETE ON %s '
+            'FOR EACH ROW EXECUTE FUNCTION audit.log_changes()',
+            target
+        );
+    ELSE
+        -- Transition tables require one trigger per event
+        EXECUTE format(
+            'CREATE TRIGGER audit_insert_statement_trigger '
+            'AFTER INSERT ON %s REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION audit.log_changes_statement()',
+            target
+        );
+        EXECUTE format(
+            'CREATE TRIGGER audit_update_statement_trigger '
+            'AFTER UPDATE ON %s REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION audit.log_changes_statement()',
+            target
+        );
+        EXECUTE format(
+            'CREATE TRIGGER audit_delete_statement_trigger '
+            'AFTER DELETE ON %s REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION audit.log_changes_statement()',
+            target
+        );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Remove all audit triggers from a table
+CREATE OR REPLACE FUNCTION audit.disable_audit(target regclass)
+RETURNS void AS $$
+BEGIN
+    EXECUTE format('DROP TRIGGER IF EXISTS audit_row_trigger ON %s', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS audit_insert_statement_trigger ON %s', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS audit_update_statement_trigger ON %s', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS audit_delete_statement_trigger ON %s', target);
+END;
+$$ LANGUAGE plpgsql;
\ No newline at end of file
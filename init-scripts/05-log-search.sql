@@ -0,0 +1,8 @@
+-- Indexes backing GET /logs/search.
+-- Service filters seek on (service, timestamp, id) in keyset order.
+CREATE INDEX IF NOT EXISTS idx_log_events_service_timestamp_id
+    ON logging.log_events(service, timestamp, id);
+
+-- Trigram index for substring (ILIKE) and regular expression message search
+CREATE INDEX IF NOT EXISTS idx_log_events_message_trgm
+    ON logging.log_events USING gin (message gin_trgm_ops);
\ No newline at end of file
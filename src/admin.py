@@ -0,0 +1,73 @@
+"""
+Administrative API for runtime operations, guarded by the service secret.
+"""
+import hmac
+from typing import Dict, List, Optional
+
+import structlog
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from src.config import config
+from src.logging_setup import get_logger_levels, set_logger_level
+from src.reload import config_reloader
+from src.schemas import ConfigReload, LoggerLevelUpdate
+
+logger = structlog.get_logger(__name__)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Check the ``X-Admin-Token`` header against SECRET_KEY.
+
+    Args:
+        x_admin_token (Optional[str]): Token sent by the caller
+
+    Raises:
+        HTTPException: 403 if SECRET_KEY is unset, 401 if the token is wrong
+    """
+    secret = config.security.SECRET_KEY
+    if not secret:
+        raise HTTPException(
+            status_code=403, detail="Admin API is disabled: SECRET_KEY is not set"
+        )
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode(), secret.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/log-levels")
+async def list_log_levels() -> Dict[str, str]:
+    """Return the levels set on the root and named loggers."""
+    return get_logger_levels()
+
+
+@router.put("/log-levels/{name}")
+async def update_log_level(name: str, update: LoggerLevelUpdate) -> Dict[str, str]:
+    """Change a logger's level in every worker without a restart."""
+    set_logger_level(name, update.level)
+    await config_reloader.publish({}, log_levels={name: update.level})
+    logger.warning("Log level changed", logger_name=name, new_level=update.level)
+    return {"logger": name, "level": update.level}
+
+
+@router.post("/config/reload")
+async def reload_config(
+    update: Optional[ConfigReload] = None,
+) -> Dict[str, List[str]]:
+    """Reload configuration in every worker without a restart.
+
+    The .env file is read again and any overrides are applied on top. The
+    new configuration is validated as a whole before it replaces the old
+    one, then published so the other workers apply the same change.
+    """
+    overrides = update.overrides if update else {}
+    unknown = sorted(set(overrides) - config.as_dict().keys())
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown settings: {unknown}")
+    try:
+        return await config_reloader.reload(overrides, source="admin")
+    except (AssertionError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -0,0 +1,220 @@
+"""
+Shared Redis connection pool and batched command helpers.
+"""
+import asyncio
+import time
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Union
+
+import redis.asyncio as redis
+import structlog
+from prometheus_client import Gauge, Histogram
+from redis.asyncio.connection import AbstractConnection, BlockingConnectionPool
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+POOL_MAX = Gauge(
+    "redis_pool_max_connections",
+    "Maximum connections in the Redis pool",
+    multiprocess_mode="livesum",
+)
+POOL_OPEN = Gauge(
+    "redis_pool_open_connections",
+    "Connections currently open in the Redis pool",
+    multiprocess_mode="livesum",
+)
+POOL_IN_USE = Gauge(
+    "redis_pool_in_use_connections",
+    "Redis connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+POOL_WAIT = Histogram(
+    "redis_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the Redis pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+Value = Union[bytes, str, int, float]
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking connection pool that reports utilisation to Prometheus.
+
+    Callers over the pool limit wait up to ``timeout`` seconds for a free
+    connection instead of failing immediately.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the pool and publish its size."""
+        super().__init__(*args, **kwargs)
+        POOL_MAX.set(self.max_connections)
+
+    async def get_connection(
+        self, command_name: Any, *keys: Any, **options: Any
+    ) -> AbstractConnection:
+        """Check a connection out of the pool, recording the wait time."""
+        started = time.perf_counter()
+        connection: AbstractConnection = await super().get_connection(
+            command_name, *keys, **options
+        )
+        POOL_WAIT.observe(time.perf_counter() - started)
+        POOL_IN_USE.inc()
+        self._report_open()
+        return connection
+
+    async def release(self, connection: AbstractConnection) -> None:
+        """Return a connection to the pool."""
+        await super().release(connection)
+        POOL_IN_USE.dec()
+        self._report_open()
+
+    def _report_open(self) -> None:
+        """Publish the number of open connections."""
+        open_connections = len(self._available_connections) + len(
+            self._in_use_connections
+        )
+        POOL_OPEN.set(open_connections)
+
+
+_client: Optional[redis.Redis] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def create_pool() -> InstrumentedConnectionPool:
+    """Create a connection pool from RedisConfig and PerformanceConfig.
+
+    Returns:
+        InstrumentedConnectionPool: New, unconnected pool
+    """
+    return InstrumentedConnectionPool(
+        host=config.redis.REDIS_HOST,
+        port=config.redis.REDIS_PORT,
+        db=config.redis.REDIS_DB,
+        password=config.redis.REDIS_PASSWORD or None,
+        max_connections=config.performance.REDIS_POOL_SIZE,
+        timeout=config.performance.REDIS_POOL_TIMEOUT,
+    )
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client, creating it on first use.
+
+    Connections belong to the event loop that opened them, so a new pool is
+    created if the client is requested from a different loop.
+
+    Returns:
+        redis.Redis: Client backed by the shared pool
+    """
+    global _client, _loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _loop is not loop:
+        _client = redis.Redis(connection_pool=create_pool())
+        _loop = loop
+    return _client
+
+
+async def init_redis() -> redis.Redis:
+    """Create the shared Redis pool for the running application.
+
+    Returns:
+        redis.Redis: Client backed by the shared pool
+    """
+    client = get_redis()
+    logger.info(
+        "Redis pool created",
+        host=config.redis.REDIS_HOST,
+        max_connections=config.performance.REDIS_POOL_SIZE,
+    )
+    return client
+
+
+async def close_redis() -> None:
+    """Disconnect every connection in the shared pool."""
+    global _client, _loop
+    client, loop = _client, _loop
+    _client = _loop = None
+    if client is None or loop is not asyncio.get_running_loop():
+        # Connections opened on another (now finished) loop cannot be awaited
+        return
+    await client.connection_pool.disconnect()
+    POOL_IN_USE.set(0)
+    POOL_OPEN.set(0)
+
+
+async def prime_redis(connections: int) -> int:
+    """Open connections in the shared pool before traffic needs them.
+
+    The connections are checked out together, so each is a separate socket,
+    then returned to the pool idle.
+
+    Args:
+        connections (int): Connections to open, at most REDIS_POOL_SIZE
+
+    Returns:
+        int: Number of connections opened
+    """
+    pool = get_redis().connection_pool
+    results = await asyncio.gather(
+        *(pool.get_connection("PING") for _ in range(connections)),
+        return_exceptions=True,
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    for connection in opened:
+        await pool.release(connection)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(opened)
+
+
+async def get_many(keys: Sequence[str]) -> List[Optional[bytes]]:
+    """Fetch many keys in one round trip.
+
+    Args:
+        keys (Sequence[str]): Keys to fetch
+
+    Returns:
+        List[Optional[bytes]]: Values in key order, None for missing keys
+    """
+    if not keys:
+        return []
+    values: List[Optional[bytes]] = await get_redis().mget(keys)
+    return values
+
+
+async def set_many(items: Mapping[str, Value], ttl: Optional[int] = None) -> None:
+    """Store many keys in one pipelined round trip.
+
+    Args:
+        items (Mapping[str, Value]): Keys and values to store
+        ttl (Optional[int]): Expiry in seconds applied to every key
+    """
+    if not items:
+        return
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for key, value in items.items():
+            pipe.set(key, value, ex=ttl)
+        await pipe.execute()
+
+
+async def xadd_many(
+    stream: str,
+    entries: Iterable[Mapping[str, Value]],
+    maxlen: Optional[int] = None,
+) -> List[bytes]:
+    """Append many entries to a stream in one pipelined round trip.
+
+    Args:
+        stream (str): Stream key
+        entries (Iterable[Mapping[str, Value]]): Entry field maps
+        maxlen (Optional[int]): Approximate stream length cap
+
+    Returns:
+        List[bytes]: IDs of the appended entries
+    """
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for fields in entries:
+            pipe.xadd(stream, dict(fields.items()), maxlen=maxlen, approximate=True)
+        ids: List[bytes] = await pipe.execute()
+    return ids
@@ -4,114 +4,413 @@
 This module handles loading and validating environment variables,
 providing a centralized configuration for the application.
 """
+import hashlib
+import ipaddress
 import os
-from dataclasses import dataclass
-from typing import List, Optional
-from dotenv import load_dotenv
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    dataclass_transform,
+)
+
+from dotenv import find_dotenv, load_dotenv
+
+# Variables set in the real environment win over the .env file, also on reload
+PROCESS_ENV = frozenset(os.environ)
+ENV_FILE = find_dotenv()
 
 # Load environment variables
-load_dotenv()
+load_dotenv(ENV_FILE)
 
-@dataclass
+RATE_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+@lru_cache(maxsize=32)
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """Parse a rate such as ``100/minute`` into a limit and period.
+
+    Args:
+        rate (str): Rate in ``<count>/<second|minute|hour|day>`` form
+
+    Returns:
+        Tuple[int, int]: Request limit and period in seconds
+
+    Raises:
+        ValueError: If the rate is malformed
+    """
+    count, _, unit = rate.partition("/")
+    unit = unit.strip().lower().rstrip("s")
+    if unit not in RATE_PERIODS or not count.strip().isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+    return int(count), RATE_PERIODS[unit]
+
+
+@lru_cache(maxsize=32)
+def parse_sample_rates(rates: str) -> Dict[str, int]:
+    """Parse log sampling rates such as ``Health check=100,Cache miss=10``.
+
+    Args:
+        rates (str): Comma-separated ``<event>=<keep one in N>`` pairs
+
+    Returns:
+        Dict[str, int]: Sampling rate per event name
+
+    Raises:
+        ValueError: If a pair is malformed
+    """
+    parsed = {}
+    for pair in filter(str.strip, rates.split(",")):
+        event, _, rate = pair.rpartition("=")
+        if not event.strip() or not rate.strip().isdigit() or int(rate) < 1:
+            raise ValueError(f"Invalid sample rate: {pair!r}")
+        parsed[event.strip()] = int(rate)
+    return parsed
+
+
+@lru_cache(maxsize=32)
+def parse_size(size: str) -> int:
+    """Parse a size such as ``10MB`` into bytes.
+
+    Args:
+        size (str): Size in ``<count>[B|KB|MB|GB]`` form, binary multiples
+
+    Returns:
+        int: Size in bytes
+
+    Raises:
+        ValueError: If the size is malformed
+    """
+    text = size.strip().upper()
+    digits = text.rstrip("BKMG")
+    unit = text[len(digits) :]
+    if unit not in SIZE_UNITS or not digits.strip().isdigit() or int(digits) < 1:
+        raise ValueError(f"Invalid size: {size!r}")
+    return int(digits) * SIZE_UNITS[unit]
+
+
+def api_key_digest(key: Union[str, bytes]) -> str:
+    """Hash an API key for lookups, rate limit buckets and log-safe display.
+
+    Args:
+        key (Union[str, bytes]): API key as sent by the client
+
+    Returns:
+        str: Hex digest of the key
+    """
+    raw = key.encode() if isinstance(key, str) else key
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def env_list(name: str, default: str = "") -> List[str]:
+    """Read a comma-separated environment variable, skipping empty items.
+
+    Args:
+        name (str): Variable name
+        default (str): Value used when the variable is unset
+
+    Returns:
+        List[str]: Stripped items
+    """
+    items = os.getenv(name, default).split(",")
+    return [item.strip() for item in items if item.strip()]
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Read a boolean environment variable.
+
+    Args:
+        name (str): Variable name
+        default (bool): Value used when the variable is unset
+
+    Returns:
+        bool: True if the variable is ``true`` in any case
+    """
+    value = os.getenv(name)
+    return default if value is None else value.lower() == "true"
+
+
+SettingsClass = TypeVar("SettingsClass")
+
+
+# Settings sections are immutable and slotted: a change means building and
+# swapping a whole new section. Generated __repr__ and __eq__ are left out,
+# which keeps credentials out of log lines and tracebacks and pays for the
+# extra code generated for frozen classes at import time.
+@dataclass_transform(frozen_default=True, field_specifiers=(field,))
+def settings(cls: Type[SettingsClass]) -> Type[SettingsClass]:
+    """Turn a class into a frozen, slotted settings section.
+
+    Args:
+        cls (Type[SettingsClass]): Class with annotated settings
+
+    Returns:
+        Type[SettingsClass]: The generated dataclass
+    """
+    return dataclass(frozen=True, slots=True, repr=False, eq=False)(cls)
+
+
+@settings
 class AppConfig:
     """Application configuration settings."""
+
     APP_NAME: str
     ENVIRONMENT: str
     DEBUG: bool
     LOG_LEVEL: str
 
-@dataclass
+
+@settings
 class ServerConfig:
     """Server configuration settings."""
+
     HOST: str
     PORT: int
 
-@dataclass
+
+@settings
 class LoggingConfig:
     """Logging configuration settings."""
+
     LOG_FORMAT: str
     LOG_OUTPUT: str
     LOG_FILE_PATH: Optional[str]
     LOG_ROTATION_SIZE: str
     LOG_RETENTION_DAYS: int
-
-@dataclass
+    LOG_PARTITION_PRECREATE_DAYS: int
+    LOG_PARTITION_CHECK_INTERVAL: int
+    LOG_QUEUE_SIZE: int
+    LOG_QUEUE_OVERFLOW: str
+    LOG_QUEUE_SAMPLE_RATE: int
+    LOG_COMPRESSION: str
+    LOG_FSYNC_INTERVAL_MS: int
+    LOG_SAMPLE_RATES: str
+    LOG_ROTATION_BYTES: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Parse LOG_ROTATION_SIZE once.
+
+        Raises:
+            AssertionError: If LOG_ROTATION_SIZE is malformed
+        """
+        try:
+            rotation_bytes = parse_size(self.LOG_ROTATION_SIZE)
+        except ValueError as exc:
+            raise AssertionError("Invalid LOG_ROTATION_SIZE") from exc
+        object.__setattr__(self, "LOG_ROTATION_BYTES", rotation_bytes)
+
+
+@settings
 class DatabaseConfig:
     """Database configuration settings."""
+
     DB_HOST: str
     DB_PORT: int
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
-
-@dataclass
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
+    DB_POOL_TIMEOUT: int
+    DB_POOL_RECYCLE: int
+    DB_POOL_PRE_PING: bool
+    DB_MAX_CONNECTIONS: int
+    DB_PGBOUNCER: bool
+    DB_REPLICA_HOSTS: List[str]
+    DB_REPLICA_EJECT_SECONDS: int
+
+
+@settings
 class RedisConfig:
     """Redis configuration settings."""
+
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_DB: int
     REDIS_PASSWORD: str
 
-@dataclass
+
+@settings
 class SecurityConfig:
     """Security configuration settings."""
+
     SECRET_KEY: str
     ALLOWED_HOSTS: List[str]
     CORS_ORIGINS: List[str]
-
-@dataclass
+    API_KEYS: List[str]
+    TRUSTED_PROXIES: List[str]
+    API_KEY_DIGESTS: FrozenSet[str] = field(init=False)
+    TRUSTED_PROXY_NETWORKS: Tuple[Any, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Hash API keys and parse trusted proxy addresses once.
+
+        Raises:
+            AssertionError: If TRUSTED_PROXIES holds an invalid address
+        """
+        try:
+            networks = tuple(
+                ipaddress.ip_network(proxy, strict=False)
+                for proxy in self.TRUSTED_PROXIES
+            )
+        except ValueError as exc:
+            raise AssertionError("Invalid TRUSTED_PROXIES") from exc
+        digests = frozenset(api_key_digest(key) for key in self.API_KEYS)
+        object.__setattr__(self, "API_KEY_DIGESTS", digests)
+        object.__setattr__(self, "TRUSTED_PROXY_NETWORKS", networks)
+
+
+@settings
 class RateLimitConfig:
     """Rate limiting configuration settings."""
+
     RATE_LIMIT_ENABLED: bool
     RATE_LIMIT_DEFAULT: str
+    RATE_LIMIT_PREFETCH: int
+    RATE_LIMIT_WINDOW: Optional[Tuple[int, int]] = field(init=False)
 
-@dataclass
+    def __post_init__(self) -> None:
+        """Parse RATE_LIMIT_DEFAULT once into a limit and period in seconds.
+
+        A malformed rate is only an error while rate limiting is enabled;
+        otherwise the window is None.
+
+        Raises:
+            AssertionError: If rate limiting is enabled and
+                RATE_LIMIT_DEFAULT is malformed
+        """
+        try:
+            window = parse_rate(self.RATE_LIMIT_DEFAULT)
+        except ValueError as exc:
+            if self.RATE_LIMIT_ENABLED:
+                raise AssertionError("Invalid RATE_LIMIT_DEFAULT") from exc
+            window = None
+        object.__setattr__(self, "RATE_LIMIT_WINDOW", window)
+
+
+@settings
 class MonitoringConfig:
     """Monitoring configuration settings."""
+
     ENABLE_METRICS: bool
     METRICS_PORT: int
-
-@dataclass
+    ENABLE_TRACING: bool
+    OTEL_EXPORTER_OTLP_ENDPOINT: str
+    TRACE_SAMPLE_RATIO: float
+    TRACE_TAIL_SAMPLING: bool
+    TRACE_SLOW_THRESHOLD_MS: int
+    TRACE_QUEUE_SIZE: int
+    TRACE_EXPORT_BATCH_SIZE: int
+    HEALTH_CHECK_INTERVAL_MS: int
+    HEALTH_PROBE_TIMEOUT_MS: int
+    HEALTH_QUEUE_HIGH_WATER: float
+
+
+@settings
 class DependencyConfig:
     """Service dependency configuration settings."""
+
     DEPENDENT_SERVICE_URL: str
     DEPENDENT_SERVICE_TIMEOUT: int
 
-@dataclass
+
+@settings
 class FeatureConfig:
     """Feature flag configuration settings."""
+
     ENABLE_BATCH_PROCESSING: bool
     ENABLE_ASYNC_LOGGING: bool
+    ENABLE_STREAM_INGESTION: bool
+    ENABLE_WARMUP: bool
 
-@dataclass
+
+@settings
 class PerformanceConfig:
     """Performance tuning configuration settings."""
+
     WORKER_PROCESSES: int
     THREAD_POOL_SIZE: int
     MAX_QUEUE_SIZE: int
-
-@dataclass
+    MAX_BATCH_SIZE: int
+    WRITER_BATCH_SIZE: int
+    WRITER_FLUSH_INTERVAL_MS: int
+    REDIS_POOL_SIZE: int
+    REDIS_POOL_TIMEOUT: int
+    STREAM_MAX_LENGTH: int
+    STREAM_CLAIM_IDLE_MS: int
+    STREAM_MAX_DELIVERIES: int
+    EXPORT_FETCH_SIZE: int
+    SEARCH_TIMEOUT_MS: int
+    WARMUP_TIMEOUT_MS: int
+    WARMUP_REDIS_CONNECTIONS: int
+    SHUTDOWN_TIMEOUT: float
+    MAX_BODY_SIZE: str
+    MAX_BODY_BYTES: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Parse MAX_BODY_SIZE once.
+
+        Raises:
+            AssertionError: If MAX_BODY_SIZE is malformed
+        """
+        try:
+            body_bytes = parse_size(self.MAX_BODY_SIZE)
+        except ValueError as exc:
+            raise AssertionError("Invalid MAX_BODY_SIZE") from exc
+        object.__setattr__(self, "MAX_BODY_BYTES", body_bytes)
+
+
+@settings
 class BackupConfig:
     """Backup configuration settings."""
+
     BACKUP_ENABLED: bool
     BACKUP_RETENTION_DAYS: int
     BACKUP_S3_BUCKET: str
 
-class Config:
-    """Main configuration class that aggregates all config sections."""
 
-    def __init__(self):
+class Config:
+    """Main configuration class that aggregates all config sections.
+
+    Sections are immutable; the aggregate only ever swaps whole sections,
+    so a reader always sees one consistent section.
+    """
+
+    __slots__ = (
+        "app",
+        "server",
+        "logging",
+        "database",
+        "redis",
+        "security",
+        "rate_limit",
+        "monitoring",
+        "dependencies",
+        "features",
+        "performance",
+        "backup",
+    )
+
+    def __init__(self) -> None:
         """Initialize configuration from environment variables."""
         self.app = AppConfig(
             APP_NAME=os.getenv("APP_NAME", "logging_service"),
             ENVIRONMENT=os.getenv("ENVIRONMENT", "development"),
-            DEBUG=str(os.getenv("DEBUG", "True")).lower() == "true",
-            LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO")
+            DEBUG=env_flag("DEBUG", True),
+            LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
         )
 
         self.server = ServerConfig(
-            HOST=os.getenv("HOST", "0.0.0.0"),
-            PORT=int(os.getenv("PORT", "8000"))
+            HOST=os.getenv("HOST", "0.0.0.0"), PORT=int(os.getenv("PORT", "8000"))
         )
 
         self.logging = LoggingConfig(
@@ -119,7 +418,22 @@ def __init__(self):
             LOG_OUTPUT=os.getenv("LOG_OUTPUT", "stdout"),
             LOG_FILE_PATH=os.getenv("LOG_FILE_PATH"),
             LOG_ROTATION_SIZE=os.getenv("LOG_ROTATION_SIZE", "10MB"),
-            LOG_RETENTION_DAYS=int(os.getenv("LOG_RETENTION_DAYS", "30"))
+            LOG_RETENTION_DAYS=int(os.getenv("LOG_RETENTION_DAYS", "30")),
+            LOG_PARTITION_PRECREATE_DAYS=int(
+                os.getenv("LOG_PARTITION_PRECREATE_DAYS", "3")
+            ),
+            LOG_PARTITION_CHECK_INTERVAL=int(
+                os.getenv("LOG_PARTITION_CHECK_INTERVAL", "3600")
+            ),
+            LOG_QUEUE_SIZE=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            LOG_QUEUE_OVERFLOW=os.getenv("LOG_QUEUE_OVERFLOW", "drop_oldest"),
+            LOG_QUEUE_SAMPLE_RATE=int(os.getenv("LOG_QUEUE_SAMPLE_RATE", "10")),
+            LOG_COMPRESSION=os.getenv("LOG_COMPRESSION", "gzip"),
+            LOG_FSYNC_INTERVAL_MS=int(os.getenv("LOG_FSYNC_INTERVAL_MS", "1000")),
+            LOG_SAMPLE_RATES=os.getenv(
+                "LOG_SAMPLE_RATES",
+                "Root endpoint accessed=100,Health check endpoint accessed=100",
+            ),
         )
 
         self.database = DatabaseConfig(
@@ -127,80 +441,216 @@ def __init__(self):
             DB_PORT=int(os.getenv("DB_PORT", "5432")),
             DB_NAME=os.getenv("DB_NAME", "logging_db"),
             DB_USER=os.getenv("DB_USER", "logger"),
-            DB_PASSWORD=os.getenv("DB_PASSWORD", "")
+            DB_PASSWORD=os.getenv("DB_PASSWORD", ""),
+            DB_POOL_SIZE=int(os.getenv("DB_POOL_SIZE", "5")),
+            DB_MAX_OVERFLOW=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            DB_POOL_TIMEOUT=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+            DB_POOL_RECYCLE=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            DB_POOL_PRE_PING=env_flag("DB_POOL_PRE_PING", False),
+            DB_MAX_CONNECTIONS=int(os.getenv("DB_MAX_CONNECTIONS", "0")),
+            DB_PGBOUNCER=env_flag("DB_PGBOUNCER", False),
+            DB_REPLICA_HOSTS=env_list("DB_REPLICA_HOSTS"),
+            DB_REPLICA_EJECT_SECONDS=int(os.getenv("DB_REPLICA_EJECT_SECONDS", "30")),
         )
 
         self.redis = RedisConfig(
             REDIS_HOST=os.getenv("REDIS_HOST", "localhost"),
             REDIS_PORT=int(os.getenv("REDIS_PORT", "6379")),
             REDIS_DB=int(os.getenv("REDIS_DB", "0")),
-            REDIS_PASSWORD=os.getenv("REDIS_PASSWORD", "")
+            REDIS_PASSWORD=os.getenv("REDIS_PASSWORD", ""),
         )
 
         self.security = SecurityConfig(
             SECRET_KEY=os.getenv("SECRET_KEY", ""),
             ALLOWED_HOSTS=os.getenv("ALLOWED_HOSTS", "localhost").split(","),
-            CORS_ORIGINS=os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+            CORS_ORIGINS=os.getenv("CORS_ORIGINS", "http://localhost:3000").split(","),
+            API_KEYS=env_list("API_KEYS"),
+            TRUSTED_PROXIES=env_list("TRUSTED_PROXIES", "127.0.0.1,::1"),
         )
 
         self.rate_limit = RateLimitConfig(
-            RATE_LIMIT_ENABLED=str(os.getenv("RATE_LIMIT_ENABLED", "True")).lower() == "true",
-            RATE_LIMIT_DEFAULT=os.getenv("RATE_LIMIT_DEFAULT", "100/minute")
+            RATE_LIMIT_ENABLED=env_flag("RATE_LIMIT_ENABLED", True),
+            RATE_LIMIT_DEFAULT=os.getenv("RATE_LIMIT_DEFAULT", "100/minute"),
+            RATE_LIMIT_PREFETCH=int(os.getenv("RATE_LIMIT_PREFETCH", "10")),
         )
 
         self.monitoring = MonitoringConfig(
-            ENABLE_METRICS=str(os.getenv("ENABLE_METRICS", "True")).lower() == "true",
-            METRICS_PORT=int(os.getenv("METRICS_PORT", "9090"))
+            ENABLE_METRICS=env_flag("ENABLE_METRICS", True),
+            METRICS_PORT=int(os.getenv("METRICS_PORT", "9090")),
+            ENABLE_TRACING=env_flag("ENABLE_TRACING", False),
+            OTEL_EXPORTER_OTLP_ENDPOINT=os.getenv(
+                "OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"
+            ),
+            TRACE_SAMPLE_RATIO=float(os.getenv("TRACE_SAMPLE_RATIO", "0.05")),
+            TRACE_TAIL_SAMPLING=env_flag("TRACE_TAIL_SAMPLING", True),
+            TRACE_SLOW_THRESHOLD_MS=int(os.getenv("TRACE_SLOW_THRESHOLD_MS", "500")),
+            TRACE_QUEUE_SIZE=int(os.getenv("TRACE_QUEUE_SIZE", "2048")),
+            TRACE_EXPORT_BATCH_SIZE=int(os.getenv("TRACE_EXPORT_BATCH_SIZE", "512")),
+            HEALTH_CHECK_INTERVAL_MS=int(os.getenv("HEALTH_CHECK_INTERVAL_MS", "2000")),
+            HEALTH_PROBE_TIMEOUT_MS=int(os.getenv("HEALTH_PROBE_TIMEOUT_MS", "1000")),
+            HEALTH_QUEUE_HIGH_WATER=float(os.getenv("HEALTH_QUEUE_HIGH_WATER", "0.8")),
         )
 
         self.dependencies = DependencyConfig(
-            DEPENDENT_SERVICE_URL=os.getenv("DEPENDENT_SERVICE_URL", "http://localhost:8001"),
-            DEPENDENT_SERVICE_TIMEOUT=int(os.getenv("DEPENDENT_SERVICE_TIMEOUT", "30"))
+            DEPENDENT_SERVICE_URL=os.getenv(
+                "DEPENDENT_SERVICE_URL", "http://localhost:8001"
+            ),
+            DEPENDENT_SERVICE_TIMEOUT=int(os.getenv("DEPENDENT_SERVICE_TIMEOUT", "30")),
         )
 
         self.features = FeatureConfig(
-            ENABLE_BATCH_PROCESSING=str(os.getenv("ENABLE_BATCH_PROCESSING", "False")).lower() == "true",
-            ENABLE_ASYNC_LOGGING=str(os.getenv("ENABLE_ASYNC_LOGGING", "True")).lower() == "true"
+            ENABLE_BATCH_PROCESSING=env_flag("ENABLE_BATCH_PROCESSING", False),
+            ENABLE_ASYNC_LOGGING=env_flag("ENABLE_ASYNC_LOGGING", True),
+            ENABLE_STREAM_INGESTION=env_flag("ENABLE_STREAM_INGESTION", False),
+            ENABLE_WARMUP=env_flag("ENABLE_WARMUP", True),
         )
 
         self.performance = PerformanceConfig(
             WORKER_PROCESSES=int(os.getenv("WORKER_PROCESSES", "4")),
             THREAD_POOL_SIZE=int(os.getenv("THREAD_POOL_SIZE", "10")),
-            MAX_QUEUE_SIZE=int(os.getenv("MAX_QUEUE_SIZE", "1000"))
+            MAX_QUEUE_SIZE=int(os.getenv("MAX_QUEUE_SIZE", "1000")),
+            MAX_BATCH_SIZE=int(os.getenv("MAX_BATCH_SIZE", "10000")),
+            WRITER_BATCH_SIZE=int(os.getenv("WRITER_BATCH_SIZE", "5000")),
+            WRITER_FLUSH_INTERVAL_MS=int(os.getenv("WRITER_FLUSH_INTERVAL_MS", "200")),
+            REDIS_POOL_SIZE=int(os.getenv("REDIS_POOL_SIZE", "20")),
+            REDIS_POOL_TIMEOUT=int(os.getenv("REDIS_POOL_TIMEOUT", "5")),
+            STREAM_MAX_LENGTH=int(os.getenv("STREAM_MAX_LENGTH", "100000")),
+            STREAM_CLAIM_IDLE_MS=int(os.getenv("STREAM_CLAIM_IDLE_MS", "60000")),
+            STREAM_MAX_DELIVERIES=int(os.getenv("STREAM_MAX_DELIVERIES", "5")),
+            EXPORT_FETCH_SIZE=int(os.getenv("EXPORT_FETCH_SIZE", "1000")),
+            SEARCH_TIMEOUT_MS=int(os.getenv("SEARCH_TIMEOUT_MS", "5000")),
+            WARMUP_TIMEOUT_MS=int(os.getenv("WARMUP_TIMEOUT_MS", "10000")),
+            WARMUP_REDIS_CONNECTIONS=int(os.getenv("WARMUP_REDIS_CONNECTIONS", "4")),
+            SHUTDOWN_TIMEOUT=float(os.getenv("SHUTDOWN_TIMEOUT", "30")),
+            MAX_BODY_SIZE=os.getenv("MAX_BODY_SIZE", "10MB"),
         )
 
         self.backup = BackupConfig(
-            BACKUP_ENABLED=str(os.getenv("BACKUP_ENABLED", "True")).lower() == "true",
+            BACKUP_ENABLED=env_flag("BACKUP_ENABLED", True),
             BACKUP_RETENTION_DAYS=int(os.getenv("BACKUP_RETENTION_DAYS", "7")),
-            BACKUP_S3_BUCKET=os.getenv("BACKUP_S3_BUCKET", "logging-service-backups")
+            BACKUP_S3_BUCKET=os.getenv("BACKUP_S3_BUCKET", "logging-service-backups"),
         )
 
         # Validate configuration
         self.validate()
 
+    def as_dict(self) -> Dict[str, Any]:
+        """Get every environment-backed setting by name.
+
+        Returns:
+            Dict[str, Any]: Setting values keyed by environment variable
+        """
+        values = {}
+        for name in self.__slots__:
+            section = getattr(self, name)
+            for item in fields(section):
+                if item.init:
+                    values[item.name] = getattr(section, item.name)
+        return values
+
+    def swap(self, other: "Config") -> None:
+        """Take every section from another configuration.
+
+        Nothing awaits in between, so code on the event loop sees either
+        the old or the new sections, never a mix.
+
+        Args:
+            other (Config): Validated configuration to switch to
+        """
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+
     def validate(self) -> None:
-        """Validate the configuration settings."""
+        """Validate settings that span fields or sections.
+
+        LOG_ROTATION_SIZE and RATE_LIMIT_DEFAULT are checked when their
+        sections parse them.
+
+        Raises:
+            AssertionError: If a setting is invalid
+        """
         if self.app.ENVIRONMENT == "production":
             if self.app.DEBUG:
                 raise AssertionError("DEBUG should be False in production")
             if not self.security.SECRET_KEY:
                 raise AssertionError("SECRET_KEY must be set in production")
             if "localhost" in self.security.ALLOWED_HOSTS:
-                raise AssertionError("localhost should not be in ALLOWED_HOSTS in production")
+                raise AssertionError(
+                    "localhost should not be in ALLOWED_HOSTS in production"
+                )
             if not self.database.DB_PASSWORD:
                 raise AssertionError("Database password must be set in production")
             if not self.redis.REDIS_PASSWORD:
                 raise AssertionError("Redis password must be set in production")
 
+        if self.database.DB_POOL_SIZE < 1 or self.database.DB_MAX_OVERFLOW < 0:
+            raise AssertionError("Invalid database pool size")
+        if 0 < self.database.DB_MAX_CONNECTIONS < self.performance.WORKER_PROCESSES:
+            raise AssertionError(
+                "DB_MAX_CONNECTIONS must allow one connection per worker"
+            )
+
+        if self.performance.STREAM_MAX_DELIVERIES < 1:
+            raise AssertionError("STREAM_MAX_DELIVERIES must be at least 1")
+        if (
+            self.performance.WARMUP_TIMEOUT_MS < 0
+            or self.performance.SHUTDOWN_TIMEOUT < 0
+        ):
+            raise AssertionError(
+                "WARMUP_TIMEOUT_MS and SHUTDOWN_TIMEOUT must not be negative"
+            )
+        if (
+            not 0
+            <= self.performance.WARMUP_REDIS_CONNECTIONS
+            <= self.performance.REDIS_POOL_SIZE
+        ):
+            raise AssertionError(
+                "WARMUP_REDIS_CONNECTIONS must not exceed REDIS_POOL_SIZE"
+            )
+
+        if not 0.0 <= self.monitoring.TRACE_SAMPLE_RATIO <= 1.0:
+            raise AssertionError("TRACE_SAMPLE_RATIO must be between 0 and 1")
+        if (
+            not 0
+            < self.monitoring.TRACE_EXPORT_BATCH_SIZE
+            <= self.monitoring.TRACE_QUEUE_SIZE
+        ):
+            raise AssertionError(
+                "TRACE_EXPORT_BATCH_SIZE must not exceed TRACE_QUEUE_SIZE"
+            )
+
+        if not 0.0 < self.monitoring.HEALTH_QUEUE_HIGH_WATER <= 1.0:
+            raise AssertionError(
+                "HEALTH_QUEUE_HIGH_WATER must be a fraction of the queue"
+            )
+
         if self.logging.LOG_FORMAT not in ["json", "text"]:
             raise AssertionError("Invalid LOG_FORMAT")
         if self.logging.LOG_OUTPUT not in ["stdout", "file"]:
             raise AssertionError("Invalid LOG_OUTPUT")
         if self.logging.LOG_OUTPUT == "file" and not self.logging.LOG_FILE_PATH:
             raise AssertionError("LOG_FILE_PATH must be set when LOG_OUTPUT is file")
+        if self.logging.LOG_QUEUE_OVERFLOW not in ["block", "drop_oldest", "sample"]:
+            raise AssertionError("Invalid LOG_QUEUE_OVERFLOW")
+        if self.logging.LOG_QUEUE_SIZE < 1 or self.logging.LOG_QUEUE_SAMPLE_RATE < 1:
+            raise AssertionError("Invalid logging queue settings")
+        if self.logging.LOG_COMPRESSION not in ["gzip", "zstd", "none"]:
+            raise AssertionError("Invalid LOG_COMPRESSION")
+        try:
+            parse_sample_rates(self.logging.LOG_SAMPLE_RATES)
+        except ValueError as exc:
+            raise AssertionError("Invalid LOG_SAMPLE_RATES") from exc
 
-# Create a global config instance
-config = Config()
 
-# Validate configuration on import
-config.validate() 
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_config() -> Config:
+    """Get the process-wide configuration, loading it on first use.
+
+    Returns:
+        Config: Shared configuration instance
+    """
+    return Config()
+
+
+# Create a global config instance
+config = get_config()
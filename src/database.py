@@ -1,54 +1,349 @@
 """
 Database configuration and session management.
 """
+import asyncio
+import time
+import uuid
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import Table
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext import asyncio as sqlalchemy_asyncio
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
-    create_async_engine,
 )
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+    QueuePool,
+)
+from sqlalchemy.schema import CreateSchema
 
 from src.config import config
 
-# Create database URL
-DATABASE_URL = (
-    f"postgresql+asyncpg://{config.database.DB_USER}:{config.database.DB_PASSWORD}"
-    f"@{config.database.DB_HOST}:{config.database.DB_PORT}/{config.database.DB_NAME}"
-)
+logger = structlog.get_logger(__name__)
 
-# Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=config.app.DEBUG,  # Log SQL statements when in debug mode
-    pool_size=5,  # Default connection pool size
-    max_overflow=10,  # Maximum number of connections to overflow
-    pool_timeout=30,  # Timeout for getting connection from pool
-    pool_pre_ping=True,  # Enable connection health checks
-)
+T = TypeVar("T")
+
+# Seconds to wait for a replica connection before ejecting it
+REPLICA_CONNECT_TIMEOUT = 5
 
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
+# Pool metrics are labelled "primary" or "replica-N", by position in
+# DB_REPLICA_HOSTS
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Persistent connections allowed in the database pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_IN_USE = Gauge(
+    "db_pool_in_use_connections",
+    "Database connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections open beyond the persistent pool size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent checking a connection out of the database pool",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+REPLICA_EJECTIONS = Counter(
+    "db_replica_ejections_total",
+    "Read replicas taken out of rotation after a connection failure",
+    ["replica"],
 )
 
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that reports utilisation to Prometheus.
+
+    The pool's ``logging_name`` (the engine's ``pool_logging_name``) is
+    used as the ``pool`` label, so several pools in one worker do not
+    overwrite each other's gauges.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the pool and publish its size."""
+        super().__init__(*args, **kwargs)
+        self.label = self.logging_name or "primary"
+        POOL_SIZE.labels(pool=self.label).set(self.size())
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check a connection out of the pool, recording the wait time."""
+        started = time.perf_counter()
+        connection = super().connect()
+        POOL_WAIT.labels(pool=self.label).observe(time.perf_counter() - started)
+        self._report_usage()
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        """Return a connection to the pool."""
+        super()._do_return_conn(record)
+        self._report_usage()
+
+    def _report_usage(self) -> None:
+        """Publish checked-out and overflow connection counts."""
+        POOL_IN_USE.labels(pool=self.label).set(self.checkedout())
+        # overflow() is negative until pool_size connections have been opened
+        POOL_OVERFLOW.labels(pool=self.label).set(max(0, self.overflow()))
+
+
+def pool_limits() -> Tuple[int, int]:
+    """Return this worker's pool size and overflow.
+
+    When DB_MAX_CONNECTIONS is set, the server-wide budget is split evenly
+    across WORKER_PROCESSES so the workers together can never exceed it.
+
+    Returns:
+        Tuple[int, int]: Persistent pool size and maximum overflow
+    """
+    size = config.database.DB_POOL_SIZE
+    overflow = config.database.DB_MAX_OVERFLOW
+    if config.database.DB_MAX_CONNECTIONS:
+        budget = max(
+            1, config.database.DB_MAX_CONNECTIONS // config.performance.WORKER_PROCESSES
+        )
+        size = min(size, budget)
+        overflow = min(overflow, budget - size)
+    return size, overflow
+
+
+def engine_options(pool: str) -> Dict[str, Any]:
+    """Build create_async_engine keyword arguments from DatabaseConfig.
+
+    Pre-ping costs a round trip on every checkout, so by default stale
+    connections are instead retired by age (DB_POOL_RECYCLE). Behind
+    PgBouncer in transaction mode prepared statements cannot be reused
+    across server connections, so both asyncpg's and SQLAlchemy's statement
+    caches are disabled and statements get unique names.
+
+    Args:
+        pool (str): Pool name, the ``pool`` label of its metrics
+
+    Returns:
+        Dict[str, Any]: Engine options
+    """
+    size, overflow = pool_limits()
+    options: Dict[str, Any] = {
+        "echo": config.app.DEBUG,  # Log SQL statements when in debug mode
+        "poolclass": InstrumentedQueuePool,
+        "pool_logging_name": pool,
+        "pool_size": size,
+        "max_overflow": overflow,
+        "pool_timeout": config.database.DB_POOL_TIMEOUT,
+        "pool_recycle": config.database.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.database.DB_POOL_PRE_PING,
+    }
+    if config.database.DB_PGBOUNCER:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return options
+
+
+def database_url(host: str, port: int) -> str:
+    """Build an asyncpg URL for a server using the configured credentials.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+
+    Returns:
+        str: SQLAlchemy database URL
+    """
+    return (
+        f"postgresql+asyncpg://{config.database.DB_USER}:{config.database.DB_PASSWORD}"
+        f"@{host}:{port}/{config.database.DB_NAME}"
+    )
+
+
+def _lazy(name: str, build: Callable[[], T]) -> T:
+    """Get a module attribute, building it on first use.
+
+    The value is stored under its public name, so later lookups (and
+    ``from src.database import engine``) find it without a call.
+
+    Args:
+        name (str): Module attribute name
+        build (Callable[[], T]): Creates the value
+
+    Returns:
+        T: The shared value
+    """
+    value: Optional[T] = globals().get(name)
+    if value is None:
+        value = globals()[name] = build()
+    return value
+
+
+def get_sessionmaker() -> async_sessionmaker:
+    """Get the session factory for the primary, creating it on first use.
+
+    Returns:
+        async_sessionmaker: Session factory bound to the primary engine
+    """
+    return _lazy(
+        "AsyncSessionLocal",
+        lambda: async_sessionmaker(
+            bind=get_engine(), class_=AsyncSession, expire_on_commit=False
+        ),
+    )
+
+
+def is_disconnect(exc: BaseException) -> bool:
+    """Return True if an error means the server connection was lost.
+
+    Args:
+        exc (BaseException): Error raised while using a connection
+
+    Returns:
+        bool: Whether the error is a connectivity failure
+    """
+    if isinstance(exc, DBAPIError):
+        return exc.connection_invalidated
+    return isinstance(exc, (OSError, asyncio.TimeoutError))
+
+
+@dataclass
+class Replica:
+    """A read replica with its own engine and session factory.
+
+    Attributes:
+        name (str): ``host:port`` of the replica
+        engine (AsyncEngine): Engine bound to the replica
+        sessionmaker (async_sessionmaker): Session factory for the engine
+        ejected_until (float): Monotonic time until which it is skipped
+    """
+
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker
+    ejected_until: float = 0.0
+
+
+class ReplicaSet:
+    """Round-robin balancer over read replicas with passive health checks.
+
+    A replica that fails to connect is ejected for DB_REPLICA_EJECT_SECONDS
+    and then retried by live traffic. When every replica is ejected, reads
+    fall back to the primary.
+
+    Attributes:
+        replicas (List[Replica]): Configured replicas
+    """
+
+    def __init__(self, hosts: Sequence[str]):
+        """Create engines for the given replicas without connecting.
+
+        Args:
+            hosts (Sequence[str]): Replica addresses as ``host`` or ``host:port``
+        """
+        self.replicas: List[Replica] = [
+            self._create(entry, f"replica-{index}") for index, entry in enumerate(hosts)
+        ]
+        self._next = 0
+
+    def _create(self, entry: str, pool: str) -> Replica:
+        """Build a replica engine sized like the primary pool."""
+        host, _, port = entry.partition(":")
+        options = engine_options(pool)
+        options["connect_args"] = {
+            **options.get("connect_args", {}),
+            "timeout": REPLICA_CONNECT_TIMEOUT,
+        }
+        replica_engine = sqlalchemy_asyncio.create_async_engine(
+            database_url(host, int(port or config.database.DB_PORT)), **options
+        )
+        return Replica(
+            name=f"{host}:{port or config.database.DB_PORT}",
+            engine=replica_engine,
+            sessionmaker=async_sessionmaker(
+                bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+            ),
+        )
+
+    def candidates(self) -> List[Replica]:
+        """Return healthy replicas, rotating the first choice on each call.
+
+        Returns:
+            List[Replica]: Replicas to try, in order
+        """
+        if not self.replicas:
+            return []
+        start = self._next
+        self._next = (start + 1) % len(self.replicas)
+        now = time.monotonic()
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.ejected_until <= now]
+
+    def eject(self, replica: Replica) -> None:
+        """Take a replica out of rotation for DB_REPLICA_EJECT_SECONDS.
+
+        Args:
+            replica (Replica): Replica that failed
+        """
+        seconds = config.database.DB_REPLICA_EJECT_SECONDS
+        replica.ejected_until = time.monotonic() + seconds
+        REPLICA_EJECTIONS.labels(replica=replica.name).inc()
+        logger.warning("Read replica ejected", replica=replica.name, seconds=seconds)
+
+    async def dispose(self) -> None:
+        """Close every replica connection pool."""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+def get_read_replicas() -> ReplicaSet:
+    """Get the read replicas, creating their engines on first use.
+
+    Returns:
+        ReplicaSet: Replicas for query traffic
+    """
+    return _lazy("read_replicas", lambda: ReplicaSet(config.database.DB_REPLICA_HOSTS))
+
+
 @asynccontextmanager
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session with async context management.
-    
+
     Yields:
         AsyncSession: Database session
-        
+
     Example:
         async with get_db() as db:
             result = await db.execute(select(Model))
             models = result.scalars().all()
     """
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
             await session.commit()
@@ -56,24 +351,214 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
 
+
+@asynccontextmanager
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only session on a healthy replica, or on the primary.
+
+    The connection is checked out before the session is handed over, so a
+    replica that cannot be reached is ejected and the next one is tried
+    without the caller seeing the failure. Nothing is committed.
+
+    Yields:
+        AsyncSession: Database session for queries
+
+    Example:
+        async with get_read_db() as db:
+            result = await db.execute(select(Model))
+    """
+    read_replicas = get_read_replicas()
+    for replica in read_replicas.candidates():
+        session = replica.sessionmaker()
+        try:
+            await session.connection()
+        except (OSError, asyncio.TimeoutError, DBAPIError):
+            await session.close()
+            read_replicas.eject(replica)
+            continue
+        async with session:
+            try:
+                yield session
+            except Exception as exc:
+                if is_disconnect(exc):
+                    read_replicas.eject(replica)
+                raise
+        return
+
+    async with get_sessionmaker()() as session:
+        yield session
+
+
+async def driver_connection(conn: AsyncConnection) -> Any:
+    """Return the asyncpg connection behind a pooled connection.
+
+    Args:
+        conn (AsyncConnection): Connection checked out of an engine
+
+    Returns:
+        Any: asyncpg connection, for COPY and other driver-only calls
+    """
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+async def copy_records(
+    table: Table,
+    columns: Sequence[str],
+    records: Iterable[Tuple[Any, ...]],
+) -> int:
+    """Bulk load rows into a table with PostgreSQL binary COPY.
+
+    Bypasses the ORM unit of work entirely: rows are streamed over a single
+    pooled connection and committed as one statement.
+
+    Args:
+        table (Table): Target table
+        columns (Sequence[str]): Column names, in tuple order
+        records (Iterable[Tuple[Any, ...]]): Rows to load
+
+    Returns:
+        int: Number of rows copied
+    """
+    async with get_engine().connect() as conn:
+        driver = await driver_connection(conn)
+        status = await driver.copy_records_to_table(
+            table.name,
+            schema_name=table.schema,
+            columns=list(columns),
+            records=records,
+        )
+    # asyncpg returns the command tag, e.g. "COPY 5000"
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def warm_pool(
+    engine: AsyncEngine,
+    prepare: Callable[[AsyncConnection], Awaitable[None]],
+) -> int:
+    """Open ``pool_size`` connections at once and prepare each of them.
+
+    Every connection is held until all of them are open, so the pool ends up
+    with ``pool_size`` distinct idle connections rather than one reused
+    ``pool_size`` times. Prepared statements belong to a server connection,
+    which is why ``prepare`` runs on each.
+
+    Args:
+        engine (AsyncEngine): Engine whose pool to fill
+        prepare (Callable[[AsyncConnection], Awaitable[None]]): Runs the hot
+            statements on one connection
+
+    Returns:
+        int: Number of connections opened
+
+    Raises:
+        Exception: The first connection or statement error
+    """
+    pool = engine.pool
+    size = pool.size() if isinstance(pool, QueuePool) else 1
+    everyone = asyncio.Barrier(size)
+
+    async def hold() -> None:
+        try:
+            async with engine.connect() as conn:
+                await everyone.wait()
+                await prepare(conn)
+        except BaseException:
+            # Release the connections already waiting for this one
+            await everyone.abort()
+            raise
+
+    results = await asyncio.gather(
+        *(hold() for _ in range(size)), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(
+            result, asyncio.BrokenBarrierError
+        ):
+            raise result
+    return size
+
+
 def get_engine() -> AsyncEngine:
-    """Get SQLAlchemy async engine instance.
-    
+    """Get SQLAlchemy async engine instance, creating it on first use.
+
+    Nothing connects until the pool is first used; creating the engine
+    still imports the asyncpg driver, so it is kept out of import time.
+
     Returns:
         AsyncEngine: SQLAlchemy async engine instance
     """
-    return engine
+    return _lazy(
+        "engine",
+        # Looked up on the module, so tracing enabled before the engine is
+        # built can wrap it
+        lambda: sqlalchemy_asyncio.create_async_engine(
+            database_url(config.database.DB_HOST, config.database.DB_PORT),
+            **engine_options("primary"),
+        ),
+    )
+
+
+def built_engines() -> List[AsyncEngine]:
+    """List the primary and replica engines created so far.
+
+    Returns:
+        List[AsyncEngine]: Engines that exist, none created by the call
+    """
+    engines: List[AsyncEngine] = []
+    primary = globals().get("engine")
+    if primary is not None:
+        engines.append(primary)
+    replicas = globals().get("read_replicas")
+    if replicas is not None:
+        engines.extend(replica.engine for replica in replicas.replicas)
+    return engines
+
+
+async def close_db() -> None:
+    """Close the primary and replica pools, if they were ever created."""
+    for name in ("read_replicas", "engine"):
+        value = globals().get(name)
+        if value is not None:
+            await value.dispose()
+
+
+def __getattr__(name: str) -> Any:
+    """Create ``engine``, ``AsyncSessionLocal`` or ``read_replicas`` on access.
+
+    Args:
+        name (str): Attribute name
+
+    Returns:
+        Any: The shared value
+
+    Raises:
+        AttributeError: If the module has no such attribute
+    """
+    factories = {
+        "engine": get_engine,
+        "AsyncSessionLocal": get_sessionmaker,
+        "read_replicas": get_read_replicas,
+    }
+    if name in factories:
+        return factories[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 async def init_db() -> AsyncEngine:
     """Initialize database with required tables.
-    
+
     Returns:
         AsyncEngine: SQLAlchemy async engine instance
     """
     # Import all models here to ensure they are registered
     from src.models import Base  # noqa
 
+    schemas = {table.schema for table in Base.metadata.tables.values() if table.schema}
+    engine = get_engine()
     async with engine.begin() as conn:
+        for schema in sorted(schemas):
+            await conn.execute(CreateSchema(schema, if_not_exists=True))
         await conn.run_sync(Base.metadata.create_all)
-    
-    return engine 
\ No newline at end of file
+
+    return engine
@@ -0,0 +1,120 @@
+"""
+Streaming NDJSON export of log events.
+"""
+import asyncio
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+import structlog
+from prometheus_client import Counter
+from sqlalchemy import select
+
+from src.config import config
+from src.database import get_read_db
+from src.search import SEARCH_COLUMNS, SearchFilters, apply_filters
+from src.serialization import dumps
+
+logger = structlog.get_logger(__name__)
+
+GZIP_LEVEL = 6
+
+ROWS_EXPORTED = Counter(
+    "log_export_rows_total",
+    "Log events streamed by the export endpoint",
+)
+
+
+def encode_rows(keys: Sequence[str], rows: Sequence[Any]) -> bytes:
+    """Serialize rows as NDJSON, one line per row.
+
+    Args:
+        keys (Sequence[str]): Column names
+        rows (Sequence[Any]): Row tuples
+
+    Returns:
+        bytes: Newline-terminated JSON lines
+    """
+    return b"".join(dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+async def export_ndjson(
+    filters: SearchFilters, fetch_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """Stream matching events as NDJSON chunks.
+
+    Rows are read through a server-side cursor ``fetch_size`` at a time, so
+    memory stays constant however large the export is and the first chunk
+    is sent as soon as the first fetch returns. Rows are not ordered, which
+    lets PostgreSQL scan partitions sequentially.
+
+    Args:
+        filters (SearchFilters): Search criteria
+        fetch_size (Optional[int]): Rows per fetch, defaults to
+            EXPORT_FETCH_SIZE
+
+    Yields:
+        bytes: NDJSON for one fetch of rows
+    """
+    fetch_size = fetch_size or config.performance.EXPORT_FETCH_SIZE
+    stmt = apply_filters(select(*SEARCH_COLUMNS), filters).execution_options(
+        yield_per=fetch_size
+    )
+    exported = 0
+    async with get_read_db() as db:
+        result = await db.stream(stmt)
+        keys = tuple(result.keys())
+        async for rows in result.partitions():
+            exported += len(rows)
+            ROWS_EXPORTED.inc(len(rows))
+            yield encode_rows(keys, rows)
+    logger.info("Log export finished", rows=exported)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Check whether an Accept-Encoding header allows a gzip response.
+
+    ``gzip`` (or its ``x-gzip`` alias) must be listed with a non-zero
+    quality, or be covered by a non-zero ``*``; ``gzip;q=0`` refuses it.
+
+    Args:
+        accept_encoding (str): Accept-Encoding header value
+
+    Returns:
+        bool: True if the body may be gzip-encoded
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a single gzip member.
+
+    Compression runs in a worker thread (zlib releases the GIL) so large
+    exports do not stall the event loop.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Uncompressed chunks
+
+    Yields:
+        bytes: Compressed chunks
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = await asyncio.to_thread(compressor.compress, chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
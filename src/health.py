@@ -0,0 +1,145 @@
+"""
+Liveness and readiness state computed off the request path.
+"""
+import asyncio
+import time
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Dict, Optional
+
+import structlog
+from prometheus_client import Gauge
+from sqlalchemy import text
+
+from src.cache import get_redis
+from src.config import config
+from src.database import get_engine
+from src.ingestion import batch_queue
+from src.serialization import dumps
+from src.streams import STREAM_KEY
+
+logger = structlog.get_logger(__name__)
+
+# Liveness only says the event loop is serving requests, so it never changes
+LIVE_BODY = dumps({"status": "alive"})
+
+READY = Gauge(
+    "service_ready",
+    "1 if the last readiness probe passed, 0 otherwise",
+    multiprocess_mode="livemin",
+)
+
+
+class HealthProber:
+    """Background prober that keeps a serialized readiness response.
+
+    Every HEALTH_CHECK_INTERVAL_MS the prober checks PostgreSQL, Redis and
+    the ingestion backlog concurrently and stores the outcome as JSON
+    bytes, so ``/health/ready`` only copies a cached body. The service is
+    not ready until the first probe has run, while a dependency fails or
+    times out, or while the ingestion backlog is above
+    HEALTH_QUEUE_HIGH_WATER of its capacity.
+
+    Attributes:
+        ready (bool): Outcome of the last probe
+        body (bytes): Serialized result of the last probe
+    """
+
+    def __init__(self) -> None:
+        """Initialize the prober as not yet ready."""
+        self.ready = False
+        self.body = dumps({"status": "starting", "checks": {}})
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> bool:
+        """Probe every dependency once and cache the result.
+
+        Returns:
+            bool: True if the service is ready
+        """
+        names = ("postgres", "redis", "queue")
+        results = await asyncio.gather(
+            self._probe(self._check_postgres()),
+            self._probe(self._check_redis()),
+            self._probe(self._check_queue()),
+        )
+        checks = dict(zip(names, results))
+        ready = all(result["ok"] for result in results)
+        if ready != self.ready:
+            logger.warning("Readiness changed", ready=ready, checks=checks)
+        self.ready = ready
+        self.body = dumps(
+            {
+                "status": "ready" if ready else "not_ready",
+                "checked_at": datetime.now(timezone.utc).isoformat(),
+                "checks": checks,
+            }
+        )
+        READY.set(1 if ready else 0)
+        return ready
+
+    async def _probe(self, check: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run one check with a timeout, recording its latency."""
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                check, config.monitoring.HEALTH_PROBE_TIMEOUT_MS / 1000
+            )
+        except asyncio.TimeoutError:
+            result = {"ok": False, "error": "timeout"}
+        except Exception as exc:  # pylint: disable=broad-except
+            result = {"ok": False, "error": type(exc).__name__}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    async def _check_postgres(self) -> Dict[str, Any]:
+        """Run a trivial query on the primary."""
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    async def _check_redis(self) -> Dict[str, Any]:
+        """Ping Redis."""
+        await get_redis().ping()
+        return {"ok": True}
+
+    async def _check_queue(self) -> Dict[str, Any]:
+        """Compare the ingestion backlog with its high-water mark."""
+        if config.features.ENABLE_STREAM_INGESTION:
+            depth = await get_redis().xlen(STREAM_KEY)
+            capacity = config.performance.STREAM_MAX_LENGTH
+        else:
+            depth, capacity = batch_queue.qsize(), batch_queue.maxsize
+        high_water = int(capacity * config.monitoring.HEALTH_QUEUE_HIGH_WATER)
+        return {"ok": depth < high_water, "depth": depth, "high_water": high_water}
+
+    async def start(self) -> None:
+        """Run a first probe, then keep probing on the running loop."""
+        if self._task is not None and not self._task.done():
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run(), name="health-prober")
+
+    async def stop(self) -> None:
+        """Stop probing and report not ready while shutting down."""
+        task, self._task = self._task, None
+        self.ready = False
+        self.body = dumps({"status": "stopping", "checks": {}})
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _run(self) -> None:
+        """Probe every HEALTH_CHECK_INTERVAL_MS."""
+        while True:
+            await asyncio.sleep(config.monitoring.HEALTH_CHECK_INTERVAL_MS / 1000)
+            try:
+                await self.check()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Health probe failed")
+
+
+# Readiness state shared by every request in this worker
+health_prober = HealthProber()
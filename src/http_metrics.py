@@ -0,0 +1,165 @@
+"""
+HTTP request metrics labelled by route template.
+"""
+import time
+from typing import Any, Dict, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Methods outside this set share one label so clients cannot add series
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+UNMATCHED_ROUTE = "unmatched"
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last response byte",
+    ["method", "route"],
+)
+HTTP_REQUEST_SIZE = Histogram(
+    "http_request_size_bytes",
+    "HTTP request body size",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Get the route template a request was matched to.
+
+    FastAPI stores the matched route in the scope while routing, so this
+    is read after the request has been handled. Mounted apps such as
+    ``/metrics`` are labelled with their mount path, and anything that
+    matched nothing shares one label.
+
+    Args:
+        scope (Dict[str, Any]): ASGI connection scope, after routing
+
+    Returns:
+        str: Template such as ``/logs/search``
+    """
+    route = scope.get("route")
+    if route is not None:
+        path: str = route.path
+        return path
+    if "app_root_path" in scope:
+        mount: str = scope["root_path"]
+        return mount
+    return UNMATCHED_ROUTE
+
+
+def request_length(scope: Dict[str, Any]) -> int:
+    """Get a request's declared body size without reading the body.
+
+    Args:
+        scope (Dict[str, Any]): ASGI connection scope
+
+    Returns:
+        int: Content-Length, 0 for requests that cannot carry a body, or -1
+            if the body size is only known once it has been read
+    """
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            return int(value) if value.isdigit() else 0
+        if name == b"transfer-encoding":
+            return -1
+    return 0
+
+
+class HTTPMetricsMiddleware:
+    """ASGI middleware recording request counts, latency and body sizes.
+
+    Label children are looked up once per (method, route, status) and
+    cached, so a request costs one dictionary lookup instead of a
+    ``labels()`` call per metric. Request sizes come from Content-Length;
+    the receive channel is only wrapped for chunked uploads.
+
+    Attributes:
+        app (Any): Wrapped ASGI application
+    """
+
+    def __init__(self, app: Any):
+        """Wrap an ASGI application.
+
+        Args:
+            app (Any): ASGI application
+        """
+        self.app = app
+        self._children: Dict[Tuple[str, str, int], Tuple[Any, Any, Any, Any]] = {}
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """Handle the request and record its metrics once it finishes."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # status, request bytes, response bytes
+        exchange = [500, request_length(scope), 0]
+
+        async def counting_send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                exchange[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                exchange[2] += len(message.get("body", b""))
+            await send(message)
+
+        if exchange[1] < 0:
+            exchange[1] = 0
+
+            # No Content-Length (chunked upload): count the body as it arrives
+            upstream = receive
+
+            async def counting_receive() -> Dict[str, Any]:
+                message: Dict[str, Any] = await upstream()
+                if message["type"] == "http.request":
+                    exchange[1] += len(message.get("body", b""))
+                return message
+
+            receive = counting_receive
+
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            requests, duration, request_size, response_size = self._metrics_for(
+                scope, exchange[0]
+            )
+            duration.observe(time.perf_counter() - started)
+            requests.inc()
+            request_size.observe(exchange[1])
+            response_size.observe(exchange[2])
+
+    def _metrics_for(self, scope: Dict[str, Any], status: int) -> Tuple[Any, ...]:
+        """Get the cached label children for a finished request."""
+        method = scope["method"]
+        if method not in KNOWN_METHODS:
+            method = "OTHER"
+        key = (method, route_template(scope), status)
+        children = self._children.get(key)
+        if children is None:
+            method, route, _ = key
+            children = self._children[key] = (
+                HTTP_REQUESTS.labels(method, route, str(status)),
+                HTTP_DURATION.labels(method, route),
+                HTTP_REQUEST_SIZE.labels(method, route),
+                HTTP_RESPONSE_SIZE.labels(method, route),
+            )
+        return children
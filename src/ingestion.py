@@ -0,0 +1,223 @@
+"""
+Batched log ingestion: request body parsing and the in-process batch queue.
+"""
+import asyncio
+from collections import deque
+from typing import Any, Deque, List, Optional
+
+import orjson
+from prometheus_client import Counter, Gauge
+from pydantic import ValidationError
+from pydantic_core import InitErrorDetails
+
+from src.config import Config, config
+from src.reload import config_reloader
+from src.schemas import LogRecord, LogRecordBatch
+
+NDJSON_CONTENT_TYPES = (
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+)
+
+RECORDS_ACCEPTED = Counter(
+    "log_records_accepted_total",
+    "Log records accepted by the batch ingestion endpoint",
+)
+BATCHES_REJECTED = Counter(
+    "log_batches_rejected_total",
+    "Log batches rejected by the batch ingestion endpoint",
+    ["reason"],
+)
+QUEUE_BATCHES = Gauge(
+    "log_ingest_queue_batches",
+    "Batches waiting in the in-process ingestion queue",
+    multiprocess_mode="livesum",
+)
+QUEUE_RECORDS = Gauge(
+    "log_ingest_queue_records",
+    "Records waiting in the in-process ingestion queue",
+    multiprocess_mode="livesum",
+)
+
+
+class QueueFullError(Exception):
+    """Raised when the ingestion queue cannot accept another batch."""
+
+
+def parse_ndjson(body: bytes) -> List[LogRecord]:
+    """Parse and validate an NDJSON batch, one JSON value per line.
+
+    Each line is decoded on its own, so a line holding anything but exactly
+    one JSON value is rejected; the decoded lines are then validated with
+    one call into pydantic-core. Error locations start with
+    ``("line", <number>)``, counting from 1 and including blank lines.
+
+    Args:
+        body (bytes): Raw request body
+
+    Returns:
+        List[LogRecord]: Validated records
+
+    Raises:
+        pydantic.ValidationError: If any line is malformed or invalid
+    """
+    numbers: List[int] = []
+    items: List[Any] = []
+    errors: List[InitErrorDetails] = []
+    for number, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            items.append(orjson.loads(line))
+        except orjson.JSONDecodeError as exc:
+            errors.append(
+                {
+                    "type": "json_invalid",
+                    "loc": ("line", number),
+                    "input": line.decode("utf-8", "replace"),
+                    "ctx": {"error": exc.msg},
+                }
+            )
+            continue
+        numbers.append(number)
+    if not errors:
+        try:
+            return LogRecordBatch.validate_python(items)
+        except ValidationError as exc:
+            for error in exc.errors():
+                index, *field = error["loc"]
+                details: InitErrorDetails = {
+                    "type": error["type"],
+                    "loc": ("line", numbers[int(index)], *field),
+                    "input": error["input"],
+                }
+                if "ctx" in error:
+                    details["ctx"] = error["ctx"]
+                errors.append(details)
+    raise ValidationError.from_exception_data("NDJSON batch", errors)
+
+
+def parse_batch(body: bytes, content_type: str = "application/json") -> List[LogRecord]:
+    """Parse and validate a batch of log records in one pass.
+
+    JSON arrays are validated directly; NDJSON bodies go through
+    ``parse_ndjson``.
+
+    Args:
+        body (bytes): Raw request body
+        content_type (str): Request content type
+
+    Returns:
+        List[LogRecord]: Validated records
+
+    Raises:
+        pydantic.ValidationError: If any record is invalid
+    """
+    if content_type.split(";", 1)[0].strip().lower() in NDJSON_CONTENT_TYPES:
+        return parse_ndjson(body)
+    return LogRecordBatch.validate_json(body)
+
+
+class BatchQueue:
+    """Bounded FIFO of record batches between the API and the writer.
+
+    The bound is expressed in batches so a single large request is never
+    rejected just for being large. Producers never wait: when the queue is
+    full ``put_nowait`` raises and the caller sheds load.
+
+    Attributes:
+        maxsize (int): Maximum number of queued batches
+    """
+
+    def __init__(self, maxsize: int):
+        """Initialize an empty queue.
+
+        Args:
+            maxsize (int): Maximum number of queued batches
+        """
+        self.maxsize = maxsize
+        self._batches: Deque[List[LogRecord]] = deque()
+        self._records = 0
+        self._not_empty: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def qsize(self) -> int:
+        """Return the number of queued batches."""
+        return len(self._batches)
+
+    @property
+    def records(self) -> int:
+        """Return the number of queued records across all batches."""
+        return self._records
+
+    def full(self) -> bool:
+        """Return True if no further batch can be accepted."""
+        return len(self._batches) >= self.maxsize
+
+    def put_nowait(self, batch: List[LogRecord]) -> None:
+        """Enqueue a batch without waiting.
+
+        Args:
+            batch (List[LogRecord]): Validated records
+
+        Raises:
+            QueueFullError: If the queue already holds ``maxsize`` batches
+        """
+        if self.full():
+            raise QueueFullError("Ingestion queue is full")
+        self._batches.append(batch)
+        self._records += len(batch)
+        QUEUE_BATCHES.inc()
+        QUEUE_RECORDS.inc(len(batch))
+        if self._not_empty is not None:
+            self._not_empty.set()
+
+    def get_nowait(self) -> List[LogRecord]:
+        """Dequeue the oldest batch without waiting.
+
+        Returns:
+            List[LogRecord]: The oldest queued batch
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        batch = self._batches.popleft()
+        self._records -= len(batch)
+        QUEUE_BATCHES.dec()
+        QUEUE_RECORDS.dec(len(batch))
+        return batch
+
+    async def get(self) -> List[LogRecord]:
+        """Dequeue the oldest batch, waiting until one is available.
+
+        Returns:
+            List[LogRecord]: The oldest queued batch
+        """
+        event = self._event()
+        while not self._batches:
+            event.clear()
+            await event.wait()
+        return self.get_nowait()
+
+    def _event(self) -> asyncio.Event:
+        """Return the wake-up event bound to the running loop.
+
+        Returns:
+            asyncio.Event: Event set whenever a batch is enqueued
+        """
+        loop = asyncio.get_running_loop()
+        if self._not_empty is None or self._loop is not loop:
+            self._loop = loop
+            self._not_empty = asyncio.Event()
+        return self._not_empty
+
+
+# Shared queue between the ingestion endpoint and the background writer
+batch_queue = BatchQueue(config.performance.MAX_QUEUE_SIZE)
+
+
+@config_reloader.on_change("MAX_QUEUE_SIZE")
+def resize_batch_queue(new: Config) -> None:
+    """Apply a new queue bound; batches already queued above it are kept."""
+    batch_queue.maxsize = new.performance.MAX_QUEUE_SIZE
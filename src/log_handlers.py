@@ -0,0 +1,363 @@
+"""
+Logging handlers: a bounded queue in front of a listener thread, and a
+size-rotated, compressed log file.
+"""
+import fcntl
+import glob
+import gzip
+import io
+import itertools
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from prometheus_client import Counter
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "sample")
+
+# Seconds the "block" policy waits for room before giving up on a record
+BLOCK_TIMEOUT = 1.0
+
+# Fraction of the queue that may fill before "sample" starts thinning records
+SAMPLE_HIGH_WATER = 0.5
+
+# Userspace write buffer for log files; records reach the kernel in 1 MiB writes
+FILE_BUFFER_SIZE = 1 << 20
+
+COMPRESSED_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+RECORDS_DROPPED = Counter(
+    "log_handler_dropped_records_total",
+    "Log records discarded because the logging queue was full",
+    ["policy"],
+)
+SEGMENTS_ROTATED = Counter(
+    "log_file_segments_rotated_total",
+    "Log file segments closed by size-based rotation",
+)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler that never grows its queue beyond a fixed size.
+
+    Emitting only puts the record on the queue; formatting and I/O happen
+    on the listener thread. When the queue is full the overflow policy
+    decides what gives:
+
+    - ``block``: wait up to BLOCK_TIMEOUT for room, then drop the record
+    - ``drop_oldest``: discard the oldest queued record to make room
+    - ``sample``: past SAMPLE_HIGH_WATER, keep one in ``sample_rate``
+      records below WARNING; drop whatever still does not fit
+    """
+
+    def __init__(
+        self, log_queue: queue.Queue, policy: str = "drop_oldest", sample_rate: int = 10
+    ):
+        """Initialize the handler.
+
+        Args:
+            log_queue (queue.Queue): Bounded queue shared with the listener
+            policy (str): Overflow policy, one of OVERFLOW_POLICIES
+            sample_rate (int): Keep one in this many records when sampling
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        super().__init__(log_queue)
+        self.queue: queue.Queue = log_queue
+        self.policy = policy
+        self.sample_rate = max(1, sample_rate)
+        self.high_water = int(log_queue.maxsize * SAMPLE_HIGH_WATER)
+        self.dropped = 0
+        self._sampled = itertools.count(1)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue records unformatted so rendering happens on the listener.
+
+        The base class formats the message here, on the caller's thread,
+        which would also flatten structlog's event dictionaries before
+        ``ProcessorFormatter`` sees them.
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, applying the overflow policy."""
+        if (
+            self.policy == "sample"
+            and record.levelno < logging.WARNING
+            and self.queue.qsize() >= self.high_water
+            and next(self._sampled) % self.sample_rate
+        ):
+            self._drop()
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.policy == "block":
+            try:
+                self.queue.put(record, timeout=BLOCK_TIMEOUT)
+            except queue.Full:
+                self._drop()
+        elif self.policy == "drop_oldest":
+            self._replace_oldest(record)
+        else:
+            self._drop()
+
+    def _replace_oldest(self, record: logging.LogRecord) -> None:
+        """Evict queued records until the new one fits."""
+        while True:
+            try:
+                self.queue.get_nowait()
+                self._drop()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                continue
+
+    def _drop(self) -> None:
+        """Count one discarded record."""
+        self.dropped += 1
+        RECORDS_DROPPED.labels(policy=self.policy).inc()
+
+
+class BackgroundListener(QueueListener):
+    """Queue listener that can always stop, even when its queue is full."""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler):
+        """Initialize the listener.
+
+        Args:
+            log_queue (queue.Queue): Queue filled by BoundedQueueHandler
+            *handlers (logging.Handler): Handlers that format and write
+        """
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue: queue.Queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        """Wait for room for the stop sentinel instead of raising queue.Full."""
+        # None is QueueListener's stop sentinel
+        self.queue.put(None)
+
+
+class CompressingFileHandler(logging.FileHandler):
+    """Size-rotated log file with background compression and retention.
+
+    Records go through a large userspace buffer and are flushed and
+    fsynced every ``fsync_interval`` seconds rather than once per record.
+    When the file passes ``max_bytes`` it is renamed to a timestamped
+    segment and a single worker thread compresses it and prunes segments
+    older than ``retention_days``, so the thread writing records never
+    waits on compression.
+
+    Several processes may share the file, as gunicorn workers do. Rotation
+    holds an exclusive lock on a hidden lock file next to the log, so only
+    one process renames it. The others notice the new inode on their next
+    sync and reopen; segments are compressed only after two sync intervals,
+    once every process has flushed into them.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int,
+        retention_days: int,
+        compression: str = "gzip",
+        fsync_interval: float = 1.0,
+        encoding: Optional[str] = "utf-8",
+    ):
+        """Initialize the handler.
+
+        Args:
+            filename (str): Active log file path
+            max_bytes (int): Size at which the file is rotated
+            retention_days (int): Age after which rotated segments are deleted
+            compression (str): ``gzip``, ``zstd`` or ``none``
+            fsync_interval (float): Seconds between flush and fsync
+            encoding (Optional[str]): File encoding
+
+        Raises:
+            ValueError: If the compression is unknown or unavailable
+        """
+        if compression not in COMPRESSED_SUFFIXES:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        directory, name = os.path.split(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        self.lock_path = os.path.join(directory, f".{name}.lock")
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self.compression = compression
+        self.fsync_interval = fsync_interval
+        super().__init__(filename, encoding=encoding)
+        self.bytes_written = os.path.getsize(self.baseFilename)
+        self._dirty = False
+        self._compressor = ThreadPoolExecutor(1, thread_name_prefix="log-compress")
+        self._compressor.submit(self._prune)
+        self._stopped = threading.Event()
+        self._syncer = threading.Thread(
+            target=self._sync_periodically, name="log-fsync", daemon=True
+        )
+        self._syncer.start()
+
+    def _open(self) -> io.TextIOWrapper:
+        """Open the active file with a large write buffer."""
+        return open(
+            self.baseFilename, "a", buffering=FILE_BUFFER_SIZE, encoding=self.encoding
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Append a record to the buffer, rotating first if the file is full.
+
+        Sizes are counted in characters, which matches bytes for the ASCII
+        that JSON rendering produces.
+        """
+        try:
+            message = self.format(record) + self.terminator
+            size = self.bytes_written + len(message)
+            if self.bytes_written and size > self.max_bytes:
+                self.rotate()
+            self.stream.write(message)
+            self.bytes_written += len(message)
+            self._dirty = True
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Skip the per-record flush; the sync thread flushes periodically."""
+
+    def sync(self) -> None:
+        """Flush the write buffer, fsync the file and follow rotations.
+
+        Another process may have rotated the file since it was opened; the
+        buffer is flushed into the old file first, then the new one opened.
+        Only the flush into the page cache holds the handler lock: the fsync
+        runs on a duplicate descriptor after releasing it, so records
+        emitted meanwhile do not wait for the disk.
+        """
+        synced = None
+        self.acquire()
+        try:
+            # close() sets the stream to None
+            if not self.stream:
+                return
+            if self._dirty:
+                self.stream.flush()
+                synced = os.dup(self.stream.fileno())
+                self._dirty = False
+            self._follow()
+        finally:
+            self.release()
+        if synced is not None:
+            try:
+                os.fsync(synced)
+            finally:
+                os.close(synced)
+
+    def _follow(self) -> bool:
+        """Reopen the active file if it is no longer the one at the path.
+
+        Also refreshes ``bytes_written`` with the size all processes wrote.
+
+        Returns:
+            bool: Whether the file was reopened
+        """
+        opened = os.fstat(self.stream.fileno())
+        try:
+            current = os.stat(self.baseFilename)
+            moved = (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino)
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            self.stream.close()
+            self.stream = self._open()
+            opened = os.fstat(self.stream.fileno())
+        self.bytes_written = opened.st_size
+        return moved
+
+    def rotate(self) -> None:
+        """Close the active file as a segment and queue it for compression.
+
+        Does nothing if another process rotated the file first, or if what
+        every process wrote still fits in ``max_bytes``.
+        """
+        self.acquire()
+        try:
+            self.sync()
+            with open(self.lock_path, "a", encoding="utf-8") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                if self._follow() or self.bytes_written < self.max_bytes:
+                    return
+                self.stream.close()
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+                segment = f"{self.baseFilename}.{stamp}"
+                os.replace(self.baseFilename, segment)
+                self.stream = self._open()
+                self.bytes_written = 0
+        finally:
+            self.release()
+        SEGMENTS_ROTATED.inc()
+        self._compressor.submit(self._finish_segment, segment)
+
+    def close(self) -> None:
+        """Flush, wait for pending compression and release the file."""
+        self._stopped.set()
+        self.sync()
+        self._compressor.shutdown(wait=True)
+        super().close()
+
+    def _sync_periodically(self) -> None:
+        """Flush and fsync every ``fsync_interval`` until closed."""
+        while not self._stopped.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except (OSError, ValueError):
+                # The stream is being rotated or closed; the next tick retries
+                continue
+
+    def _finish_segment(self, segment: str) -> None:
+        """Compress a rotated segment, then apply retention.
+
+        Waits two sync intervals first, unless the handler is closing, so
+        other processes still writing to the segment reopen and flush.
+        """
+        self._stopped.wait(2 * self.fsync_interval)
+        if self.compression != "none":
+            target = segment + COMPRESSED_SUFFIXES[self.compression]
+            with open(segment, "rb") as source, open(target, "wb") as sink:
+                if self.compression == "gzip":
+                    with gzip.GzipFile(fileobj=sink, mode="wb", compresslevel=6) as out:
+                        shutil.copyfileobj(source, out, FILE_BUFFER_SIZE)
+                else:
+                    zstandard.ZstdCompressor().copy_stream(source, sink)
+            os.remove(segment)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete rotated segments older than the retention window."""
+        cutoff = time.time() - self.retention_days * 86400
+        for path in glob.glob(glob.escape(self.baseFilename) + ".*"):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
@@ -0,0 +1,323 @@
+"""
+Logging configuration for stdlib logging and structlog.
+"""
+import atexit
+import itertools
+import logging
+import logging.config
+import queue
+from typing import Any, Dict, List, Mapping, Optional
+
+import structlog
+
+from src.config import Config, config, parse_sample_rates
+from src.log_handlers import BackgroundListener, BoundedQueueHandler
+from src.reload import config_reloader
+
+# Settings read by configure_logging(); changing one rebuilds the handlers
+LOGGING_SETTINGS = (
+    "ENABLE_ASYNC_LOGGING",
+    "LOG_FORMAT",
+    "LOG_OUTPUT",
+    "LOG_FILE_PATH",
+    "LOG_ROTATION_SIZE",
+    "LOG_RETENTION_DAYS",
+    "LOG_COMPRESSION",
+    "LOG_FSYNC_INTERVAL_MS",
+    "LOG_QUEUE_SIZE",
+    "LOG_QUEUE_OVERFLOW",
+    "LOG_QUEUE_SAMPLE_RATE",
+    "LOG_SAMPLE_RATES",
+)
+
+# Levels at which EventSampler may drop events; warnings are always kept
+SAMPLED_METHODS = frozenset({"debug", "info"})
+
+# Standard levels, highest first, with their bound logger method names
+STANDARD_LEVELS = (
+    (logging.CRITICAL, "critical"),
+    (logging.ERROR, "error"),
+    (logging.WARNING, "warning"),
+    (logging.INFO, "info"),
+    (logging.DEBUG, "debug"),
+)
+
+_listener: Optional[BackgroundListener] = None
+
+# Shared with loggers cached on first use, so reconfiguring updates them in place
+_processors: List[Any] = []
+
+# Run for records that did not come from structlog, e.g. uvicorn's
+PRE_CHAIN = [
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso", utc=True),
+]
+
+
+class EventSampler:
+    """structlog processor that keeps one in N occurrences of chosen events.
+
+    Sampling is keyed on the event name, so a noisy message such as a
+    health check hit can be thinned without touching anything else. Kept
+    events carry ``sample_rate`` so counts can be scaled back up.
+    """
+
+    def __init__(self, rates: Mapping[str, int]):
+        """Initialize the sampler.
+
+        Args:
+            rates (Mapping[str, int]): Keep one in N, per event name
+        """
+        self.rates = dict(rates)
+        self._counters = {event: itertools.count() for event in self.rates}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict) -> Dict:
+        """Drop the event unless it is the one in N to keep.
+
+        Raises:
+            structlog.DropEvent: If the event is sampled out
+        """
+        event: str = event_dict.get("event", "")
+        counter = self._counters.get(event)
+        if counter is None or method_name not in SAMPLED_METHODS:
+            return event_dict
+        if next(counter) % self.rates[event]:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = self.rates[event]
+        return event_dict
+
+
+class LevelFilteringBoundLogger(structlog.stdlib.BoundLogger):
+    """Bound logger that checks the stdlib level before running processors.
+
+    ``Logger.isEnabledFor`` answers from a per-logger cache that the stdlib
+    clears whenever a level changes, so a disabled call costs one dictionary
+    lookup instead of a pass through the processor chain, and levels set at
+    runtime with ``set_logger_level`` apply immediately.
+    """
+
+    def _log_at(
+        self, levelno: int, method: str, event: Any, /, *args: Any, **kw: Any
+    ) -> Any:
+        """Proxy a call to the logger if its level is enabled."""
+        if not self._logger.isEnabledFor(levelno):
+            return None
+        return self._proxy_to_logger(method, event, *args, **kw)
+
+    def debug(self, event: Any = None, *args: Any, **kw: Any) -> Any:
+        """Log at DEBUG."""
+        return self._log_at(logging.DEBUG, "debug", event, *args, **kw)
+
+    def info(self, event: Any = None, *args: Any, **kw: Any) -> Any:
+        """Log at INFO."""
+        return self._log_at(logging.INFO, "info", event, *args, **kw)
+
+    def warning(self, event: Any = None, *args: Any, **kw: Any) -> Any:
+        """Log at WARNING."""
+        return self._log_at(logging.WARNING, "warning", event, *args, **kw)
+
+    warn = warning
+
+    def error(self, event: Any = None, *args: Any, **kw: Any) -> Any:
+        """Log at ERROR."""
+        return self._log_at(logging.ERROR, "error", event, *args, **kw)
+
+    def critical(self, event: Any = None, *args: Any, **kw: Any) -> Any:
+        """Log at CRITICAL."""
+        return self._log_at(logging.CRITICAL, "critical", event, *args, **kw)
+
+    def log(self, level: int, event: Any = None, *args: Any, **kw: Any) -> Any:
+        """Log at an arbitrary numeric level.
+
+        Processors see the nearest standard level at or below ``level``, so
+        a custom level such as 25 renders as ``info``, while the stdlib
+        record keeps the exact number for handler and logger filtering.
+        """
+        if not self._logger.isEnabledFor(level):
+            return None
+        if args:
+            kw["positional_args"] = args
+        method = next(
+            (name for number, name in STANDARD_LEVELS if level >= number), "debug"
+        )
+        try:
+            record_args, record_kw = self._process_event(method, event, kw)
+        except structlog.DropEvent:
+            return None
+        return self._logger.log(level, *record_args, **record_kw)
+
+
+def set_logger_level(name: str, level: str) -> None:
+    """Change a logger's level in this process without a restart.
+
+    Args:
+        name (str): Logger name, ``root`` for the root logger
+        level (str): Level name, e.g. ``DEBUG``
+
+    Raises:
+        ValueError: If the level name is unknown
+    """
+    if not isinstance(logging.getLevelName(level.upper()), int):
+        raise ValueError(f"Unknown log level: {level}")
+    logging.getLogger(name).setLevel(level.upper())
+
+
+def get_logger_levels() -> Dict[str, str]:
+    """Get the levels explicitly set on the root and named loggers.
+
+    Returns:
+        Dict[str, str]: Level name per logger, loggers inheriting omitted
+    """
+    levels = {"root": logging.getLevelName(logging.getLogger().level)}
+    for name, item in sorted(logging.root.manager.loggerDict.items()):
+        if isinstance(item, logging.Logger) and item.level != logging.NOTSET:
+            levels[name] = logging.getLevelName(item.level)
+    return levels
+
+
+def logging_dict_config() -> Dict[str, Any]:
+    """Build the ``dictConfig`` for the configured output format.
+
+    Returns:
+        Dict[str, Any]: Logging configuration dictionary
+    """
+    renderer = (
+        structlog.processors.JSONRenderer()
+        if config.logging.LOG_FORMAT == "json"
+        else structlog.dev.ConsoleRenderer(colors=False)
+    )
+    handlers: Dict[str, Dict[str, Any]] = {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "structured",
+        },
+    }
+    if config.logging.LOG_OUTPUT == "file":
+        handlers = {
+            "file": {
+                "class": "src.log_handlers.CompressingFileHandler",
+                "formatter": "structured",
+                "filename": config.logging.LOG_FILE_PATH,
+                "max_bytes": config.logging.LOG_ROTATION_BYTES,
+                "retention_days": config.logging.LOG_RETENTION_DAYS,
+                "compression": config.logging.LOG_COMPRESSION,
+                "fsync_interval": config.logging.LOG_FSYNC_INTERVAL_MS / 1000,
+            },
+        }
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "structured": {
+                "()": structlog.stdlib.ProcessorFormatter,
+                "processors": [
+                    structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                    structlog.processors.format_exc_info,
+                    renderer,
+                ],
+                "foreign_pre_chain": PRE_CHAIN,
+            },
+        },
+        "handlers": handlers,
+        "root": {
+            "handlers": list(handlers),
+            "level": config.app.LOG_LEVEL,
+        },
+    }
+
+
+def configure_logging() -> None:
+    """Configure stdlib logging and route structlog through it.
+
+    structlog only builds the event dictionary; rendering is left to the
+    handlers' ``ProcessorFormatter``. Bound loggers are cached on first use
+    and drop calls below their logger's level before any processor runs.
+    With ENABLE_ASYNC_LOGGING the root logger's handlers are moved behind a
+    bounded queue, so a log call on the event loop costs one
+    ``put_nowait`` and the listener thread does the JSON rendering and the
+    blocking write.
+    """
+    stop_logging()
+    logging.config.dictConfig(logging_dict_config())
+    # Level filtering happens in LevelFilteringBoundLogger, before this chain
+    _processors[:] = [
+        EventSampler(parse_sample_rates(config.logging.LOG_SAMPLE_RATES)),
+        structlog.contextvars.merge_contextvars,
+        *PRE_CHAIN,
+        structlog.processors.StackInfoRenderer(),
+        # Tracebacks must be captured on the calling thread, not the listener
+        structlog.processors.format_exc_info,
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+    ]
+    structlog.configure(
+        processors=_processors,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=LevelFilteringBoundLogger,
+        cache_logger_on_first_use=True,
+    )
+    if config.features.ENABLE_ASYNC_LOGGING:
+        start_queue_logging()
+
+
+def start_queue_logging() -> None:
+    """Move the root logger's handlers onto a background listener thread."""
+    global _listener
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue: queue.Queue = queue.Queue(config.logging.LOG_QUEUE_SIZE)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(
+        BoundedQueueHandler(
+            log_queue,
+            policy=config.logging.LOG_QUEUE_OVERFLOW,
+            sample_rate=config.logging.LOG_QUEUE_SAMPLE_RATE,
+        )
+    )
+    _listener = BackgroundListener(log_queue, *handlers)
+    _listener.start()
+
+
+def get_listener() -> Optional[BackgroundListener]:
+    """Get the running queue listener, if async logging is on.
+
+    Returns:
+        Optional[BackgroundListener]: Listener writing queued records
+    """
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and write directly from the calling thread again.
+
+    Registered with ``atexit`` so records logged during shutdown are not
+    lost when the interpreter exits.
+    """
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, BoundedQueueHandler):
+            root.removeHandler(handler)
+    listener, _listener = _listener, None
+    # Drain before swapping handlers back so ordering is preserved
+    listener.stop()
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+
+atexit.register(stop_logging)
+
+
+@config_reloader.on_change("LOG_LEVEL")
+def apply_log_level(new: Config) -> None:
+    """Set the root level; loggers with their own level keep it."""
+    set_logger_level("root", new.app.LOG_LEVEL)
+
+
+@config_reloader.on_change(*LOGGING_SETTINGS)
+def reconfigure_logging(new: Config) -> None:
+    """Rebuild handlers and processors, flushing queued records first."""
+    configure_logging()
@@ -1,79 +1,71 @@
 """
 Main application module for the logging service.
 """
-import logging
-import logging.config
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import structlog
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import make_asgi_app
-
-from src.config import config
-
-# Configure logging
-logging.config.dictConfig({
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "json": {
-            "()": structlog.stdlib.ProcessorFormatter,
-            "processor": structlog.processors.JSONRenderer(),
-        },
-        "standard": {
-            "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-        },
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "json" if config.logging.LOG_FORMAT == "json" else "standard",
-        },
-    },
-    "root": {
-        "handlers": ["console"],
-        "level": config.app.LOG_LEVEL,
-    },
-})
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+
+from src import admin
+from src.cache import close_redis, init_redis
+from src.config import Config, config
+from src.database import close_db, get_read_db
+from src.export import accepts_gzip, export_ndjson, gzip_stream
+from src.health import LIVE_BODY, health_prober
+from src.http_metrics import HTTPMetricsMiddleware
+from src.ingestion import (
+    BATCHES_REJECTED,
+    RECORDS_ACCEPTED,
+    QueueFullError,
+    batch_queue,
+    parse_batch,
+)
+from src.logging_setup import configure_logging
+from src.metrics import metrics_app
+from src.partitions import log_partitions
+from src.rate_limit import RateLimitMiddleware
+from src.reload import config_reloader
+from src.search import (
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    SearchFilters,
+    decode_cursor,
+    search_logs,
+)
+from src.serialization import ORJSONResponse
+from src.streams import StreamFullError, stream_ingestor
+from src.warmup import warm_up
+from src.writer import log_writer, write_log_records
 
 logger = structlog.get_logger(__name__)
 
-# Create FastAPI application
-app = FastAPI(
-    title=config.app.APP_NAME,
-    description="A Python-based logging service",
-    version="0.1.0",
-    debug=config.app.DEBUG
-)
+# PostgreSQL error code for a malformed regular expression in a search
+INVALID_REGULAR_EXPRESSION = "2201B"
+QUERY_CANCELED = "57014"
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=config.security.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-    max_age=600,
-)
+# Service routes; create_app() adds them to each application it builds
+router = APIRouter()
 
-# Add metrics endpoint
-metrics_app = make_asgi_app()
-app.mount("/metrics", metrics_app)
 
-@app.get("/")
+@router.get("/")
 async def root() -> Dict[str, str]:
     """Root endpoint returning service information."""
     logger.info("Root endpoint accessed")
     return {
         "service": config.app.APP_NAME,
         "environment": config.app.ENVIRONMENT,
-        "status": "operational"
+        "status": "operational",
     }
 
-@app.get("/health")
+
+@router.get("/health")
 async def health_check() -> Dict[str, Any]:
     """Health check endpoint."""
     logger.debug("Health check endpoint accessed")
@@ -81,18 +73,40 @@ async def health_check() -> Dict[str, Any]:
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "environment": config.app.ENVIRONMENT,
-        "version": "0.1.0"
+        "version": "0.1.0",
     }
 
-@app.get("/config")
+
+@router.get("/health/live")
+async def liveness() -> Response:
+    """Liveness probe: the worker's event loop is serving requests."""
+    return Response(content=LIVE_BODY, media_type="application/json")
+
+
+@router.get("/health/ready")
+async def readiness() -> Response:
+    """Readiness probe served from the last background dependency check.
+
+    Returns 503 until the first probe has passed, while PostgreSQL or Redis
+    is unreachable, or while the ingestion backlog is above its high-water
+    mark.
+    """
+    return Response(
+        content=health_prober.body,
+        status_code=200 if health_prober.ready else 503,
+        media_type="application/json",
+    )
+
+
+@router.get("/config")
 async def get_config() -> Dict[str, Any]:
     """Return non-sensitive configuration information."""
     if not config.app.DEBUG:
         raise HTTPException(
             status_code=403,
-            detail="Configuration endpoint only available in debug mode"
+            detail="Configuration endpoint only available in debug mode",
         )
-    
+
     logger.info("Configuration endpoint accessed")
     return {
         "app_name": config.app.APP_NAME,
@@ -102,24 +116,325 @@ async def get_config() -> Dict[str, Any]:
         "metrics_enabled": config.monitoring.ENABLE_METRICS,
         "features": {
             "batch_processing": config.features.ENABLE_BATCH_PROCESSING,
-            "async_logging": config.features.ENABLE_ASYNC_LOGGING
-        }
+            "async_logging": config.features.ENABLE_ASYNC_LOGGING,
+        },
+    }
+
+
+async def read_capped_body(request: Request, limit: int) -> bytes:
+    """Read a request body, refusing it once it grows past ``limit`` bytes.
+
+    A declared Content-Length over the limit is rejected before reading;
+    chunked or understated bodies are cut off while they stream in.
+
+    Raises:
+        HTTPException: 413 if the body is larger than ``limit``
+    """
+
+    def too_large() -> HTTPException:
+        BATCHES_REJECTED.labels(reason="too_large").inc()
+        return HTTPException(
+            status_code=413, detail=f"Request body exceeds {limit} bytes"
+        )
+
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large()
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large()
+    return bytes(body)
+
+
+@router.post("/logs/batch", status_code=202)
+async def ingest_batch(request: Request) -> Dict[str, int]:
+    """Accept a batch of log records as a JSON array or NDJSON body.
+
+    Records are validated in one pass. With stream ingestion enabled they
+    are appended to the Redis ingestion stream, which survives worker
+    crashes; with async logging enabled they are handed to the in-process
+    batch queue. In both cases the response does not wait for them to be
+    persisted; otherwise they are written before responding.
+    """
+    if not config.features.ENABLE_BATCH_PROCESSING:
+        raise HTTPException(status_code=403, detail="Batch processing is disabled")
+
+    body = await read_capped_body(request, config.performance.MAX_BODY_BYTES)
+    try:
+        records = parse_batch(body, request.headers.get("content-type", ""))
+    except ValidationError as exc:
+        BATCHES_REJECTED.labels(reason="invalid").inc()
+        raise HTTPException(
+            status_code=422,
+            detail=exc.errors(include_url=False, include_context=False)[:20],
+        ) from exc
+
+    if len(records) > config.performance.MAX_BATCH_SIZE:
+        BATCHES_REJECTED.labels(reason="too_large").inc()
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {config.performance.MAX_BATCH_SIZE} records",
+        )
+    if not records:
+        return {"accepted": 0}
+
+    if config.features.ENABLE_STREAM_INGESTION:
+        try:
+            await stream_ingestor.append(records)
+        except StreamFullError as exc:
+            BATCHES_REJECTED.labels(reason="stream_full").inc()
+            raise HTTPException(
+                status_code=503, detail=str(exc), headers={"Retry-After": "1"}
+            ) from exc
+        RECORDS_ACCEPTED.inc(len(records))
+        return {"accepted": len(records)}
+
+    if not config.features.ENABLE_ASYNC_LOGGING:
+        await write_log_records(records)
+        RECORDS_ACCEPTED.inc(len(records))
+        return {"accepted": len(records)}
+
+    try:
+        batch_queue.put_nowait(records)
+    except QueueFullError as exc:
+        BATCHES_REJECTED.labels(reason="queue_full").inc()
+        raise HTTPException(
+            status_code=503, detail=str(exc), headers={"Retry-After": "1"}
+        ) from exc
+
+    RECORDS_ACCEPTED.inc(len(records))
+    return {"accepted": len(records)}
+
+
+def search_filters(
+    q: Optional[str] = None,
+    regex: bool = False,
+    level: List[str] = Query(default=[]),
+    service: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> SearchFilters:
+    """Build search criteria from query parameters.
+
+    ``q`` matches a case-insensitive substring of the message, or a POSIX
+    regular expression when ``regex`` is true.
+    """
+    return SearchFilters(
+        query=q, regex=regex, levels=level, service=service, start=start, end=end
+    )
+
+
+@router.get("/logs/search")
+async def search(
+    filters: SearchFilters = Depends(search_filters),
+    limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> ORJSONResponse:
+    """Search log events, newest first, on a read replica when available.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the following
+    page. Rows are returned as an ``ORJSONResponse`` directly so they skip
+    ``jsonable_encoder``.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    try:
+        async with get_read_db() as db:
+            page = await search_logs(db, filters, limit, after)
+    except DBAPIError as exc:
+        sqlstate = getattr(exc.orig, "sqlstate", None)
+        if sqlstate == INVALID_REGULAR_EXPRESSION:
+            raise HTTPException(
+                status_code=400, detail="Invalid search expression"
+            ) from exc
+        if sqlstate == QUERY_CANCELED:
+            raise HTTPException(
+                status_code=503,
+                detail="Search timed out; narrow the filters or the expression",
+                headers={"Retry-After": "1"},
+            ) from exc
+        raise
+    return ORJSONResponse(page)
+
+
+@router.get("/logs/export")
+async def export(
+    request: Request, filters: SearchFilters = Depends(search_filters)
+) -> StreamingResponse:
+    """Stream every matching log event as NDJSON.
+
+    The body is gzip-compressed when the client accepts it.
+    """
+    body = export_ndjson(filters)
+    headers = {
+        "Content-Disposition": 'attachment; filename="logs.ndjson"',
+        "Vary": "Accept-Encoding",
     }
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+
+@config_reloader.on_change(
+    "ENABLE_BATCH_PROCESSING", "ENABLE_STREAM_INGESTION", "ENABLE_ASYNC_LOGGING"
+)
+async def start_ingestion(new: Config) -> None:
+    """Run the batch consumer the feature flags select and stop the other.
+
+    Stopping the writer drains the in-memory queue first, so switching modes
+    at runtime loses no accepted batch.
+
+    Args:
+        new (Config): Configuration to follow
+    """
+    features = new.features
+    stream = features.ENABLE_BATCH_PROCESSING and features.ENABLE_STREAM_INGESTION
+    queued = (
+        features.ENABLE_BATCH_PROCESSING
+        and not features.ENABLE_STREAM_INGESTION
+        and features.ENABLE_ASYNC_LOGGING
+    )
+    if not queued:
+        await log_writer.stop(timeout=new.performance.SHUTDOWN_TIMEOUT)
+    if not stream:
+        await stream_ingestor.stop()
+    if stream:
+        await stream_ingestor.start()
+    elif queued:
+        await log_writer.start()
+
 
-@app.on_event("startup")
 async def startup_event() -> None:
-    """Handle application startup events."""
+    """Handle application startup events.
+
+    Pools are filled and hot statements prepared before the worker accepts
+    traffic, so the first requests after a deploy do not pay for them.
+    """
     logger.info(
         "Application starting",
         app_name=config.app.APP_NAME,
-        environment=config.app.ENVIRONMENT
+        environment=config.app.ENVIRONMENT,
     )
+    await init_redis()
+    await warm_up()
+    await log_partitions.start()
+    await start_ingestion(config)
+    await health_prober.start()
+    await config_reloader.start()
+
 
-@app.on_event("shutdown")
 async def shutdown_event() -> None:
-    """Handle application shutdown events."""
+    """Handle application shutdown events.
+
+    The server has stopped accepting requests and finished those in flight
+    by now. Readiness fails first, then consumers stop and the write queue
+    is flushed, all within one SHUTDOWN_TIMEOUT deadline.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + config.performance.SHUTDOWN_TIMEOUT
+    await health_prober.stop()
+    await config_reloader.stop()
+    await stream_ingestor.stop()
+    await log_writer.stop(timeout=max(0.0, deadline - loop.time()))
+    await log_partitions.stop()
+    await close_redis()
+    await close_db()
+    if config.monitoring.ENABLE_TRACING:
+        from src.telemetry import shutdown_tracing
+
+        shutdown_tracing()
     logger.info(
         "Application shutting down",
         app_name=config.app.APP_NAME,
-        environment=config.app.ENVIRONMENT
-    ) 
\ No newline at end of file
+        environment=config.app.ENVIRONMENT,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run startup before the first request and shutdown after the last.
+
+    Args:
+        app (FastAPI): Application being served
+    """
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
+
+
+def create_app() -> FastAPI:
+    """Build the application: logging, middleware, routes and tracing.
+
+    Nothing here connects to PostgreSQL or Redis; the engine and clients are
+    created on first use or in the startup handler. OpenTelemetry is only
+    imported when ENABLE_TRACING is on.
+
+    Returns:
+        FastAPI: Configured application
+    """
+    configure_logging()
+
+    app = FastAPI(
+        title=config.app.APP_NAME,
+        description="A Python-based logging service",
+        version="0.1.0",
+        debug=config.app.DEBUG,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+
+    # Add rate limiting middleware (inside CORS so preflights are not limited)
+    app.add_middleware(RateLimitMiddleware)
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.security.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+        max_age=600,
+    )
+
+    # Outermost, so rate-limited and CORS responses are measured too
+    if config.monitoring.ENABLE_METRICS:
+        app.add_middleware(HTTPMetricsMiddleware)
+
+    # Add metrics endpoint
+    app.mount("/metrics", metrics_app())
+
+    app.include_router(router)
+    app.include_router(admin.router)
+
+    if config.monitoring.ENABLE_TRACING:
+        from src.telemetry import init_tracing
+
+        init_tracing(app)
+    return app
+
+
+def __getattr__(name: str) -> Any:
+    """Build the shared ``app`` on first access, e.g. by ``src.main:app``.
+
+    Args:
+        name (str): Attribute name
+
+    Returns:
+        Any: The application
+
+    Raises:
+        AttributeError: If the module has no such attribute
+    """
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,39 @@
+"""
+Prometheus exposition that works with one process or many.
+"""
+import os
+from typing import Callable
+
+from prometheus_client import CollectorRegistry, make_asgi_app, multiprocess
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def multiprocess_enabled() -> bool:
+    """Check whether metrics are shared between worker processes.
+
+    ``prometheus_client`` switches to file-backed values when
+    PROMETHEUS_MULTIPROC_DIR is set before it is imported; the gunicorn
+    configuration sets it in the master so every worker inherits it.
+
+    Returns:
+        bool: True if multiprocess mode is active
+    """
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def metrics_app() -> Callable:
+    """Build the ASGI app served at ``/metrics``.
+
+    In multiprocess mode a fresh registry aggregates every worker's metric
+    files on each scrape, so the answer does not depend on which worker the
+    scrape lands on. Otherwise the default per-process registry is used.
+
+    Returns:
+        Callable: ASGI application
+    """
+    if not multiprocess_enabled():
+        return make_asgi_app()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return make_asgi_app(registry)
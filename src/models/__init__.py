@@ -2,5 +2,6 @@
 Database models package.
 """
 from src.models.base import Base
+from src.models.log_event import LogEvent
 
-__all__ = ["Base"] 
\ No newline at end of file
+__all__ = ["Base", "LogEvent"]
@@ -3,34 +3,101 @@
 """
 import uuid
 from datetime import datetime
-from typing import Any, Dict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from sqlalchemy import Column, DateTime, String, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    and_,
+    bindparam,
+    func,
+    or_,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.serialization import model_serializer
+
+# Rows sent per statement by the bulk helpers
+BULK_CHUNK_SIZE = 5000
+
+# Columns the bulk helpers maintain themselves on update
+AUDIT_COLUMNS = ("updated_at", "updated_by")
+
+
+def chunked(rows: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Split a sequence into consecutive slices of at most ``size`` items.
+
+    Args:
+        rows (Sequence[Any]): Items to split
+        size (int): Maximum slice length
+
+    Yields:
+        Sequence[Any]: Consecutive slices
+    """
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
 
 
 @as_declarative()
 class Base:
     """Base class for all database models."""
 
-    # Generate __tablename__ automatically
+    if TYPE_CHECKING:
+        # Set by declarative; subclasses may also name their table directly
+        __table__: ClassVar[Table]
+        __tablename__: ClassVar[str]
+        metadata: ClassVar[MetaData]
+    else:
+        # Generate __tablename__ automatically
+        @declared_attr
+        def __tablename__(cls) -> str:  # pylint: disable=no-self-argument
+            """Generate table name from class name.
+
+            Returns:
+                str: Table name in snake_case
+            """
+            return cls.__name__.lower()
+
+    # Common columns for all tables
+    # Client-side primary key generator; set to ``uuid7`` for time-ordered
+    # keys on write-heavy tables
+    __id_generator__: ClassVar[Callable[[], uuid.UUID]] = uuid.uuid4
+
     @declared_attr
-    def __tablename__(cls) -> str:  # pylint: disable=no-self-argument
-        """Generate table name from class name.
-        
+    @classmethod
+    def id(cls) -> Mapped[uuid.UUID]:
+        """Build the primary key column using the model's ID generator.
+
         Returns:
-            str: Table name in snake_case
+            Mapped[uuid.UUID]: UUID primary key column
         """
-        return cls.__name__.lower()
+        return mapped_column(
+            UUID(as_uuid=True),
+            primary_key=True,
+            default=cls.__id_generator__,
+            server_default=text("uuid_generate_v4()"),
+        )
 
-    # Common columns for all tables
-    id = Column(
-        UUID(as_uuid=True),
-        primary_key=True,
-        default=uuid.uuid4,
-        server_default=text("uuid_generate_v4()"),
-    )
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -49,21 +116,175 @@ def __tablename__(cls) -> str:  # pylint: disable=no-self-argument
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert model instance to dictionary.
-        
+
+        Uses the serializer cached for the model class; see
+        ``src.serialization``.
+
         Returns:
             Dict[str, Any]: Model data as dictionary
         """
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        model: type = type(self)
+        return model_serializer(model)(self)
 
     def update(self, **kwargs: Any) -> None:
         """Update model instance with provided values.
-        
+
         Args:
             **kwargs: Key-value pairs to update
         """
         for key, value in kwargs.items():
             if hasattr(self, key):
-                setattr(self, key, value) 
\ No newline at end of file
+                setattr(self, key, value)
+
+    @classmethod
+    def _audit_values(cls, updated_by: Optional[str]) -> Dict[str, Any]:
+        """Return server-side values for the update audit columns.
+
+        Args:
+            updated_by (Optional[str]): Acting user, defaults to the
+                database role (``CURRENT_USER``)
+
+        Returns:
+            Dict[str, Any]: SQL expressions keyed by column name
+        """
+        return {
+            "updated_at": func.now(),
+            "updated_by": func.current_user() if updated_by is None else updated_by,
+        }
+
+    @classmethod
+    async def bulk_insert(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[Mapping[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> int:
+        """Insert many rows with batched multi-row INSERT statements.
+
+        Args:
+            session (AsyncSession): Session to execute in; not committed
+            rows (Sequence[Mapping[str, Any]]): Column values keyed by name
+            chunk_size (int): Rows per statement
+
+        Returns:
+            int: Number of rows submitted
+        """
+        for chunk in chunked(rows, chunk_size):
+            await session.execute(insert(cls.__table__), list(chunk))
+        return len(rows)
+
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[Mapping[str, Any]],
+        index_elements: Optional[Sequence[str]] = None,
+        updated_by: Optional[str] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> int:
+        """Insert rows, updating existing ones with ``ON CONFLICT DO UPDATE``.
+
+        Conflicting rows are only rewritten when a value actually changed,
+        so unchanged rows create no dead tuples; rows with only key columns
+        are left alone. ``updated_at`` and ``updated_by`` are set by the
+        server on update.
+
+        Args:
+            session (AsyncSession): Session to execute in; not committed
+            rows (Sequence[Mapping[str, Any]]): Column values keyed by name;
+                every row must have the same keys
+            index_elements (Optional[Sequence[str]]): Conflict target columns,
+                defaults to the primary key
+            updated_by (Optional[str]): Acting user, defaults to the
+                database role
+            chunk_size (int): Rows per statement
+
+        Returns:
+            int: Number of rows submitted
+        """
+        if not rows:
+            return 0
+        table = cls.__table__
+        if index_elements is None:
+            index_elements = [column.name for column in table.primary_key]
+        changed = [
+            name
+            for name in rows[0]
+            if name not in index_elements and name not in AUDIT_COLUMNS
+        ]
+
+        stmt = insert(table)
+        if changed:
+            excluded = stmt.excluded
+            set_ = {name: excluded[name] for name in changed}
+            set_.update(cls._audit_values(updated_by))
+            where = or_(
+                *(table.c[name].is_distinct_from(excluded[name]) for name in changed)
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(index_elements), set_=set_, where=where
+            )
+        else:
+            # Only key columns given: there is nothing an update could change
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+        for chunk in chunked(rows, chunk_size):
+            await session.execute(stmt, list(chunk))
+        return len(rows)
+
+    @classmethod
+    async def bulk_update(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[Mapping[str, Any]],
+        updated_by: Optional[str] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> int:
+        """Update many rows by primary key.
+
+        Rows are grouped by the columns they set, and each group is sent as
+        one prepared ``UPDATE`` executed for every row in a single pipelined
+        batch. As with ``bulk_upsert``, a row is only rewritten when a value
+        actually changed, and rows with only key columns are not sent.
+        ``updated_at`` and ``updated_by`` are set by the server.
+
+        Args:
+            session (AsyncSession): Session to execute in; not committed
+            rows (Sequence[Mapping[str, Any]]): Primary key and new column
+                values keyed by column name
+            updated_by (Optional[str]): Acting user, defaults to the
+                database role
+            chunk_size (int): Rows per batch
+
+        Returns:
+            int: Number of rows submitted, not counting key-only rows
+
+        Raises:
+            KeyError: If a row is missing a primary key column
+        """
+        table = cls.__table__
+        keys = [column.name for column in table.primary_key]
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            params = {f"b_{name}": row[name] for name in keys}
+            columns = tuple(
+                name for name in row if name not in keys and name not in AUDIT_COLUMNS
+            )
+            if not columns:
+                continue
+            params.update((f"b_{name}", row[name]) for name in columns)
+            groups.setdefault(columns, []).append(params)
+
+        for columns, group in groups.items():
+            values: Dict[str, Any] = {name: bindparam(f"b_{name}") for name in columns}
+            values.update(cls._audit_values(updated_by))
+            match = [table.c[name] == bindparam(f"b_{name}") for name in keys]
+            changed = or_(
+                *(
+                    table.c[name].is_distinct_from(bindparam(f"b_{name}"))
+                    for name in columns
+                )
+            )
+            stmt = update(table).where(and_(*match, changed)).values(values)
+            for chunk in chunked(group, chunk_size):
+                await session.execute(stmt, list(chunk))
+        return sum(len(group) for group in groups.values())
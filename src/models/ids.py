@@ -0,0 +1,36 @@
+"""
+Primary key generators.
+"""
+import os
+import time
+import uuid
+
+_last_stamp = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The top 48 bits hold the Unix time in milliseconds and the 12 bits of
+    ``rand_a`` hold the sub-millisecond fraction, so IDs from one process
+    sort in creation order and consecutive inserts land on the same B-tree
+    leaf pages instead of random ones. The remaining 62 bits are random.
+
+    Returns:
+        uuid.UUID: New identifier
+    """
+    global _last_stamp
+    milliseconds, nanoseconds = divmod(time.time_ns(), 1_000_000)
+    stamp = (milliseconds << 12) | (nanoseconds * 4096 // 1_000_000)
+    if stamp <= _last_stamp:
+        # Keep IDs increasing when the clock stalls or steps backwards
+        stamp = _last_stamp + 1
+    _last_stamp = stamp
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return uuid.UUID(
+        int=(stamp >> 12) << 80
+        | 0x7 << 76
+        | (stamp & 0xFFF) << 64
+        | 0b10 << 62
+        | random_bits
+    )
@@ -0,0 +1,34 @@
+"""
+Log event model for ingested log records.
+"""
+from sqlalchemy import Column, DateTime, Index, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.models.base import Base
+from src.models.ids import uuid7
+
+
+class LogEvent(Base):
+    """A single ingested log record.
+
+    The table is range-partitioned by day on ``timestamp``; see
+    ``src.partitions`` for partition creation and retention. The trigram
+    index used for message search needs ``pg_trgm`` and is created by
+    ``init-scripts/05-log-search.sql``. IDs are UUIDv7 so inserts append to
+    the right-hand edge of the primary key and keyset indexes.
+    """
+
+    __tablename__ = "log_events"
+    __table_args__ = (
+        Index("idx_log_events_timestamp_id", "timestamp", "id"),
+        Index("idx_log_events_service_timestamp_id", "service", "timestamp", "id"),
+        {"schema": "logging", "postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    __id_generator__ = uuid7
+
+    # Part of the primary key: PostgreSQL requires the partition key in it
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    level = Column(String(16), nullable=False)
+    service = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    attributes = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
@@ -0,0 +1,219 @@
+"""
+Daily partition maintenance for time-partitioned log storage.
+"""
+import asyncio
+from contextlib import suppress
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set
+
+import structlog
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.config import config
+from src.database import get_engine
+from src.models import LogEvent
+
+logger = structlog.get_logger(__name__)
+
+PARTITION_DATE_FORMAT = "%Y%m%d"
+
+
+def utc_today() -> date:
+    """Return the current UTC date."""
+    return datetime.now(timezone.utc).date()
+
+
+class PartitionManager:
+    """Creates upcoming daily partitions and drops expired ones.
+
+    Partitions are named ``<table>_pYYYYMMDD`` and cover one UTC day each.
+    Dropping a whole partition replaces row-by-row ``DELETE`` for retention.
+
+    Attributes:
+        table (Table): Partitioned parent table
+    """
+
+    def __init__(self, table: Table):
+        """Initialize the manager without starting the scheduler.
+
+        Args:
+            table (Table): Partitioned parent table
+        """
+        self.table = table
+        self._known: Set[date] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def qualified_name(self) -> str:
+        """Return the schema-qualified parent table name."""
+        return f"{self.table.schema}.{self.table.name}"
+
+    def partition_name(self, day: date) -> str:
+        """Return the partition table name for a day.
+
+        Args:
+            day (date): UTC day covered by the partition
+
+        Returns:
+            str: Unqualified partition table name
+        """
+        return f"{self.table.name}_p{day.strftime(PARTITION_DATE_FORMAT)}"
+
+    def partition_day(self, name: str) -> Optional[date]:
+        """Parse the day covered by a partition from its name.
+
+        Args:
+            name (str): Partition table name
+
+        Returns:
+            Optional[date]: Covered day, or None for foreign tables
+        """
+        prefix = f"{self.table.name}_p"
+        if not name.startswith(prefix):
+            return None
+        try:
+            return datetime.strptime(name[len(prefix) :], PARTITION_DATE_FORMAT).date()
+        except ValueError:
+            return None
+
+    def reset(self) -> None:
+        """Forget which partitions are known to exist."""
+        self._known.clear()
+
+    async def list_partitions(self, conn: AsyncConnection) -> List[str]:
+        """List the partitions currently attached to the parent table.
+
+        Args:
+            conn (AsyncConnection): Open database connection
+
+        Returns:
+            List[str]: Partition table names
+        """
+        result = await conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:parent AS regclass) "
+                "ORDER BY c.relname"
+            ),
+            {"parent": self.qualified_name},
+        )
+        return list(result.scalars())
+
+    async def ensure_partitions(self, days: Iterable[date]) -> List[str]:
+        """Create any missing partitions for the given days.
+
+        Days already known to exist are skipped without a round trip, so
+        this is cheap to call on every write.
+
+        Args:
+            days (Iterable[date]): UTC days that need a partition
+
+        Returns:
+            List[str]: Names of partitions that were created
+        """
+        missing = sorted(set(days) - self._known)
+        if not missing:
+            return []
+        created = []
+        async with get_engine().begin() as conn:
+            # Serialize partition DDL across workers and replicas
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+                {"key": self.qualified_name},
+            )
+            existing = set(await self.list_partitions(conn))
+            for day in missing:
+                name = self.partition_name(day)
+                if name not in existing:
+                    start = datetime.combine(day, datetime.min.time(), timezone.utc)
+                    end = start + timedelta(days=1)
+                    await conn.execute(
+                        text(
+                            f'CREATE TABLE "{self.table.schema}"."{name}" '
+                            f"PARTITION OF {self.qualified_name} "
+                            f"FOR VALUES FROM ('{start.isoformat()}') "
+                            f"TO ('{end.isoformat()}')"
+                        )
+                    )
+                    created.append(name)
+        self._known.update(missing)
+        if created:
+            logger.info("Created log partitions", partitions=created)
+        return created
+
+    async def drop_expired(
+        self, retention_days: int, today: Optional[date] = None
+    ) -> List[str]:
+        """Detach and drop partitions entirely older than the retention window.
+
+        Args:
+            retention_days (int): Number of days of data to keep
+            today (Optional[date]): Reference day, defaults to the UTC date
+
+        Returns:
+            List[str]: Names of partitions that were dropped
+        """
+        cutoff = (today or utc_today()) - timedelta(days=retention_days)
+        dropped = []
+        async with get_engine().begin() as conn:
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+                {"key": self.qualified_name},
+            )
+            for name in await self.list_partitions(conn):
+                day = self.partition_day(name)
+                if day is None or day >= cutoff:
+                    continue
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {self.qualified_name} "
+                        f'DETACH PARTITION "{self.table.schema}"."{name}"'
+                    )
+                )
+                await conn.execute(text(f'DROP TABLE "{self.table.schema}"."{name}"'))
+                self._known.discard(day)
+                dropped.append(name)
+        if dropped:
+            logger.info("Dropped expired log partitions", partitions=dropped)
+        return dropped
+
+    async def run_maintenance(self) -> None:
+        """Pre-create upcoming partitions and enforce retention once."""
+        today = utc_today()
+        ahead = config.logging.LOG_PARTITION_PRECREATE_DAYS
+        await self.ensure_partitions(
+            today + timedelta(days=offset) for offset in range(-1, ahead + 1)
+        )
+        await self.drop_expired(config.logging.LOG_RETENTION_DAYS, today)
+
+    async def start(self) -> None:
+        """Start the periodic maintenance task on the running loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="log-partitions")
+
+    async def stop(self) -> None:
+        """Stop the periodic maintenance task."""
+        task, self._task = self._task, None
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _run(self) -> None:
+        """Run maintenance every LOG_PARTITION_CHECK_INTERVAL seconds."""
+        while True:
+            try:
+                await self.run_maintenance()
+            except Exception:
+                logger.exception("Log partition maintenance failed")
+                # Forget cached days so the next write re-checks the catalog
+                self.reset()
+            await asyncio.sleep(config.logging.LOG_PARTITION_CHECK_INTERVAL)
+
+
+# Partition manager for the log events table
+log_partitions = PartitionManager(LogEvent.__table__)
@@ -0,0 +1,295 @@
+"""
+Distributed rate limiting backed by Redis.
+
+Implements GCRA (generic cell rate algorithm) in a single Lua script so the
+limit is shared by every worker process and replica. Each worker reserves a
+small block of tokens per client at a time and serves later requests from
+that local reservation, so most requests never wait on Redis.
+"""
+import ipaddress
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from src.cache import get_redis
+from src.config import Config, api_key_digest, config
+from src.reload import config_reloader
+
+logger = structlog.get_logger(__name__)
+
+EXEMPT_PATHS = ("/health", "/metrics")
+MAX_LOCAL_KEYS = 10000
+
+# KEYS[1]: bucket key
+# ARGV[1]: emission interval in ms, ARGV[2]: burst tolerance in ms,
+# ARGV[3]: tokens requested
+# Returns {granted, retry_after_ms}; grants as many tokens as fit, up to ARGV[3]
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local granted = math.floor((now + tolerance - tat) / interval)
+if granted > requested then
+    granted = requested
+end
+if granted < 1 then
+    return {0, math.ceil(tat + interval - tolerance - now)}
+end
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil(tat - now))
+return {granted, 0}
+"""
+
+REQUESTS_LIMITED = Counter(
+    "rate_limit_rejected_total",
+    "Requests rejected by the rate limiter",
+)
+REDIS_ERRORS = Counter(
+    "rate_limit_redis_errors_total",
+    "Rate limiter Redis failures (requests were allowed)",
+)
+
+
+@dataclass
+class Reservation:
+    """Tokens reserved in Redis and not yet spent by this worker.
+
+    Attributes:
+        tokens (int): Remaining tokens
+        expires_at (float): Monotonic time after which the tokens are discarded
+    """
+
+    tokens: int
+    expires_at: float
+
+
+class RateLimiter:
+    """GCRA limiter with local token pre-fetch.
+
+    Reserved tokens expire locally after the time GCRA would have needed to
+    issue them, which bounds how far a worker can drift from the shared
+    schedule. Redis failures fail open.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any] = get_redis):
+        """Initialize the limiter.
+
+        Args:
+            client_factory (Callable[[], Any]): Returns the Redis client to
+                use; defaults to the shared application pool
+        """
+        self._client_factory = client_factory
+        self._client: Optional[Any] = None
+        self._script: Optional[Callable[..., Awaitable[Any]]] = None
+        self._reservations: "OrderedDict[str, Reservation]" = OrderedDict()
+
+    def _gcra(self) -> Callable[..., Awaitable[Any]]:
+        """Return the GCRA script registered on the current client."""
+        client = self._client_factory()
+        if client is not self._client or self._script is None:
+            script: Callable[..., Awaitable[Any]] = client.register_script(GCRA_SCRIPT)
+            self._client, self._script = client, script
+            return script
+        return self._script
+
+    def _prefetch(self, limit: int) -> int:
+        """Return how many tokens to reserve per Redis round trip.
+
+        Small limits are never pre-fetched so they stay exact.
+
+        Args:
+            limit (int): Requests allowed per period
+
+        Returns:
+            int: Tokens to reserve
+        """
+        return max(1, min(config.rate_limit.RATE_LIMIT_PREFETCH, limit // 10))
+
+    async def acquire(self, identity: str) -> Tuple[bool, float]:
+        """Take one token for a client.
+
+        Args:
+            identity (str): Client identity (API key digest or address)
+
+        Returns:
+            Tuple[bool, float]: Whether the request is allowed, and seconds to
+            wait before retrying when it is not
+        """
+        rate = config.rate_limit.RATE_LIMIT_DEFAULT
+        key = f"ratelimit:{rate}:{identity}"
+        now = time.monotonic()
+
+        reservation = self._reservations.get(key)
+        if (
+            reservation is not None
+            and reservation.tokens
+            and reservation.expires_at > now
+        ):
+            reservation.tokens -= 1
+            self._reservations.move_to_end(key)
+            return True, 0.0
+
+        window = config.rate_limit.RATE_LIMIT_WINDOW
+        if window is None:
+            # Only possible while rate limiting is disabled
+            return True, 0.0
+        limit, period = window
+        interval_ms = period * 1000 / limit
+        try:
+            granted, retry_after_ms = await self._gcra()(
+                keys=[key],
+                args=[interval_ms, period * 1000, self._prefetch(limit)],
+            )
+        except Exception:
+            # A limiter outage must never take the API down with it
+            REDIS_ERRORS.inc()
+            logger.warning("Rate limiter unavailable, allowing request", exc_info=True)
+            return True, 0.0
+
+        granted = int(granted)
+        if granted < 1:
+            return False, int(retry_after_ms) / 1000
+        if granted > 1:
+            # Spend the reservation no slower than GCRA would have issued it
+            self._remember(key, granted - 1, now + interval_ms * granted / 1000)
+        return True, 0.0
+
+    async def prime(self) -> None:
+        """Load the GCRA script so the first request skips the NOSCRIPT retry."""
+        self._gcra()
+        await self._client_factory().script_load(GCRA_SCRIPT)
+
+    def reset(self) -> None:
+        """Forget local reservations so a new rate applies immediately."""
+        self._reservations = OrderedDict()
+
+    def _remember(self, key: str, tokens: int, expires_at: float) -> None:
+        """Store a local reservation, evicting the least recently used one.
+
+        At most MAX_LOCAL_KEYS reservations are kept; an evicted client's
+        unspent tokens are simply forgotten.
+
+        Args:
+            key (str): Bucket key
+            tokens (int): Tokens left to spend locally
+            expires_at (float): Monotonic expiry time
+        """
+        self._reservations[key] = Reservation(tokens, expires_at)
+        self._reservations.move_to_end(key)
+        if len(self._reservations) > MAX_LOCAL_KEYS:
+            self._reservations.popitem(last=False)
+
+
+def is_trusted_proxy(address: str) -> bool:
+    """Tell whether a peer address belongs to TRUSTED_PROXIES.
+
+    Args:
+        address (str): Peer IP address
+
+    Returns:
+        bool: Whether the peer may set ``X-Real-IP``
+    """
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in config.security.TRUSTED_PROXY_NETWORKS)
+
+
+def client_identity(scope: Dict[str, Any]) -> str:
+    """Identify the caller of a request for rate limiting.
+
+    Requests carrying one of the API_KEYS are limited per key. Others are
+    limited per client address: ``X-Real-IP`` when the request came through
+    a trusted proxy such as nginx, otherwise the peer address. Unknown keys
+    and spoofed headers therefore cannot buy a fresh bucket.
+
+    Args:
+        scope (Dict[str, Any]): ASGI connection scope
+
+    Returns:
+        str: Identity string safe to embed in a Redis key
+    """
+    headers = dict(scope.get("headers") or ())
+    api_key = headers.get(b"x-api-key")
+    if api_key:
+        digest = api_key_digest(api_key)
+        if digest in config.security.API_KEY_DIGESTS:
+            return "key:" + digest
+    client = scope.get("client")
+    peer: str = client[0] if client else "unknown"
+    real_ip: Optional[bytes] = headers.get(b"x-real-ip")
+    if real_ip and is_trusted_proxy(peer):
+        return "ip:" + real_ip.decode("latin-1")
+    return "ip:" + peer
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing RATE_LIMIT_DEFAULT per client.
+
+    Attributes:
+        app (Any): Wrapped ASGI application
+        limiter (RateLimiter): Limiter deciding each request
+    """
+
+    def __init__(self, app: Any, limiter: Optional[RateLimiter] = None):
+        """Wrap an ASGI application.
+
+        Args:
+            app (Any): ASGI application
+            limiter (Optional[RateLimiter]): Limiter to use
+        """
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """Reject the request with 429 when the client is over its limit."""
+        if (
+            scope["type"] != "http"
+            or not config.rate_limit.RATE_LIMIT_ENABLED
+            or scope["path"].startswith(EXEMPT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await self.limiter.acquire(client_identity(scope))
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        REQUESTS_LIMITED.inc()
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+# Limiter shared by all requests in this worker
+rate_limiter = RateLimiter()
+
+
+@config_reloader.on_change("RATE_LIMIT_DEFAULT", "RATE_LIMIT_PREFETCH")
+def reset_rate_limiter(new: Config) -> None:
+    """Drop tokens reserved under the previous rate."""
+    rate_limiter.reset()
@@ -0,0 +1,395 @@
+"""
+Live configuration reload, triggered by SIGHUP or the admin API and
+propagated to every worker over Redis pub/sub.
+"""
+import asyncio
+import hashlib
+import hmac
+import inspect
+import logging
+import os
+import signal
+import socket
+import time
+from contextlib import suppress
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+import orjson
+import structlog
+from dotenv import dotenv_values
+from prometheus_client import Counter
+
+from src.cache import get_redis
+from src.config import ENV_FILE, PROCESS_ENV, Config, config
+from src.serialization import dumps
+
+logger = structlog.get_logger(__name__)
+
+# Redis pub/sub channel carrying reload requests between workers
+CHANNEL = "config:reload"
+
+# Seconds to wait before subscribing again after losing Redis
+RESUBSCRIBE_DELAY = 1.0
+
+# Signed reload messages older than this many seconds are ignored as replays
+MAX_MESSAGE_AGE = 60.0
+
+# Settings baked into objects built at startup (listening socket, engines,
+# connection pools, tracer); changing them needs a graceful worker restart
+STARTUP_ONLY = frozenset(
+    {
+        "HOST",
+        "PORT",
+        "WORKER_PROCESSES",
+        "THREAD_POOL_SIZE",
+        "DB_HOST",
+        "DB_PORT",
+        "DB_NAME",
+        "DB_USER",
+        "DB_PASSWORD",
+        "DB_POOL_SIZE",
+        "DB_MAX_OVERFLOW",
+        "DB_POOL_TIMEOUT",
+        "DB_POOL_RECYCLE",
+        "DB_POOL_PRE_PING",
+        "DB_MAX_CONNECTIONS",
+        "DB_PGBOUNCER",
+        "DB_REPLICA_HOSTS",
+        "REDIS_HOST",
+        "REDIS_PORT",
+        "REDIS_DB",
+        "REDIS_PASSWORD",
+        "REDIS_POOL_SIZE",
+        "REDIS_POOL_TIMEOUT",
+        "CORS_ORIGINS",
+        "ENABLE_METRICS",
+        "METRICS_PORT",
+        "ENABLE_TRACING",
+        "OTEL_EXPORTER_OTLP_ENDPOINT",
+        "TRACE_SAMPLE_RATIO",
+        "TRACE_TAIL_SAMPLING",
+        "TRACE_SLOW_THRESHOLD_MS",
+        "TRACE_QUEUE_SIZE",
+        "TRACE_EXPORT_BATCH_SIZE",
+        "ENABLE_WARMUP",
+        "WARMUP_TIMEOUT_MS",
+        "WARMUP_REDIS_CONNECTIONS",
+    }
+)
+
+CONFIG_RELOADS = Counter(
+    "config_reloads_total",
+    "Configuration reloads, by trigger and outcome",
+    ["source", "result"],
+)
+
+Subscriber = Callable[[Config], Any]
+
+
+def sign(payload: bytes) -> bytes:
+    """Sign a reload message with an HMAC keyed by SECRET_KEY.
+
+    Args:
+        payload (bytes): Serialized message
+
+    Returns:
+        bytes: Hex signature, a dot, then the payload
+    """
+    key = config.security.SECRET_KEY.encode()
+    signature = hmac.new(key, payload, hashlib.sha256).hexdigest().encode()
+    return signature + b"." + payload
+
+
+def verify(message: bytes) -> Optional[Dict[str, Any]]:
+    """Check a signed reload message and decode it.
+
+    Args:
+        message (bytes): Message as published by :func:`sign`
+
+    Returns:
+        Optional[Dict[str, Any]]: The payload, or None if the signature is
+        missing or wrong, SECRET_KEY is unset, or the message is too old
+    """
+    key = config.security.SECRET_KEY.encode()
+    signature, _, payload = message.partition(b".")
+    expected = hmac.new(key, payload, hashlib.sha256).hexdigest().encode()
+    if not key or not hmac.compare_digest(signature, expected):
+        return None
+    decoded: Dict[str, Any] = orjson.loads(payload)
+    if abs(time.time() - decoded.get("sent_at", 0)) > MAX_MESSAGE_AGE:
+        return None
+    return decoded
+
+
+def apply_log_levels(levels: Mapping[str, str]) -> None:
+    """Set logger levels received from another worker.
+
+    Args:
+        levels (Mapping[str, str]): Level names, by logger name
+    """
+    for name, level in levels.items():
+        try:
+            logging.getLogger(name).setLevel(level)
+        except (TypeError, ValueError):
+            logger.error("Ignoring unknown log level", logger_name=name, level=level)
+
+
+# Variables the last load took from the .env file, so a reload can unset
+# those that have since been removed from it
+_from_env_file: Set[str] = (
+    {name for name in dotenv_values(ENV_FILE) if name not in PROCESS_ENV}
+    if ENV_FILE
+    else set()
+)
+
+
+def load_config(overrides: Mapping[str, str]) -> Config:
+    """Build a configuration from the environment, .env file and overrides.
+
+    The .env file is read again, but variables from the real process
+    environment keep precedence over it, as at startup. Overrides win over
+    both. Variables a previous load took from the file that are no longer
+    in it are unset, so the result matches a fresh start.
+    ``os.environ`` is left untouched if the result is invalid.
+
+    Args:
+        overrides (Mapping[str, str]): Settings to force, as strings
+
+    Returns:
+        Config: Validated configuration
+
+    Raises:
+        AssertionError: If a setting fails validation
+        ValueError: If a setting cannot be parsed
+    """
+    from_file: Dict[str, str] = {}
+    if ENV_FILE:
+        for name, value in dotenv_values(ENV_FILE).items():
+            if name not in PROCESS_ENV and value is not None:
+                from_file[name] = value
+    values = {**from_file, **overrides}
+    removed = _from_env_file - values.keys()
+    previous = {name: os.environ.get(name) for name in values.keys() | removed}
+    os.environ.update(values)
+    for name in removed:
+        os.environ.pop(name, None)
+    try:
+        new = Config()
+    except Exception:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        raise
+    _from_env_file.clear()
+    _from_env_file.update(from_file)
+    return new
+
+
+class ConfigReloader:
+    """Swaps in a new configuration and tells interested components.
+
+    Components register with :meth:`on_change` for the settings they cache
+    or build objects from. A reload builds and validates a complete new
+    configuration before swapping it in, so a bad value never takes effect
+    partially, and reloads run one at a time. Each reload is published on
+    CHANNEL, signed with SECRET_KEY, and every other worker, on this host or
+    another, applies the same overrides. Logger levels changed through the
+    admin API travel the same way. Unsigned messages are ignored.
+
+    Attributes:
+        origin (str): Identifies this process in published messages
+        overrides (Dict[str, str]): Settings forced through the admin API,
+            kept across later reloads until the process restarts
+    """
+
+    def __init__(self) -> None:
+        """Initialize a reloader with no subscribers."""
+        self.origin = f"{socket.gethostname()}:{os.getpid()}"
+        self.overrides: Dict[str, str] = {}
+        self._subscribers: List[Tuple[FrozenSet[str], Subscriber]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._signal_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    def on_change(self, *settings: str) -> Callable[[Subscriber], Subscriber]:
+        """Register a function to call when any of the settings change.
+
+        The function receives the live configuration after the swap and may
+        be a coroutine function.
+
+        Args:
+            *settings (str): Setting names, e.g. ``MAX_QUEUE_SIZE``
+
+        Returns:
+            Callable[[Subscriber], Subscriber]: Decorator registering it
+        """
+
+        def register(subscriber: Subscriber) -> Subscriber:
+            self._subscribers.append((frozenset(settings), subscriber))
+            return subscriber
+
+        return register
+
+    async def reload(
+        self,
+        overrides: Optional[Mapping[str, str]] = None,
+        source: str = "admin",
+        publish: bool = True,
+    ) -> Dict[str, List[str]]:
+        """Reload the configuration in this worker and, optionally, the others.
+
+        Args:
+            overrides (Optional[Mapping[str, str]]): Settings to force
+            source (str): What triggered the reload, for metrics and logs
+            publish (bool): Whether to tell the other workers
+
+        Returns:
+            Dict[str, List[str]]: Names of the settings that changed, and of
+            those that only take effect after a worker restart
+
+        Raises:
+            AssertionError: If a setting fails validation
+            ValueError: If a setting cannot be parsed
+        """
+        async with self._lock:
+            overrides = {**self.overrides, **(overrides or {})}
+            before = config.as_dict()
+            try:
+                new = load_config(overrides)
+            except (AssertionError, ValueError):
+                CONFIG_RELOADS.labels(source=source, result="invalid").inc()
+                raise
+            self.overrides = overrides
+            after = new.as_dict()
+            changed = {name for name, value in after.items() if before[name] != value}
+            config.swap(new)
+            await self._notify(changed)
+        CONFIG_RELOADS.labels(source=source, result="applied").inc()
+
+        restart_required = sorted(changed & STARTUP_ONLY)
+        logger.warning(
+            "Configuration reloaded",
+            source=source,
+            changed=sorted(changed),
+            restart_required=restart_required,
+        )
+        if publish:
+            await self.publish(overrides)
+        return {"changed": sorted(changed), "restart_required": restart_required}
+
+    async def _notify(self, changed: Set[str]) -> None:
+        """Call the subscribers of any changed setting, in registration order."""
+        for settings, subscriber in self._subscribers:
+            if settings & changed:
+                try:
+                    result = subscriber(config)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception(
+                        "Config subscriber failed", subscriber=subscriber.__qualname__
+                    )
+
+    async def publish(
+        self,
+        overrides: Mapping[str, str],
+        log_levels: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Ask every other worker to reload with the same overrides.
+
+        Nothing is published while SECRET_KEY is unset, since the other
+        workers would reject the unsigned message.
+
+        Args:
+            overrides (Mapping[str, str]): Overrides the workers should apply
+            log_levels (Optional[Mapping[str, str]]): Logger levels to set
+                instead of reloading, by logger name
+        """
+        if not config.security.SECRET_KEY:
+            logger.warning("Config reload not published: SECRET_KEY is not set")
+            return
+        message = {
+            "origin": self.origin,
+            "overrides": overrides,
+            "log_levels": log_levels or {},
+            "sent_at": time.time(),
+        }
+        try:
+            await get_redis().publish(CHANNEL, sign(dumps(message)))
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not publish config reload", exc_info=True)
+
+    async def start(self) -> None:
+        """Reload on SIGHUP and listen for reloads from other workers."""
+        if self._task is not None and not self._task.done():
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, self._on_sighup)
+            self._signal_loop = loop
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Only the main thread of a POSIX process can handle signals
+            logger.debug("SIGHUP reload unavailable in this thread")
+        self._task = asyncio.create_task(self._listen(), name="config-reload")
+
+    async def stop(self) -> None:
+        """Stop listening for reloads."""
+        if self._signal_loop is not None:
+            with suppress(RuntimeError):
+                self._signal_loop.remove_signal_handler(signal.SIGHUP)
+            self._signal_loop = None
+        task, self._task = self._task, None
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def _on_sighup(self) -> None:
+        """Start a reload from the signal handler."""
+        task = asyncio.create_task(self._reload_quietly("signal", publish=True))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _reload_quietly(self, source: str, publish: bool, **kwargs: Any) -> None:
+        """Reload, logging instead of raising when the result is invalid."""
+        try:
+            await self.reload(source=source, publish=publish, **kwargs)
+        except (AssertionError, ValueError) as exc:
+            logger.error("Configuration reload rejected", source=source, error=str(exc))
+
+    async def _listen(self) -> None:
+        """Apply reloads published by other workers, resubscribing on errors."""
+        while True:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    payload = verify(message["data"])
+                    if payload is None:
+                        logger.warning("Ignoring unsigned or stale config reload")
+                        CONFIG_RELOADS.labels(source="remote", result="rejected").inc()
+                        continue
+                    if payload["origin"] == self.origin:
+                        continue
+                    if payload.get("log_levels"):
+                        apply_log_levels(payload["log_levels"])
+                    else:
+                        await self._reload_quietly(
+                            "remote", publish=False, overrides=payload["overrides"]
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Config reload channel lost", exc_info=True)
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+            finally:
+                with suppress(Exception):
+                    await pubsub.aclose()
+
+
+# Reloader shared by every component of this worker
+config_reloader = ConfigReloader()
@@ -0,0 +1,172 @@
+"""
+Request and response schemas for the logging service API.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal
+
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+from src.config import config
+
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+# Allowance for clients whose clocks run slightly ahead
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def latest_timestamp() -> datetime:
+    """Get the latest event time accepted for ingestion.
+
+    Events may be dated up to LOG_PARTITION_PRECREATE_DAYS ahead, the days
+    partition maintenance creates in advance, so a batch cannot make the
+    writer create partitions for arbitrary future days.
+
+    Returns:
+        datetime: Upper bound for record timestamps, in UTC
+    """
+    ahead = timedelta(days=config.logging.LOG_PARTITION_PRECREATE_DAYS)
+    return datetime.now(timezone.utc) + ahead + MAX_CLOCK_SKEW
+
+
+def contains_nul(value: Any) -> bool:
+    """Tell whether a string, or any key or string inside JSON, holds U+0000.
+
+    PostgreSQL text and jsonb cannot store NUL, so one such record would
+    fail the whole COPY it is written with.
+
+    Args:
+        value (Any): Parsed JSON value
+
+    Returns:
+        bool: Whether a NUL character was found
+    """
+    if isinstance(value, str):
+        return "\x00" in value
+    if isinstance(value, dict):
+        return any(
+            contains_nul(key) or contains_nul(item) for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return any(contains_nul(item) for item in value)
+    return False
+
+
+class LogRecord(BaseModel):
+    """A single log event submitted by a client.
+
+    Attributes:
+        timestamp (datetime): When the event happened (UTC if no offset given)
+        level (str): Severity level
+        service (str): Name of the emitting service
+        message (str): Log message
+        attributes (Dict[str, Any]): Arbitrary structured context
+    """
+
+    timestamp: datetime
+    level: LogLevel = "INFO"
+    service: str = Field(min_length=1, max_length=255)
+    message: str
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+    @field_validator("level", mode="before")
+    @classmethod
+    def normalize_level(cls, value: Any) -> Any:
+        """Accept level names in any case.
+
+        Args:
+            value (Any): Raw level value
+
+        Returns:
+            Any: Upper-cased level name
+        """
+        return value.upper() if isinstance(value, str) else value
+
+    @field_validator("service", "message", "attributes")
+    @classmethod
+    def reject_nul(cls, value: Any) -> Any:
+        """Reject NUL characters, which PostgreSQL cannot store.
+
+        Args:
+            value (Any): Parsed field value
+
+        Returns:
+            Any: The value, unchanged
+
+        Raises:
+            ValueError: If the value contains a NUL character
+        """
+        if contains_nul(value):
+            raise ValueError("must not contain NUL (U+0000) characters")
+        return value
+
+    @field_validator("timestamp")
+    @classmethod
+    def ensure_timezone(cls, value: datetime) -> datetime:
+        """Treat naive timestamps as UTC.
+
+        Args:
+            value (datetime): Parsed timestamp
+
+        Returns:
+            datetime: Timezone-aware timestamp
+        """
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @field_validator("timestamp")
+    @classmethod
+    def reject_far_future(cls, value: datetime) -> datetime:
+        """Reject timestamps beyond the pre-created partitions.
+
+        Args:
+            value (datetime): Timezone-aware timestamp
+
+        Returns:
+            datetime: The timestamp, unchanged
+
+        Raises:
+            ValueError: If the timestamp is later than ``latest_timestamp()``
+        """
+        ahead = config.logging.LOG_PARTITION_PRECREATE_DAYS
+        if value > latest_timestamp():
+            raise ValueError(f"must not be more than {ahead} days in the future")
+        return value
+
+
+class LoggerLevelUpdate(BaseModel):
+    """New level for a logger, set through the admin API.
+
+    Attributes:
+        level (str): Severity level
+    """
+
+    level: LogLevel
+
+    @field_validator("level", mode="before")
+    @classmethod
+    def normalize_level(cls, value: Any) -> Any:
+        """Accept level names in any case.
+
+        Args:
+            value (Any): Raw level value
+
+        Returns:
+            Any: Upper-cased level name
+        """
+        return value.upper() if isinstance(value, str) else value
+
+
+class ConfigReload(BaseModel):
+    """Settings to force when reloading configuration through the admin API.
+
+    Attributes:
+        overrides (Dict[str, str]): Values keyed by environment variable name,
+            written as they would be in the environment
+    """
+
+    overrides: Dict[str, str] = Field(default_factory=dict)
+
+
+# Validates a whole batch in a single call into pydantic-core
+LogRecordBatch = TypeAdapter(List[LogRecord])
@@ -0,0 +1,197 @@
+"""
+Log search with trigram message matching and keyset pagination.
+"""
+import base64
+import binascii
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import config
+from src.models import LogEvent
+from src.serialization import rows_to_dicts
+
+MAX_PAGE_SIZE = 1000
+
+SEARCH_COLUMNS = (
+    LogEvent.id,
+    LogEvent.timestamp,
+    LogEvent.level,
+    LogEvent.service,
+    LogEvent.message,
+    LogEvent.attributes,
+)
+
+Cursor = Tuple[datetime, uuid.UUID]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class SearchFilters:
+    """Criteria for a log search.
+
+    Attributes:
+        query (Optional[str]): Substring, or regular expression if ``regex``
+        regex (bool): Match ``query`` as a POSIX regular expression
+        levels (Sequence[str]): Accepted levels, any if empty
+        service (Optional[str]): Exact service name
+        start (Optional[datetime]): Inclusive lower timestamp bound
+        end (Optional[datetime]): Exclusive upper timestamp bound
+    """
+
+    query: Optional[str] = None
+    regex: bool = False
+    levels: Sequence[str] = ()
+    service: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+
+def encode_cursor(timestamp: datetime, event_id: uuid.UUID) -> str:
+    """Encode the position after a row as an opaque cursor.
+
+    Args:
+        timestamp (datetime): Timestamp of the last row returned
+        event_id (uuid.UUID): ID of the last row returned
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    raw = f"{timestamp.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        token (str): Cursor token
+
+    Returns:
+        Cursor: Timestamp and ID of the last row already returned
+
+    Raises:
+        InvalidCursorError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        timestamp, event_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), uuid.UUID(event_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so a term matches literally.
+
+    Args:
+        term (str): Search term
+
+    Returns:
+        str: Term with ``\\``, ``%`` and ``_`` escaped by backslash
+    """
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def apply_filters(stmt: Select, filters: SearchFilters) -> Select:
+    """Add the WHERE clauses for a set of search criteria.
+
+    Args:
+        stmt (Select): Statement selecting from ``LogEvent``
+        filters (SearchFilters): Search criteria
+
+    Returns:
+        Select: Filtered statement
+    """
+    if filters.query:
+        if filters.regex:
+            stmt = stmt.where(LogEvent.message.regexp_match(filters.query))
+        else:
+            pattern = f"%{escape_like(filters.query)}%"
+            stmt = stmt.where(LogEvent.message.ilike(pattern, escape="\\"))
+    if filters.levels:
+        levels = [level.upper() for level in filters.levels]
+        stmt = stmt.where(LogEvent.level.in_(levels))
+    if filters.service:
+        stmt = stmt.where(LogEvent.service == filters.service)
+    if filters.start is not None:
+        stmt = stmt.where(LogEvent.timestamp >= filters.start)
+    if filters.end is not None:
+        stmt = stmt.where(LogEvent.timestamp < filters.end)
+    return stmt
+
+
+def build_search_query(
+    filters: SearchFilters, limit: int, after: Optional[Cursor] = None
+) -> Select:
+    """Build the search statement, newest first.
+
+    Pages are selected by seeking past the last ``(timestamp, id)`` returned
+    rather than with OFFSET, so every page costs the same. The redundant
+    plain ``timestamp`` bound lets the planner prune older partitions.
+
+    Args:
+        filters (SearchFilters): Search criteria
+        limit (int): Rows to fetch
+        after (Optional[Cursor]): Position of the last row already returned
+
+    Returns:
+        Select: Statement returning ``SEARCH_COLUMNS``
+    """
+    stmt = apply_filters(select(*SEARCH_COLUMNS), filters)
+    if after is not None:
+        timestamp, event_id = after
+        stmt = stmt.where(
+            LogEvent.timestamp <= timestamp,
+            tuple_(LogEvent.timestamp, LogEvent.id)
+            < tuple_(
+                literal(timestamp, LogEvent.timestamp.type),
+                literal(event_id, LogEvent.id.type),
+            ),
+        )
+    return stmt.order_by(LogEvent.timestamp.desc(), LogEvent.id.desc()).limit(limit)
+
+
+async def search_logs(
+    session: AsyncSession,
+    filters: SearchFilters,
+    limit: int = 100,
+    after: Optional[Cursor] = None,
+) -> Dict[str, Any]:
+    """Run a search and return one page of results.
+
+    The query runs under a transaction-local ``statement_timeout`` of
+    SEARCH_TIMEOUT_MS, so a pathological client regex cannot hold a pooled
+    connection indefinitely.
+
+    Args:
+        session (AsyncSession): Database session
+        filters (SearchFilters): Search criteria
+        limit (int): Page size
+        after (Optional[Cursor]): Position of the last row already returned
+
+    Returns:
+        Dict[str, Any]: ``items`` on this page and ``next_cursor``, which is
+        None on the last page
+    """
+    timeout = config.performance.SEARCH_TIMEOUT_MS
+    if timeout:
+        # SET cannot take bind parameters; set_config is the same as SET LOCAL
+        await session.execute(
+            select(func.set_config("statement_timeout", str(timeout), True))
+        )
+    # Fetch one extra row to learn whether another page exists
+    result = await session.execute(build_search_query(filters, limit + 1, after))
+    rows = result.all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return {"items": rows_to_dicts(result.keys(), rows), "next_cursor": next_cursor}
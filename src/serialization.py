@@ -0,0 +1,102 @@
+"""
+Fast serialization of ORM instances and Core rows for bulk responses.
+
+Column accessors are computed once per mapped class instead of walking
+``__table__.columns`` for every row, and ``ORJSONResponse`` encodes UUID and
+datetime values natively, so rows never pass through ``jsonable_encoder``.
+"""
+import uuid
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+import orjson
+from sqlalchemy.orm import class_mapper
+from starlette.responses import JSONResponse
+
+Serializer = Callable[[Any], Dict[str, Any]]
+
+
+@lru_cache(maxsize=None)
+def model_serializer(model: type) -> Serializer:
+    """Build the serializer for a mapped class, once.
+
+    Output keys are column names, as in ``Base.to_dict()``.
+
+    Args:
+        model (type): Mapped class
+
+    Returns:
+        Serializer: Function converting an instance to a dictionary
+    """
+    attrs = class_mapper(model).column_attrs
+    names = tuple(attr.columns[0].name for attr in attrs)
+    keys = [attr.key for attr in attrs]
+    getter = attrgetter(*keys)
+    if len(keys) == 1:
+        return lambda obj: {names[0]: getter(obj)}
+    return lambda obj: dict(zip(names, getter(obj)))
+
+
+def serialize_models(objects: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Convert ORM instances of one class to dictionaries.
+
+    Args:
+        objects (Iterable[Any]): Instances of the same mapped class
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per instance
+    """
+    objects = list(objects)
+    if not objects:
+        return []
+    model: type = type(objects[0])
+    serializer = model_serializer(model)
+    return [serializer(obj) for obj in objects]
+
+
+def rows_to_dicts(
+    keys: Iterable[str], rows: Iterable[Sequence[Any]]
+) -> List[Dict[str, Any]]:
+    """Convert Core result rows to dictionaries without ORM hydration.
+
+    Args:
+        keys (Iterable[str]): Column names, e.g. ``result.keys()``
+        rows (Iterable[Sequence[Any]]): Row tuples
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per row
+    """
+    keys = tuple(keys)
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def _default(value: Any) -> Any:
+    """Encode values orjson does not handle natively.
+
+    orjson only accepts exact ``uuid.UUID`` instances, while asyncpg returns
+    its own UUID subclass.
+    """
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as JSON bytes with orjson.
+
+    Args:
+        content (Any): JSON-compatible data; UUID and datetime are allowed
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        """Encode the response body."""
+        return dumps(content)
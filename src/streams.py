@@ -0,0 +1,414 @@
+"""
+Crash-safe ingestion buffer on a Redis Stream.
+
+Accepted batches are appended to a stream and drained into PostgreSQL by a
+consumer group. Entries are acknowledged only after they are written, so a
+batch held by a worker that dies stays pending and is reclaimed by another
+consumer once it has been idle for STREAM_CLAIM_IDLE_MS. An entry delivered
+more than STREAM_MAX_DELIVERIES times is moved to a dead-letter stream.
+
+Delivery is at least once. Row IDs are generated when an entry is written,
+not derived from the entry, so an entry written but not acknowledged (the
+worker died or lost Redis in between, or a write failed ambiguously) is
+inserted again on redelivery, leaving duplicate rows with different IDs.
+"""
+import asyncio
+import os
+import socket
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from prometheus_client import Counter
+from pydantic import ValidationError
+from redis.exceptions import RedisError, ResponseError
+
+from src.cache import get_redis
+from src.config import config
+from src.schemas import LogRecord, LogRecordBatch
+from src.writer import Sink, write_log_records
+
+logger = structlog.get_logger(__name__)
+
+STREAM_KEY = "logs:ingest"
+GROUP_NAME = "log-writers"
+READ_COUNT = 10
+READ_BLOCK_MS = 1000
+
+# Suffix of the stream holding entries that kept failing
+DEAD_LETTER_SUFFIX = ":dead"
+
+# KEYS[1]: stream key; ARGV[1]: max length; ARGV[2]: payload
+# Appends only while the stream is below its cap, returning the entry ID or nil
+APPEND_SCRIPT = """
+if redis.call('XLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return false
+end
+return redis.call('XADD', KEYS[1], '*', 'records', ARGV[2])
+"""
+
+ENTRIES_WRITTEN = Counter(
+    "log_stream_entries_written_total",
+    "Stream entries written to PostgreSQL and acknowledged",
+)
+ENTRIES_RECLAIMED = Counter(
+    "log_stream_entries_reclaimed_total",
+    "Pending stream entries reclaimed from idle consumers",
+)
+ENTRIES_DISCARDED = Counter(
+    "log_stream_entries_discarded_total",
+    "Undecodable stream entries acknowledged without writing",
+)
+ENTRIES_DEAD_LETTERED = Counter(
+    "log_stream_entries_dead_lettered_total",
+    "Stream entries moved to the dead-letter stream after repeated failures",
+)
+
+Entry = Tuple[bytes, dict]
+
+
+class StreamFullError(Exception):
+    """Raised when the ingestion stream is at its maximum length."""
+
+
+class StreamIngestor:
+    """Appends batches to the ingestion stream and drains it with consumers.
+
+    Attributes:
+        stream (str): Stream key
+        group (str): Consumer group name
+        sink (Sink): Coroutine persisting a list of records
+        dead_letter_stream (str): Stream receiving entries that kept failing
+    """
+
+    def __init__(
+        self,
+        stream: str = STREAM_KEY,
+        group: str = GROUP_NAME,
+        sink: Sink = write_log_records,
+    ):
+        """Initialize the ingestor without starting consumers.
+
+        Args:
+            stream (str): Stream key
+            group (str): Consumer group name
+            sink (Sink): Coroutine persisting a list of records
+        """
+        self.stream = stream
+        self.group = group
+        self.sink = sink
+        self.dead_letter_stream = stream + DEAD_LETTER_SUFFIX
+        self._tasks: List[asyncio.Task] = []
+        self._group_ready = False
+        self._client: Optional[Any] = None
+        self._script: Optional[Any] = None
+
+    def _append_script(self) -> Any:
+        """Return the append script registered on the current client."""
+        client = get_redis()
+        if client is not self._client:
+            self._client = client
+            self._script = client.register_script(APPEND_SCRIPT)
+        return self._script
+
+    async def append(self, records: Sequence[LogRecord]) -> bytes:
+        """Append a validated batch as one stream entry.
+
+        Args:
+            records (Sequence[LogRecord]): Validated records
+
+        Returns:
+            bytes: ID of the new entry
+
+        Raises:
+            StreamFullError: If the stream is at STREAM_MAX_LENGTH entries
+        """
+        entry_id: Optional[bytes] = await self._append_script()(
+            keys=[self.stream],
+            args=[
+                config.performance.STREAM_MAX_LENGTH,
+                LogRecordBatch.dump_json(list(records)),
+            ],
+        )
+        if entry_id is None:
+            raise StreamFullError("Ingestion stream is full")
+        return entry_id
+
+    async def ensure_group(self) -> None:
+        """Create the consumer group (and stream) if it does not exist."""
+        try:
+            await get_redis().xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    async def start(self, consumers: Optional[int] = None) -> None:
+        """Start consumer tasks and the reclaimer on the running loop.
+
+        Redis being down does not fail startup: the consumers create the
+        group once it can be reached, and readiness reports it meanwhile.
+
+        Args:
+            consumers (Optional[int]): Consumers in this process; defaults to
+                THREAD_POOL_SIZE spread across WORKER_PROCESSES
+        """
+        if self._tasks:
+            return
+        if consumers is None:
+            consumers = max(
+                1,
+                config.performance.THREAD_POOL_SIZE
+                // config.performance.WORKER_PROCESSES,
+            )
+        try:
+            await self.ensure_group()
+        except RedisError:
+            logger.warning(
+                "Stream group not created, Redis is unavailable",
+                stream=self.stream,
+                exc_info=True,
+            )
+        prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self._tasks = [
+            asyncio.create_task(self._consume(f"{prefix}-{n}"), name=f"stream-{n}")
+            for n in range(consumers)
+        ]
+        self._tasks.append(
+            asyncio.create_task(
+                self._reclaim(f"{prefix}-reclaimer"), name="stream-reclaim"
+            )
+        )
+        logger.info("Stream consumers started", stream=self.stream, consumers=consumers)
+
+    async def stop(self) -> None:
+        """Stop all consumer tasks.
+
+        Entries being written when a consumer is cancelled are left pending
+        and will be reclaimed, so nothing is lost.
+        """
+        tasks, self._tasks = self._tasks, []
+        running = asyncio.get_running_loop()
+        tasks = [task for task in tasks if task.get_loop() is running]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def process(self, consumer: str, entries: Sequence[Entry]) -> int:
+        """Write entries to PostgreSQL, then acknowledge and delete them.
+
+        Entries are written with one COPY. If it fails, each entry is written
+        on its own, so one entry the database rejects does not hold back the
+        others it was read with; it alone stays pending.
+
+        Args:
+            consumer (str): Consumer name, for logging
+            entries (Sequence[Entry]): Stream entries owned by this consumer
+
+        Returns:
+            int: Number of records written
+
+        Raises:
+            Exception: The sink error, once the other entries are acknowledged
+        """
+        if not entries:
+            return 0
+        batches: List[Tuple[bytes, List[LogRecord]]] = []
+        for entry_id, fields in entries:
+            try:
+                batch = LogRecordBatch.validate_json(fields[b"records"])
+            except (KeyError, ValidationError):
+                ENTRIES_DISCARDED.inc()
+                logger.error(
+                    "Discarding undecodable stream entry",
+                    consumer=consumer,
+                    entry_id=entry_id,
+                )
+                batch = []
+            batches.append((entry_id, batch))
+
+        records = [record for _, batch in batches for record in batch]
+        if not records or len(batches) == 1:
+            if records:
+                await self.sink(records)
+            await self._acknowledge([entry_id for entry_id, _ in batches])
+            return len(records)
+        try:
+            await self.sink(records)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning(
+                "Stream batch write failed, retrying entries one by one",
+                consumer=consumer,
+                entries=len(batches),
+                exc_info=True,
+            )
+        else:
+            await self._acknowledge([entry_id for entry_id, _ in batches])
+            return len(records)
+
+        written, written_ids, error = 0, [], None
+        for entry_id, batch in batches:
+            try:
+                if batch:
+                    await self.sink(batch)
+            except Exception as exc:  # pylint: disable=broad-except
+                error = exc
+                continue
+            written += len(batch)
+            written_ids.append(entry_id)
+        await self._acknowledge(written_ids)
+        if error is not None:
+            raise error
+        return written
+
+    async def _acknowledge(self, ids: Sequence[bytes]) -> None:
+        """Acknowledge and delete written entries."""
+        if not ids:
+            return
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.xack(self.stream, self.group, *ids)
+            pipe.xdel(self.stream, *ids)
+            await pipe.execute()
+        ENTRIES_WRITTEN.inc(len(ids))
+
+    async def delivery_counts(self, ids: Sequence[bytes]) -> Dict[bytes, int]:
+        """Look up how many times pending entries have been delivered.
+
+        Args:
+            ids (Sequence[bytes]): Pending entry IDs
+
+        Returns:
+            Dict[bytes, int]: Delivery count by entry ID
+        """
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for entry_id in ids:
+                pipe.xpending_range(
+                    self.stream, self.group, min=entry_id, max=entry_id, count=1
+                )
+            results = await pipe.execute()
+        return {
+            entry_id: rows[0]["times_delivered"]
+            for entry_id, rows in zip(ids, results)
+            if rows
+        }
+
+    async def dead_letter(
+        self, entries: Sequence[Entry], counts: Dict[bytes, int]
+    ) -> None:
+        """Move entries to the dead-letter stream and acknowledge them.
+
+        Args:
+            entries (Sequence[Entry]): Entries that kept failing
+            counts (Dict[bytes, int]): Delivery count by entry ID
+        """
+        async with get_redis().pipeline(transaction=True) as pipe:
+            for entry_id, fields in entries:
+                pipe.xadd(
+                    self.dead_letter_stream,
+                    {
+                        "records": fields.get(b"records", b""),
+                        "entry_id": entry_id,
+                        "deliveries": counts[entry_id],
+                    },
+                    maxlen=config.performance.STREAM_MAX_LENGTH,
+                    approximate=True,
+                )
+            ids = [entry_id for entry_id, _ in entries]
+            pipe.xack(self.stream, self.group, *ids)
+            pipe.xdel(self.stream, *ids)
+            await pipe.execute()
+        ENTRIES_DEAD_LETTERED.inc(len(entries))
+        logger.error(
+            "Moved failing stream entries to the dead-letter stream",
+            stream=self.dead_letter_stream,
+            entry_ids=ids,
+        )
+
+    async def claim_idle(self, consumer: str, min_idle_ms: int) -> int:
+        """Take over and process entries left pending by idle consumers.
+
+        Entries already delivered more than STREAM_MAX_DELIVERIES times are
+        moved to the dead-letter stream instead of being written again.
+
+        Args:
+            consumer (str): Consumer name claiming the entries
+            min_idle_ms (int): Minimum idle time before an entry is claimed
+
+        Returns:
+            int: Number of entries reclaimed
+        """
+        start, claimed = "0-0", 0
+        while True:
+            response = await get_redis().xautoclaim(
+                self.stream,
+                self.group,
+                consumer,
+                min_idle_time=min_idle_ms,
+                start_id=start,
+                count=READ_COUNT,
+            )
+            start, entries = response[0], response[1]
+            # Entries deleted while pending come back without fields
+            entries = [entry for entry in entries if entry[1] is not None]
+            if entries:
+                claimed += len(entries)
+                ENTRIES_RECLAIMED.inc(len(entries))
+                counts = await self.delivery_counts([entry[0] for entry in entries])
+                limit = config.performance.STREAM_MAX_DELIVERIES
+                poison = [entry for entry in entries if counts.get(entry[0], 0) > limit]
+                if poison:
+                    await self.dead_letter(poison, counts)
+                retry = [entry for entry in entries if counts.get(entry[0], 0) <= limit]
+                try:
+                    await self.process(consumer, retry)
+                except Exception:  # pylint: disable=broad-except
+                    # Failed entries stay pending for the next reclaim
+                    logger.exception("Reclaimed entries failed", consumer=consumer)
+            if start in (b"0-0", "0-0"):
+                return claimed
+
+    async def _consume(self, consumer: str) -> None:
+        """Read new entries for one consumer until cancelled."""
+        while True:
+            try:
+                if not self._group_ready:
+                    await self.ensure_group()
+                response = await get_redis().xreadgroup(
+                    self.group,
+                    consumer,
+                    {self.stream: ">"},
+                    count=READ_COUNT,
+                    block=READ_BLOCK_MS,
+                )
+                for _, entries in response or ():
+                    await self.process(consumer, entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if isinstance(exc, ResponseError) and "NOGROUP" in str(exc):
+                    # The stream is gone, e.g. after a Redis restart
+                    self._group_ready = False
+                logger.exception("Stream consumer failed", consumer=consumer)
+                await asyncio.sleep(1)
+
+    async def _reclaim(self, consumer: str) -> None:
+        """Periodically reclaim entries abandoned by dead consumers."""
+        idle_ms = config.performance.STREAM_CLAIM_IDLE_MS
+        while True:
+            await asyncio.sleep(idle_ms / 1000)
+            try:
+                claimed = await self.claim_idle(consumer, idle_ms)
+                if claimed:
+                    logger.warning("Reclaimed pending stream entries", entries=claimed)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Stream reclaim failed", consumer=consumer)
+
+
+# Ingestor for the shared log ingestion stream
+stream_ingestor = StreamIngestor()
@@ -0,0 +1,225 @@
+"""
+OpenTelemetry tracing with head or tail sampling and batched OTLP export.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import structlog
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased, TraceIdRatioBased
+from opentelemetry.trace import StatusCode
+from prometheus_client import Counter
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+# Traces buffered while waiting for their local root span to end
+MAX_PENDING_TRACES = 10000
+
+# Decisions remembered for spans that end after their local root
+MAX_DECIDED_TRACES = 10000
+
+# Paths never traced: probes and scrapes would dominate the trace volume
+EXCLUDED_URLS = "health,metrics"
+
+TRACES_SAMPLED = Counter(
+    "trace_tail_sampling_decisions_total",
+    "Traces kept or dropped by tail sampling",
+    ["decision"],
+)
+
+_provider: Optional[TracerProvider] = None
+
+
+class TailSamplingProcessor(SpanProcessor):
+    """Span processor that decides per trace, after the trace has finished.
+
+    Spans are held in memory until the local root span ends. The whole
+    trace is then forwarded if any span failed or the root took at least
+    ``slow_threshold_ms``; other traces are kept at ``ratio``, chosen by
+    trace id so every service makes the same choice. Memory is bounded by
+    MAX_PENDING_TRACES: when full, the oldest pending trace is dropped.
+    """
+
+    def __init__(self, downstream: SpanProcessor, ratio: float, slow_threshold_ms: int):
+        """Initialize the processor.
+
+        Args:
+            downstream (SpanProcessor): Processor receiving kept spans
+            ratio (float): Share of ordinary traces to keep
+            slow_threshold_ms (int): Root duration at which a trace is kept
+        """
+        self.downstream = downstream
+        self.slow_threshold_ns = slow_threshold_ms * 1_000_000
+        self._baseline = TraceIdRatioBased(ratio)
+        self._pending: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._decided: "OrderedDict[int, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        """Pass span starts through to the downstream processor."""
+        self.downstream.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        """Buffer a finished span, deciding the trace when its root ends."""
+        trace_id = span.context.trace_id
+        is_local_root = span.parent is None or span.parent.is_remote
+        with self._lock:
+            decision = self._decided.get(trace_id)
+            if decision is None:
+                spans = self._pending.setdefault(trace_id, [])
+                spans.append(span)
+                if not is_local_root:
+                    if len(self._pending) > MAX_PENDING_TRACES:
+                        self._pending.popitem(last=False)
+                        TRACES_SAMPLED.labels(decision="evicted").inc()
+                    return
+                del self._pending[trace_id]
+                decision = self._keep(trace_id, span, spans)
+                self._decided[trace_id] = decision
+                if len(self._decided) > MAX_DECIDED_TRACES:
+                    self._decided.popitem(last=False)
+                TRACES_SAMPLED.labels(decision="kept" if decision else "dropped").inc()
+            else:
+                spans = [span]
+        if decision:
+            for finished in spans:
+                self.downstream.on_end(finished)
+
+    def _keep(
+        self, trace_id: int, root: ReadableSpan, spans: List[ReadableSpan]
+    ) -> bool:
+        """Decide whether a finished trace is exported."""
+        duration = (root.end_time or 0) - (root.start_time or 0)
+        if duration >= self.slow_threshold_ns:
+            return True
+        if any(span.status.status_code is StatusCode.ERROR for span in spans):
+            return True
+        return trace_id & self._baseline.TRACE_ID_LIMIT < self._baseline.bound
+
+    def shutdown(self) -> None:
+        """Drop undecided traces and shut the downstream processor down."""
+        with self._lock:
+            self._pending.clear()
+        self.downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Flush spans already handed downstream."""
+        return self.downstream.force_flush(timeout_millis)
+
+
+def build_tracer_provider(exporter: SpanExporter) -> TracerProvider:
+    """Create a tracer provider exporting through a bounded batch processor.
+
+    With TRACE_TAIL_SAMPLING every trace is recorded and
+    TailSamplingProcessor picks what to export; otherwise traces are
+    head-sampled at TRACE_SAMPLE_RATIO and unsampled spans are never
+    recorded at all.
+
+    Args:
+        exporter (SpanExporter): Destination for finished spans
+
+    Returns:
+        TracerProvider: Configured provider
+    """
+    monitoring = config.monitoring
+    processor: SpanProcessor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=monitoring.TRACE_QUEUE_SIZE,
+        max_export_batch_size=monitoring.TRACE_EXPORT_BATCH_SIZE,
+    )
+    if monitoring.TRACE_TAIL_SAMPLING:
+        sampler = ParentBased(ALWAYS_ON)
+        processor = TailSamplingProcessor(
+            processor, monitoring.TRACE_SAMPLE_RATIO, monitoring.TRACE_SLOW_THRESHOLD_MS
+        )
+    else:
+        sampler = ParentBased(TraceIdRatioBased(monitoring.TRACE_SAMPLE_RATIO))
+    provider = TracerProvider(
+        sampler=sampler,
+        resource=Resource.create(
+            {
+                "service.name": config.app.APP_NAME,
+                "deployment.environment": config.app.ENVIRONMENT,
+            }
+        ),
+    )
+    provider.add_span_processor(processor)
+    return provider
+
+
+def instrument(app: Any, provider: TracerProvider) -> None:
+    """Trace FastAPI requests, SQLAlchemy queries and Redis commands.
+
+    The application is instrumented on every call. SQLAlchemy and Redis are
+    instrumented once per process: engines that already exist are traced
+    directly and engine creation is wrapped for the rest, so no engine is
+    built here.
+
+    Args:
+        app (Any): FastAPI application
+        provider (TracerProvider): Provider receiving the spans
+    """
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.redis import RedisInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+    from src.database import built_engines
+
+    FastAPIInstrumentor.instrument_app(
+        app, tracer_provider=provider, excluded_urls=EXCLUDED_URLS
+    )
+    if not SQLAlchemyInstrumentor().is_instrumented_by_opentelemetry:
+        SQLAlchemyInstrumentor().instrument(
+            engines=[engine.sync_engine for engine in built_engines()],
+            tracer_provider=provider,
+        )
+    if not RedisInstrumentor().is_instrumented_by_opentelemetry:
+        RedisInstrumentor().instrument(tracer_provider=provider)
+
+
+def init_tracing(app: Any) -> Optional[TracerProvider]:
+    """Set up tracing for the application if ENABLE_TRACING is on.
+
+    Spans are exported over OTLP/gRPC to OTEL_EXPORTER_OTLP_ENDPOINT,
+    normally a collector on the same host. The provider is created once
+    per process; every application passed in is instrumented.
+
+    Args:
+        app (Any): FastAPI application
+
+    Returns:
+        Optional[TracerProvider]: Installed provider, None if disabled
+    """
+    global _provider
+    if not config.monitoring.ENABLE_TRACING:
+        return _provider
+    if _provider is None:
+        # gRPC is heavy to import; only pay for it when tracing is on
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        _provider = build_tracer_provider(
+            OTLPSpanExporter(endpoint=config.monitoring.OTEL_EXPORTER_OTLP_ENDPOINT)
+        )
+        trace.set_tracer_provider(_provider)
+        logger.info(
+            "Tracing enabled",
+            endpoint=config.monitoring.OTEL_EXPORTER_OTLP_ENDPOINT,
+            tail_sampling=config.monitoring.TRACE_TAIL_SAMPLING,
+        )
+    instrument(app, _provider)
+    return _provider
+
+
+def shutdown_tracing() -> None:
+    """Export buffered spans and stop the exporter."""
+    if _provider is not None:
+        _provider.shutdown()
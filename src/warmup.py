@@ -0,0 +1,154 @@
+"""
+Warm-up run at startup so the first requests after a deploy do not pay for
+connecting, asyncpg statement preparation or SQLAlchemy compilation.
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import structlog
+from prometheus_client import Histogram
+from sqlalchemy import Executable, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.cache import prime_redis
+from src.config import config
+from src.database import driver_connection, get_engine, get_read_replicas, warm_pool
+from src.models import LogEvent
+from src.partitions import log_partitions, utc_today
+from src.rate_limit import rate_limiter
+from src.search import SearchFilters, build_search_query
+from src.writer import COPY_COLUMNS
+
+logger = structlog.get_logger(__name__)
+
+WARMUP_SECONDS = Histogram(
+    "startup_warmup_seconds",
+    "Time spent warming pools and caches before serving",
+)
+
+
+def read_statements() -> List[Executable]:
+    """Build the statements every search and probe starts with.
+
+    Each is run with ``LIMIT 0``: PostgreSQL prepares and plans it but reads
+    no rows. The limit is a bound parameter, so the SQL is the same as for
+    real pages and the prepared statement is reused.
+
+    Returns:
+        List[Executable]: Readiness probe and common search shapes
+    """
+    cursor = (datetime.now(timezone.utc), uuid.UUID(int=0))
+    return [
+        text("SELECT 1"),
+        build_search_query(SearchFilters(), 0),
+        build_search_query(SearchFilters(), 0, cursor),
+        build_search_query(SearchFilters(service="warmup"), 0),
+        build_search_query(SearchFilters(query="warmup"), 0),
+    ]
+
+
+async def prepare_reads(conn: AsyncConnection) -> None:
+    """Prepare the read statements on one connection.
+
+    Args:
+        conn (AsyncConnection): Pooled connection
+    """
+    for statement in read_statements():
+        await conn.execute(statement)
+
+
+async def prepare_writes(conn: AsyncConnection) -> None:
+    """Prepare the read statements and the log COPY on one connection.
+
+    An empty COPY runs the column introspection query asyncpg caches per
+    connection and writes nothing.
+
+    Args:
+        conn (AsyncConnection): Pooled connection to the primary
+    """
+    await prepare_reads(conn)
+    table = LogEvent.__table__
+    driver = await driver_connection(conn)
+    await driver.copy_records_to_table(
+        table.name, schema_name=table.schema, columns=list(COPY_COLUMNS), records=[]
+    )
+
+
+async def connect_only(conn: AsyncConnection) -> None:
+    """Open the connection without preparing anything.
+
+    Behind PgBouncer in transaction mode prepared statements are not reused,
+    so preparing them would only cost round trips.
+    """
+
+
+async def warm_postgres() -> Dict[str, int]:
+    """Fill the primary and replica pools and prepare hot statements.
+
+    Returns:
+        Dict[str, int]: Connections opened, by pool
+    """
+    pgbouncer = config.database.DB_PGBOUNCER
+    opened = {
+        "primary": await warm_pool(
+            get_engine(), connect_only if pgbouncer else prepare_writes
+        )
+    }
+    # Today's partition is checked once here instead of by the first write
+    await log_partitions.ensure_partitions({utc_today()})
+    for replica in get_read_replicas().replicas:
+        opened[replica.name] = await warm_pool(
+            replica.engine, connect_only if pgbouncer else prepare_reads
+        )
+    return opened
+
+
+async def warm_redis() -> Dict[str, int]:
+    """Open Redis connections and load the rate limiter script.
+
+    Returns:
+        Dict[str, int]: Connections opened
+    """
+    opened = await prime_redis(config.performance.WARMUP_REDIS_CONNECTIONS)
+    if config.rate_limit.RATE_LIMIT_ENABLED:
+        await rate_limiter.prime()
+    return {"redis": opened}
+
+
+async def warm_up() -> Dict[str, Any]:
+    """Warm PostgreSQL and Redis before the worker accepts traffic.
+
+    Failures and timeouts are logged, not raised: a worker that could not
+    warm up still serves, and readiness reports dependencies that are down.
+
+    Returns:
+        Dict[str, Any]: Connections opened by pool, empty if disabled
+    """
+    if not config.features.ENABLE_WARMUP:
+        return {}
+    started = time.perf_counter()
+    timeout = config.performance.WARMUP_TIMEOUT_MS / 1000
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(warm_postgres(), warm_redis(), return_exceptions=True),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Warm-up timed out", timeout_ms=config.performance.WARMUP_TIMEOUT_MS
+        )
+        return {}
+
+    opened: Dict[str, Any] = {}
+    for step, result in zip(("postgres", "redis"), results):
+        if isinstance(result, BaseException):
+            logger.warning("Warm-up step failed", step=step, error=repr(result))
+        else:
+            opened.update(result)
+    elapsed = time.perf_counter() - started
+    WARMUP_SECONDS.observe(elapsed)
+    logger.info("Warm-up finished", duration_ms=round(elapsed * 1000, 1), opened=opened)
+    return opened
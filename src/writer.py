@@ -0,0 +1,275 @@
+"""
+Write-behind pipeline that flushes queued log batches to PostgreSQL.
+"""
+import asyncio
+import json
+from contextlib import suppress
+from datetime import datetime, time, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+from src.config import Config, config
+from src.database import copy_records
+from src.ingestion import BatchQueue, batch_queue
+from src.models import LogEvent
+from src.partitions import log_partitions, utc_today
+from src.reload import config_reloader
+from src.schemas import LogRecord, latest_timestamp
+
+logger = structlog.get_logger(__name__)
+
+# ``id`` comes from the model's generator: the server default is always UUIDv4
+COPY_COLUMNS = ("id", "timestamp", "level", "service", "message", "attributes")
+MAX_FLUSH_ATTEMPTS = 3
+
+ROWS_WRITTEN = Counter(
+    "log_writer_rows_total",
+    "Log rows flushed to PostgreSQL by the background writer",
+)
+ROWS_EXPIRED = Counter(
+    "log_writer_expired_rows_total",
+    "Log rows discarded for being older than the retention window",
+)
+ROWS_FUTURE = Counter(
+    "log_writer_future_rows_total",
+    "Log rows discarded for being dated beyond the pre-created partitions",
+)
+ROWS_FAILED = Counter(
+    "log_writer_failed_rows_total",
+    "Log rows dropped after exhausting flush retries",
+)
+FLUSH_SECONDS = Histogram(
+    "log_writer_flush_seconds",
+    "Time spent flushing one batch to PostgreSQL",
+)
+
+Sink = Callable[[Sequence[LogRecord]], Awaitable[int]]
+
+
+async def write_log_records(records: Sequence[LogRecord]) -> int:
+    """Persist log records with a single binary COPY.
+
+    Records older than LOG_RETENTION_DAYS are discarded rather than written
+    into a partition that retention would drop anyway. Records dated later
+    than ``latest_timestamp()``, which ingestion rejects but a queued batch
+    may still hold after a configuration change, are discarded as well.
+    Partitions for the remaining days are created on demand before copying.
+
+    Args:
+        records (Sequence[LogRecord]): Validated records
+
+    Returns:
+        int: Number of rows written
+    """
+    cutoff = datetime.combine(
+        utc_today() - timedelta(days=config.logging.LOG_RETENTION_DAYS),
+        time.min,
+        timezone.utc,
+    )
+    latest = latest_timestamp()
+    fresh = [record for record in records if record.timestamp >= cutoff]
+    if len(fresh) < len(records):
+        ROWS_EXPIRED.inc(len(records) - len(fresh))
+    current = [record for record in fresh if record.timestamp <= latest]
+    if len(current) < len(fresh):
+        ROWS_FUTURE.inc(len(fresh) - len(current))
+        fresh = current
+    if not fresh:
+        return 0
+    await log_partitions.ensure_partitions(
+        {record.timestamp.astimezone(timezone.utc).date() for record in fresh}
+    )
+    new_id = LogEvent.__id_generator__
+    rows = [
+        (
+            new_id(),
+            record.timestamp,
+            record.level,
+            record.service,
+            record.message,
+            json.dumps(record.attributes),
+        )
+        for record in fresh
+    ]
+    return await copy_records(LogEvent.__table__, COPY_COLUMNS, rows)
+
+
+class LogWriter:
+    """Background task draining the batch queue into PostgreSQL.
+
+    Records are accumulated until either ``batch_size`` rows are pending or
+    ``flush_interval`` seconds have passed since the first of them arrived,
+    then written with one COPY. If that COPY keeps failing, each client
+    batch is written on its own, so one bad batch only loses itself.
+
+    Attributes:
+        queue (BatchQueue): Queue to drain
+        sink (Sink): Coroutine persisting a list of records
+    """
+
+    def __init__(self, queue: BatchQueue, sink: Sink = write_log_records):
+        """Initialize the writer without starting it.
+
+        Args:
+            queue (BatchQueue): Queue to drain
+            sink (Sink): Coroutine persisting a list of records
+        """
+        self.queue = queue
+        self.sink = sink
+        self.batch_size = config.performance.WRITER_BATCH_SIZE
+        self.flush_interval = config.performance.WRITER_FLUSH_INTERVAL_MS / 1000
+        self._pending: List[Sequence[LogRecord]] = []
+        self._rows = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flushing = False
+
+    @property
+    def running(self) -> bool:
+        """Return True while the background task is alive."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background flush task on the running loop."""
+        if self.running:
+            return
+        self.batch_size = config.performance.WRITER_BATCH_SIZE
+        self.flush_interval = config.performance.WRITER_FLUSH_INTERVAL_MS / 1000
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="log-writer")
+        logger.info(
+            "Log writer started",
+            batch_size=self.batch_size,
+            flush_interval=self.flush_interval,
+        )
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background task and flush everything still queued.
+
+        A task waiting for batches is cancelled; one in the middle of a flush
+        is left to finish it, since cancelling the COPY would lose the
+        batches it holds.
+
+        Args:
+            timeout (Optional[float]): Seconds to allow for the final drain
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        if task.get_loop() is not asyncio.get_running_loop():
+            # The loop that owned the task is gone; nothing left to await
+            return
+        self._stopping = True
+        if not self._flushing:
+            task.cancel()
+        try:
+            await asyncio.wait_for(self._finish(task), timeout)
+        except asyncio.TimeoutError:
+            logger.error("Log writer drain timed out", pending=self.queue.records)
+        logger.info("Log writer stopped")
+
+    async def _finish(self, task: asyncio.Task) -> None:
+        """Wait for the background task to exit, then drain the queue."""
+        with suppress(asyncio.CancelledError):
+            await task
+        await self.drain()
+
+    async def drain(self) -> None:
+        """Flush in-flight and queued records until the queue is empty."""
+        while self._pending or self.queue.qsize():
+            while self.queue.qsize() and self._rows < self.batch_size:
+                self._add(self.queue.get_nowait())
+            await self._flush()
+
+    def _add(self, batch: Sequence[LogRecord]) -> None:
+        """Add a client batch to the next flush."""
+        self._pending.append(batch)
+        self._rows += len(batch)
+
+    async def _run(self) -> None:
+        """Collect batches and flush on the size-or-time trigger."""
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            self._add(await self.queue.get())
+            deadline = loop.time() + self.flush_interval
+            while self._rows < self.batch_size:
+                if self.queue.qsize():
+                    self._add(self.queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                self._add(batch)
+            await self._flush()
+
+    async def _flush(self) -> None:
+        """Write pending batches with one COPY, isolating them if it fails.
+
+        Failures are retried with backoff. If the combined write still fails,
+        each client batch is written once on its own, so a batch the database
+        rejects does not take the other clients' records down with it.
+        """
+        batches, self._pending, self._rows = self._pending, [], 0
+        if not batches:
+            return
+        self._flushing = True
+        try:
+            await self._write_batches(batches)
+        finally:
+            self._flushing = False
+
+    async def _write_batches(self, batches: List[Sequence[LogRecord]]) -> None:
+        """Write batches together, then one by one if that keeps failing."""
+        records = [record for batch in batches for record in batch]
+        if await self._write(records, MAX_FLUSH_ATTEMPTS):
+            return
+        if len(batches) == 1:
+            ROWS_FAILED.inc(len(records))
+            return
+        for batch in batches:
+            if not await self._write(batch, 1):
+                ROWS_FAILED.inc(len(batch))
+
+    async def _write(self, records: Sequence[LogRecord], attempts: int) -> bool:
+        """Write records through the sink, retrying failures with backoff.
+
+        Args:
+            records (Sequence[LogRecord]): Records to write
+            attempts (int): Tries before giving up
+
+        Returns:
+            bool: Whether the records were written
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                with FLUSH_SECONDS.time():
+                    await self.sink(records)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    "Log batch flush failed", rows=len(records), attempt=attempt
+                )
+                if attempt < attempts:
+                    await asyncio.sleep(0.1 * 2**attempt)
+                continue
+            ROWS_WRITTEN.inc(len(records))
+            return True
+        return False
+
+
+# Writer draining the shared ingestion queue
+log_writer = LogWriter(batch_queue)
+
+
+@config_reloader.on_change("WRITER_BATCH_SIZE", "WRITER_FLUSH_INTERVAL_MS")
+def tune_log_writer(new: Config) -> None:
+    """Apply new flush triggers from the next batch on."""
+    log_writer.batch_size = new.performance.WRITER_BATCH_SIZE
+    log_writer.flush_interval = new.performance.WRITER_FLUSH_INTERVAL_MS / 1000
@@ -0,0 +1,28 @@
+"""
+Shared test configuration.
+"""
+import os
+from dataclasses import replace
+
+import pytest
+
+# Keep request tests independent of any Redis reachable from the test host;
+# rate limiting is exercised directly in test_rate_limit.py
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from src.config import config  # noqa: E402
+
+
+@pytest.fixture
+def override_config(monkeypatch):
+    """Swap in a config section with some settings changed for one test.
+
+    Sections are immutable, so each call replaces the whole section and the
+    original is restored when the test ends.
+    """
+
+    def apply(section, **values):
+        changed = replace(getattr(config, section), **values)
+        monkeypatch.setattr(config, section, changed)
+
+    return apply
@@ -0,0 +1,58 @@
+"""
+Test cases for the admin module.
+"""
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.reload import config_reloader
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def client(override_config):
+    """Create a test client with an admin secret configured."""
+    override_config("security", SECRET_KEY=TOKEN)
+    yield TestClient(app)
+    logging.getLogger("src.search").setLevel(logging.NOTSET)
+
+
+def test_admin_requires_token(client, override_config):
+    """Test the admin API rejects missing or wrong tokens."""
+    assert client.get("/admin/log-levels").status_code == 401
+    response = client.get("/admin/log-levels", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 401
+
+    override_config("security", SECRET_KEY="")
+    response = client.get("/admin/log-levels", headers={"X-Admin-Token": ""})
+    assert response.status_code == 403
+
+
+def test_update_log_level(client, monkeypatch):
+    """Test a logger's level can be changed, published and listed at runtime."""
+    published = []
+
+    async def publish(overrides, log_levels=None):
+        published.append(log_levels)
+
+    monkeypatch.setattr(config_reloader, "publish", publish)
+    headers = {"X-Admin-Token": TOKEN}
+    response = client.put(
+        "/admin/log-levels/src.search", json={"level": "debug"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {"logger": "src.search", "level": "DEBUG"}
+    assert logging.getLogger("src.search").level == logging.DEBUG
+    assert published == [{"src.search": "DEBUG"}]
+
+    levels = client.get("/admin/log-levels", headers=headers).json()
+    assert levels["src.search"] == "DEBUG"
+    assert "root" in levels
+
+    response = client.put(
+        "/admin/log-levels/src.search", json={"level": "LOUD"}, headers=headers
+    )
+    assert response.status_code == 422
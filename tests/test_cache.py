@@ -0,0 +1,72 @@
+"""
+Test cases for the cache module.
+"""
+import asyncio
+import uuid
+
+import pytest
+from pytest_asyncio import fixture
+
+from src import cache
+
+
+@fixture
+async def redis_client():
+    """Provide the shared client and close the pool afterwards."""
+    client = await cache.init_redis()
+    yield client
+    await cache.close_redis()
+
+
+@pytest.fixture
+def prefix():
+    """Return a unique key prefix for a test."""
+    return f"test:{uuid.uuid4()}"
+
+
+@pytest.mark.asyncio
+async def test_get_redis_is_shared(redis_client):
+    """Test that the client is reused within one event loop."""
+    assert cache.get_redis() is redis_client
+    assert await redis_client.ping()
+
+
+@pytest.mark.asyncio
+async def test_set_many_and_get_many(redis_client, prefix):
+    """Test batched SET and GET round-trip values."""
+    items = {f"{prefix}:{i}": str(i) for i in range(50)}
+    await cache.set_many(items, ttl=60)
+    values = await cache.get_many(list(items) + [f"{prefix}:missing"])
+    assert values[:50] == [str(i).encode() for i in range(50)]
+    assert values[50] is None
+    assert 0 < await redis_client.ttl(f"{prefix}:0") <= 60
+    await redis_client.delete(*items)
+
+
+@pytest.mark.asyncio
+async def test_xadd_many(redis_client, prefix):
+    """Test batched XADD appends every entry."""
+    stream = f"{prefix}:stream"
+    ids = await cache.xadd_many(stream, [{"n": i} for i in range(20)])
+    assert len(ids) == 20
+    assert await redis_client.xlen(stream) == 20
+    await redis_client.delete(stream)
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_track_checkouts(redis_client):
+    """Test the in-use gauge follows concurrent checkouts."""
+    baseline = cache.POOL_IN_USE._value.get()
+    await asyncio.gather(*(redis_client.ping() for _ in range(10)))
+    assert cache.POOL_IN_USE._value.get() == baseline
+    assert cache.POOL_OPEN._value.get() >= 1
+    assert cache.POOL_MAX._value.get() == redis_client.connection_pool.max_connections
+
+
+@pytest.mark.asyncio
+async def test_prime_redis_opens_idle_connections(redis_client):
+    """Test priming leaves distinct idle connections in the pool."""
+    assert await cache.prime_redis(5) == 5
+    pool = redis_client.connection_pool
+    assert len(pool._available_connections) >= 5
+    assert not pool._in_use_connections
@@ -2,8 +2,12 @@
 Test cases for the configuration module.
 """
 import os
+from dataclasses import FrozenInstanceError, replace
+
 import pytest
-from src.config import Config, config
+
+from src.config import config, get_config, parse_rate, parse_sample_rates, parse_size
+
 
 @pytest.fixture(autouse=True)
 def reset_config():
@@ -12,16 +16,17 @@ def reset_config():
     original_env = {}
     for key in os.environ:
         original_env[key] = os.environ[key]
-    
+
     yield
-    
+
     # Restore original environment
     os.environ.clear()
     os.environ.update(original_env)
-    
+
     # Recreate config instance
     config.__init__()
 
+
 @pytest.fixture
 def mock_env(monkeypatch):
     """Fixture to set up test environment variables."""
@@ -35,7 +40,7 @@ def mock_env(monkeypatch):
         "SECRET_KEY": "test_secret_key",
         "ALLOWED_HOSTS": "test.com,api.test.com",
         "DB_PASSWORD": "test_password",
-        "REDIS_PASSWORD": "test_redis_password"
+        "REDIS_PASSWORD": "test_redis_password",
     }
     for key, value in env_vars.items():
         monkeypatch.setenv(key, value)
@@ -43,6 +48,7 @@ def mock_env(monkeypatch):
     config.__init__()
     return env_vars
 
+
 def test_config_loads_environment_variables(mock_env):
     """Test that configuration properly loads environment variables."""
     assert config.app.APP_NAME == "test_service"
@@ -50,6 +56,7 @@ def test_config_loads_environment_variables(mock_env):
     assert not config.app.DEBUG
     assert config.app.LOG_LEVEL == "DEBUG"
 
+
 def test_config_uses_defaults_for_missing_variables():
     """Test that configuration uses default values for missing environment variables."""
     config.__init__()
@@ -58,81 +65,87 @@ def test_config_uses_defaults_for_missing_variables():
     assert config.app.DEBUG
     assert config.server.PORT == 8000
 
+
 def test_config_validation_production():
     """Test configuration validation in production environment."""
-    os.environ.update({
-        "ENVIRONMENT": "production",
-        "DEBUG": "True",
-        "SECRET_KEY": "",
-        "DB_PASSWORD": "",
-        "REDIS_PASSWORD": ""
-    })
+    os.environ.update(
+        {
+            "ENVIRONMENT": "production",
+            "DEBUG": "True",
+            "SECRET_KEY": "",
+            "DB_PASSWORD": "",
+            "REDIS_PASSWORD": "",
+        }
+    )
     with pytest.raises(AssertionError, match="DEBUG should be False in production"):
         config.__init__()
 
+
 def test_logging_configuration_validation():
     """Test logging configuration validation."""
     os.environ["LOG_FORMAT"] = "invalid"
     with pytest.raises(AssertionError, match="Invalid LOG_FORMAT"):
         config.__init__()
 
+
 def test_security_configuration():
     """Test security configuration parsing."""
-    os.environ.update({
-        "ALLOWED_HOSTS": "test1.com,test2.com",
-        "CORS_ORIGINS": "http://test1.com,http://test2.com"
-    })
+    os.environ.update(
+        {
+            "ALLOWED_HOSTS": "test1.com,test2.com",
+            "CORS_ORIGINS": "http://test1.com,http://test2.com",
+        }
+    )
     config.__init__()
     assert config.security.ALLOWED_HOSTS == ["test1.com", "test2.com"]
     assert config.security.CORS_ORIGINS == ["http://test1.com", "http://test2.com"]
 
+
 def test_feature_flags():
     """Test feature flag configuration."""
-    os.environ.update({
-        "ENABLE_BATCH_PROCESSING": "true",
-        "ENABLE_ASYNC_LOGGING": "false"
-    })
+    os.environ.update(
+        {"ENABLE_BATCH_PROCESSING": "true", "ENABLE_ASYNC_LOGGING": "false"}
+    )
     config.__init__()
     assert config.features.ENABLE_BATCH_PROCESSING
     assert not config.features.ENABLE_ASYNC_LOGGING
 
+
 def test_performance_settings():
     """Test performance configuration parsing."""
-    os.environ.update({
-        "WORKER_PROCESSES": "8",
-        "THREAD_POOL_SIZE": "20",
-        "MAX_QUEUE_SIZE": "2000"
-    })
+    os.environ.update(
+        {"WORKER_PROCESSES": "8", "THREAD_POOL_SIZE": "20", "MAX_QUEUE_SIZE": "2000"}
+    )
     config.__init__()
     assert config.performance.WORKER_PROCESSES == 8
     assert config.performance.THREAD_POOL_SIZE == 20
     assert config.performance.MAX_QUEUE_SIZE == 2000
 
+
 def test_backup_configuration():
     """Test backup configuration validation."""
-    os.environ.update({
-        "BACKUP_ENABLED": "true",
-        "BACKUP_RETENTION_DAYS": "14",
-        "BACKUP_S3_BUCKET": "test-bucket"
-    })
+    os.environ.update(
+        {
+            "BACKUP_ENABLED": "true",
+            "BACKUP_RETENTION_DAYS": "14",
+            "BACKUP_S3_BUCKET": "test-bucket",
+        }
+    )
     config.__init__()
     assert config.backup.BACKUP_ENABLED
     assert config.backup.BACKUP_RETENTION_DAYS == 14
     assert config.backup.BACKUP_S3_BUCKET == "test-bucket"
 
+
 def test_invalid_port_numbers():
     """Test validation of invalid port numbers."""
     # Save current environment
     original_port = os.environ.get("PORT")
     original_db_port = os.environ.get("DB_PORT")
     original_redis_port = os.environ.get("REDIS_PORT")
-    
+
     try:
-        os.environ.update({
-            "PORT": "-1",
-            "DB_PORT": "999999",
-            "REDIS_PORT": "abc"
-        })
+        os.environ.update({"PORT": "-1", "DB_PORT": "999999", "REDIS_PORT": "abc"})
         with pytest.raises(ValueError, match="invalid literal for int()"):
             config.__init__()
     finally:
@@ -144,6 +157,7 @@ def test_invalid_port_numbers():
         if original_redis_port:
             os.environ["REDIS_PORT"] = original_redis_port
 
+
 def test_production_localhost_validation():
     """Test validation of localhost in production ALLOWED_HOSTS."""
     # Save current environment
@@ -153,19 +167,24 @@ def test_production_localhost_validation():
         "SECRET_KEY": os.environ.get("SECRET_KEY"),
         "DB_PASSWORD": os.environ.get("DB_PASSWORD"),
         "REDIS_PASSWORD": os.environ.get("REDIS_PASSWORD"),
-        "ALLOWED_HOSTS": os.environ.get("ALLOWED_HOSTS")
+        "ALLOWED_HOSTS": os.environ.get("ALLOWED_HOSTS"),
     }
-    
+
     try:
-        os.environ.update({
-            "ENVIRONMENT": "production",
-            "DEBUG": "false",
-            "SECRET_KEY": "test_key",
-            "DB_PASSWORD": "test_pass",
-            "REDIS_PASSWORD": "test_pass",
-            "ALLOWED_HOSTS": "prod.example.com,localhost"
-        })
-        with pytest.raises(AssertionError, match="localhost should not be in ALLOWED_HOSTS in production"):
+        os.environ.update(
+            {
+                "ENVIRONMENT": "production",
+                "DEBUG": "false",
+                "SECRET_KEY": "test_key",
+                "DB_PASSWORD": "test_pass",
+                "REDIS_PASSWORD": "test_pass",
+                "ALLOWED_HOSTS": "prod.example.com,localhost",
+            }
+        )
+        with pytest.raises(
+            AssertionError,
+            match="localhost should not be in ALLOWED_HOSTS in production",
+        ):
             config.__init__()
     finally:
         # Restore environment
@@ -173,18 +192,18 @@ def test_production_localhost_validation():
             if value:
                 os.environ[key] = value
 
+
 def test_log_file_validation():
     """Test validation of log file configuration."""
     # Save current environment
     original_output = os.environ.get("LOG_OUTPUT")
     original_path = os.environ.get("LOG_FILE_PATH")
-    
+
     try:
-        os.environ.update({
-            "LOG_OUTPUT": "file",
-            "LOG_FILE_PATH": ""
-        })
-        with pytest.raises(AssertionError, match="LOG_FILE_PATH must be set when LOG_OUTPUT is file"):
+        os.environ.update({"LOG_OUTPUT": "file", "LOG_FILE_PATH": ""})
+        with pytest.raises(
+            AssertionError, match="LOG_FILE_PATH must be set when LOG_OUTPUT is file"
+        ):
             config.__init__()
     finally:
         # Restore environment
@@ -193,32 +212,144 @@ def test_log_file_validation():
         if original_path:
             os.environ["LOG_FILE_PATH"] = original_path
 
+
 def test_rate_limit_configuration():
     """Test rate limit configuration parsing."""
-    os.environ.update({
-        "RATE_LIMIT_ENABLED": "true",
-        "RATE_LIMIT_DEFAULT": "200/minute"
-    })
+    os.environ.update(
+        {"RATE_LIMIT_ENABLED": "true", "RATE_LIMIT_DEFAULT": "200/minute"}
+    )
     config.__init__()
     assert config.rate_limit.RATE_LIMIT_ENABLED
     assert config.rate_limit.RATE_LIMIT_DEFAULT == "200/minute"
 
+
 def test_monitoring_configuration():
     """Test monitoring configuration parsing."""
-    os.environ.update({
-        "ENABLE_METRICS": "true",
-        "METRICS_PORT": "9091"
-    })
+    os.environ.update({"ENABLE_METRICS": "true", "METRICS_PORT": "9091"})
     config.__init__()
     assert config.monitoring.ENABLE_METRICS
     assert config.monitoring.METRICS_PORT == 9091
 
+
 def test_dependency_configuration():
     """Test dependency service configuration."""
-    os.environ.update({
-        "DEPENDENT_SERVICE_URL": "http://api.example.com",
-        "DEPENDENT_SERVICE_TIMEOUT": "60"
-    })
+    os.environ.update(
+        {
+            "DEPENDENT_SERVICE_URL": "http://api.example.com",
+            "DEPENDENT_SERVICE_TIMEOUT": "60",
+        }
+    )
     config.__init__()
     assert config.dependencies.DEPENDENT_SERVICE_URL == "http://api.example.com"
-    assert config.dependencies.DEPENDENT_SERVICE_TIMEOUT == 60 
\ No newline at end of file
+    assert config.dependencies.DEPENDENT_SERVICE_TIMEOUT == 60
+
+
+def test_parse_rate():
+    """Test rate limit strings are parsed into a limit and period."""
+    assert parse_rate("100/minute") == (100, 60)
+    assert parse_rate("5/Seconds") == (5, 1)
+    assert parse_rate("1000/day") == (1000, 86400)
+    for invalid in ("100", "abc/minute", "0/minute", "10/fortnight"):
+        with pytest.raises(ValueError):
+            parse_rate(invalid)
+
+
+def test_invalid_rate_limit_validation():
+    """Test validation of the default rate limit."""
+    os.environ.update(
+        {"RATE_LIMIT_ENABLED": "true", "RATE_LIMIT_DEFAULT": "lots/minute"}
+    )
+    with pytest.raises(AssertionError, match="Invalid RATE_LIMIT_DEFAULT"):
+        config.__init__()
+
+
+def test_invalid_database_pool_validation():
+    """Test validation of database pool sizing."""
+    os.environ["DB_POOL_SIZE"] = "0"
+    with pytest.raises(AssertionError, match="Invalid database pool size"):
+        config.__init__()
+
+    os.environ.update(
+        {"DB_POOL_SIZE": "5", "WORKER_PROCESSES": "4", "DB_MAX_CONNECTIONS": "2"}
+    )
+    with pytest.raises(AssertionError, match="one connection per worker"):
+        config.__init__()
+
+
+def test_logging_queue_validation():
+    """Test the logging queue overflow policy is validated."""
+    os.environ["LOG_QUEUE_OVERFLOW"] = "spill"
+    with pytest.raises(AssertionError, match="Invalid LOG_QUEUE_OVERFLOW"):
+        config.__init__()
+
+
+def test_parse_size():
+    """Test rotation sizes are parsed into bytes."""
+    assert parse_size("10MB") == 10 * 1024 * 1024
+    assert parse_size("512kb") == 512 * 1024
+    assert parse_size("100") == 100
+    for size in ("MB", "0KB", "10TB"):
+        with pytest.raises(ValueError):
+            parse_size(size)
+    os.environ["LOG_ROTATION_SIZE"] = "ten megabytes"
+    with pytest.raises(AssertionError, match="Invalid LOG_ROTATION_SIZE"):
+        config.__init__()
+    os.environ["LOG_ROTATION_SIZE"] = "10MB"
+    os.environ["MAX_BODY_SIZE"] = "-1"
+    with pytest.raises(AssertionError, match="Invalid MAX_BODY_SIZE"):
+        config.__init__()
+
+
+def test_parse_sample_rates():
+    """Test per-event sampling rates are parsed and validated."""
+    assert parse_sample_rates("Health check=100, Cache miss=10") == {
+        "Health check": 100,
+        "Cache miss": 10,
+    }
+    assert parse_sample_rates("") == {}
+    os.environ["LOG_SAMPLE_RATES"] = "Health check=0"
+    with pytest.raises(AssertionError, match="Invalid LOG_SAMPLE_RATES"):
+        config.__init__()
+
+
+def test_sections_are_frozen():
+    """Test settings sections cannot be changed in place."""
+    with pytest.raises(FrozenInstanceError):
+        config.app.DEBUG = False
+    assert "SECRET_KEY" not in repr(config.security)
+
+
+def test_parsed_settings():
+    """Test sizes and rates are parsed once when a section is built."""
+    os.environ.update(
+        {
+            "LOG_ROTATION_SIZE": "2MB",
+            "MAX_BODY_SIZE": "512KB",
+            "RATE_LIMIT_ENABLED": "true",
+            "RATE_LIMIT_DEFAULT": "20/second",
+        }
+    )
+    config.__init__()
+    assert config.logging.LOG_ROTATION_BYTES == 2 * 1024 * 1024
+    assert config.performance.MAX_BODY_BYTES == 512 * 1024
+    assert config.rate_limit.RATE_LIMIT_WINDOW == (20, 1)
+    changed = replace(config.logging, LOG_ROTATION_SIZE="1KB")
+    assert changed.LOG_ROTATION_BYTES == 1024
+
+    disabled = replace(
+        config.rate_limit, RATE_LIMIT_ENABLED=False, RATE_LIMIT_DEFAULT="x"
+    )
+    assert disabled.RATE_LIMIT_WINDOW is None
+
+
+def test_get_config_is_cached():
+    """Test the accessor returns the shared instance."""
+    assert get_config() is config
+    assert get_config() is get_config()
+
+
+def test_warmup_configuration_validation():
+    """Test warm-up cannot ask for more Redis connections than the pool has."""
+    os.environ.update({"REDIS_POOL_SIZE": "2", "WARMUP_REDIS_CONNECTIONS": "3"})
+    with pytest.raises(AssertionError, match="WARMUP_REDIS_CONNECTIONS"):
+        config.__init__()
@@ -1,46 +1,69 @@
 """
 Test cases for the database module.
 """
+import json
+from datetime import datetime, timezone
+
 import pytest
-from sqlalchemy import Column, Integer, String, text
+from pytest_asyncio import fixture
+from sqlalchemy import Column, String, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.schema import CreateTable
-from pytest_asyncio import fixture
 
-from src.database import get_db, init_db, AsyncSessionLocal
+from src import database
+from src.config import config
+from src.database import (
+    POOL_IN_USE,
+    POOL_SIZE,
+    POOL_WAIT,
+    AsyncSessionLocal,
+    ReplicaSet,
+    copy_records,
+    engine,
+    engine_options,
+    get_read_db,
+    init_db,
+    pool_limits,
+)
+from src.models import LogEvent
 from src.models.base import Base
+from src.models.ids import uuid7
+from src.partitions import log_partitions
+from src.writer import COPY_COLUMNS
+
 
 @fixture(scope="function")
 async def db():
     """Initialize database and provide a session.
-    
+
     Returns:
         AsyncSession: Database session for testing
     """
     # Initialize database
     engine = await init_db()
-    
+
     # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    
+
     # Create session
     async with AsyncSessionLocal() as session:
         yield session
         await session.rollback()
-    
+
     # Cleanup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
+
 @pytest.mark.asyncio
 async def test_database_initialization():
     """Test database initialization."""
     engine = await init_db()
     assert engine is not None
-    
+
     try:
         async with engine.connect() as conn:
             result = await conn.execute(text("SELECT 1"))
@@ -48,6 +71,7 @@ async def test_database_initialization():
     finally:
         await engine.dispose()
 
+
 @pytest.mark.asyncio
 async def test_database_session_management(db):
     """Test database session management."""
@@ -55,6 +79,7 @@ async def test_database_session_management(db):
     result = await db.execute(text("SELECT 1"))
     assert result.scalar() == 1
 
+
 @pytest.mark.asyncio
 async def test_database_transaction_rollback(db):
     """Test database transaction rollback."""
@@ -63,45 +88,179 @@ async def test_database_transaction_rollback(db):
         await db.execute(text("SELECT 1"))
         with pytest.raises(Exception, match="Test rollback"):
             raise Exception("Test rollback")
-    
+
     # Verify session is still usable after rollback
     result = await db.execute(text("SELECT 1"))
     assert result.scalar() == 1
 
+
 @pytest.mark.asyncio
 async def test_database_model_operations(db):
     """Test database model operations."""
+
     # Create a test table
     class TestModel(Base):
         __tablename__ = "test_model"
         name = Column(String)
-    
+
     # Create the table
     async with db.begin():
         await db.execute(CreateTable(TestModel.__table__))
-    
+
     # Test CRUD operations
     test_model = TestModel(name="test")
     db.add(test_model)
     await db.commit()
-    
+
     # Query the model
-    result = await db.execute(
-        select(TestModel).where(TestModel.name == "test")
-    )
+    result = await db.execute(select(TestModel).where(TestModel.name == "test"))
     model = result.scalar_one()
     assert model.name == "test"
-    
+
     # Update the model
     model.name = "updated"
     await db.commit()
-    
+
     # Delete the model
     await db.delete(model)
     await db.commit()
-    
+
     # Verify deletion
+    result = await db.execute(select(TestModel).where(TestModel.name == "updated"))
+    assert result.first() is None
+
+
+@pytest.mark.asyncio
+async def test_copy_records(db):
+    """Test bulk loading rows with binary COPY."""
+    rows = [
+        (
+            uuid7(),
+            datetime.now(timezone.utc),
+            "INFO",
+            "api",
+            f"message {i}",
+            json.dumps({"i": i}),
+        )
+        for i in range(100)
+    ]
+    log_partitions.reset()
+    await log_partitions.ensure_partitions([rows[0][1].date()])
+    copied = await copy_records(LogEvent.__table__, COPY_COLUMNS, rows)
+    assert copied == 100
+
+    result = await db.execute(select(func.count()).select_from(LogEvent))
+    assert result.scalar() == 100
     result = await db.execute(
-        select(TestModel).where(TestModel.name == "updated")
+        select(LogEvent.attributes).where(LogEvent.message == "message 7")
+    )
+    assert result.scalar_one() == {"i": 7}
+
+
+def test_pool_limits_split_connection_budget(override_config):
+    """Test DB_MAX_CONNECTIONS is divided across worker processes."""
+    override_config("database", DB_POOL_SIZE=5)
+    override_config("database", DB_MAX_OVERFLOW=10)
+    override_config("performance", WORKER_PROCESSES=4)
+    override_config("database", DB_MAX_CONNECTIONS=0)
+    assert pool_limits() == (5, 10)
+    override_config("database", DB_MAX_CONNECTIONS=40)
+    assert pool_limits() == (5, 5)
+    override_config("database", DB_MAX_CONNECTIONS=12)
+    assert pool_limits() == (3, 0)
+
+
+def test_engine_options(override_config):
+    """Test pool options come from DatabaseConfig and PgBouncer mode."""
+    override_config("database", DB_PGBOUNCER=False)
+    options = engine_options("primary")
+    assert options["pool_timeout"] == config.database.DB_POOL_TIMEOUT
+    assert options["pool_recycle"] == config.database.DB_POOL_RECYCLE
+    assert options["pool_pre_ping"] is config.database.DB_POOL_PRE_PING
+    assert "connect_args" not in options
+
+    override_config("database", DB_PGBOUNCER=True)
+    connect_args = engine_options("primary")["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != (
+        connect_args["prepared_statement_name_func"]()
     )
-    assert result.first() is None 
\ No newline at end of file
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_track_checkouts():
+    """Test pool gauges follow connection checkout and checkin."""
+    in_use = POOL_IN_USE.labels(pool="primary")
+    waits = POOL_WAIT.labels(pool="primary")._sum.get()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert in_use._value.get() == 1
+        assert in_use._value.get() == 0
+        assert POOL_WAIT.labels(pool="primary")._sum.get() > waits
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_replica_pools_have_their_own_metrics(override_config):
+    """Test each replica pool reports under its own label."""
+    override_config("database", DB_POOL_SIZE=3)
+    replicas = ReplicaSet(["replica-a", "replica-b:5433"])
+    try:
+        assert [r.engine.pool.label for r in replicas.replicas] == [
+            "replica-0",
+            "replica-1",
+        ]
+        assert POOL_SIZE.labels(pool="replica-1")._value.get() == 3
+    finally:
+        await replicas.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_falls_back_to_primary(monkeypatch):
+    """Test reads use the primary when no replicas are configured."""
+    monkeypatch.setattr(database, "read_replicas", ReplicaSet([]))
+    async with get_read_db() as session:
+        assert session.bind is engine
+        assert (await session.execute(text("SELECT 1"))).scalar() == 1
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_ejects_unreachable_replica(monkeypatch):
+    """Test an unreachable replica is ejected and the next one is used."""
+    replicas = ReplicaSet(
+        ["localhost:1", f"{config.database.DB_HOST}:{config.database.DB_PORT}"]
+    )
+    monkeypatch.setattr(database, "read_replicas", replicas)
+    dead, healthy = replicas.replicas
+    try:
+        async with get_read_db() as session:
+            assert session.bind is healthy.engine
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+        assert dead.ejected_until > 0
+        assert healthy.ejected_until == 0
+
+        # Ejected replicas are skipped until their ejection expires
+        assert replicas.candidates() == [healthy]
+        assert replicas.candidates() == [healthy]
+        dead.ejected_until = 0
+        assert replicas.candidates() == [healthy, dead]
+    finally:
+        await replicas.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_falls_back_when_all_ejected(monkeypatch):
+    """Test reads go to the primary when every replica is down."""
+    replicas = ReplicaSet(["localhost:1"])
+    monkeypatch.setattr(database, "read_replicas", replicas)
+    try:
+        async with get_read_db() as session:
+            assert session.bind is engine
+        assert replicas.candidates() == []
+    finally:
+        await replicas.dispose()
+        await engine.dispose()
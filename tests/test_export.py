@@ -0,0 +1,132 @@
+"""
+Test cases for the export module.
+"""
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from pytest_asyncio import fixture
+
+from src.database import copy_records, init_db
+from src.export import accepts_gzip, export_ndjson, gzip_stream
+from src.main import app
+from src.models import Base, LogEvent
+from src.models.ids import uuid7
+from src.partitions import log_partitions
+from src.search import SearchFilters
+from src.writer import COPY_COLUMNS
+
+EVENT_COUNT = 120
+
+
+@fixture(scope="function")
+async def events():
+    """Create the log tables and load events to export."""
+    engine = await init_db()
+    log_partitions.reset()
+    now = datetime.now(timezone.utc)
+    rows = [
+        (
+            uuid7(),
+            now - timedelta(seconds=i),
+            "ERROR" if i % 4 == 0 else "INFO",
+            "api",
+            f"event {i}",
+            json.dumps({"i": i}),
+        )
+        for i in range(EVENT_COUNT)
+    ]
+    await log_partitions.ensure_partitions({row[1].date() for row in rows})
+    await copy_records(LogEvent.__table__, COPY_COLUMNS, rows)
+    yield rows
+    log_partitions.reset()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def collect(chunks):
+    """Drain an async byte iterator into a list."""
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_export_streams_bounded_chunks(events):
+    """Test rows arrive in one NDJSON chunk per server-side fetch."""
+    chunks = await collect(export_ndjson(SearchFilters(), fetch_size=50))
+    assert len(chunks) == 3
+
+    lines = b"".join(chunks).decode().splitlines()
+    assert len(lines) == EVENT_COUNT
+    records = [json.loads(line) for line in lines]
+    assert {record["attributes"]["i"] for record in records} == set(range(EVENT_COUNT))
+    assert set(records[0]) == {
+        "id",
+        "timestamp",
+        "level",
+        "service",
+        "message",
+        "attributes",
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_applies_filters(events):
+    """Test search filters restrict the exported rows."""
+    chunks = await collect(export_ndjson(SearchFilters(levels=["error"])))
+    lines = b"".join(chunks).splitlines()
+    assert len(lines) == EVENT_COUNT // 4
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_round_trip():
+    """Test compressed chunks form one valid gzip stream."""
+
+    async def source():
+        for i in range(100):
+            yield f'{{"n": {i}}}\n'.encode()
+
+    compressed = b"".join(await collect(gzip_stream(source())))
+    expected = "".join(f'{{"n": {i}}}\n' for i in range(100)).encode()
+    assert gzip.decompress(compressed) == expected
+
+
+def test_accepts_gzip():
+    """Test Accept-Encoding quality values are honoured."""
+    assert accepts_gzip("gzip")
+    assert accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert accepts_gzip("x-gzip")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip; q=0.000, deflate")
+    assert not accepts_gzip("*;q=0")
+    assert not accepts_gzip("gzip;q=0, *")
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint(events):
+    """Test the endpoint streams NDJSON, gzip-encoded when accepted."""
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(
+            "/logs/export",
+            params={"service": "api"},
+            headers={"Accept-Encoding": "identity"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "content-encoding" not in response.headers
+        assert len(response.text.splitlines()) == EVENT_COUNT
+
+        response = await client.get(
+            "/logs/export", headers={"Accept-Encoding": "gzip;q=0"}
+        )
+        assert "content-encoding" not in response.headers
+
+        response = await client.get("/logs/export", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        # httpx decodes the body transparently
+        assert len(response.text.splitlines()) == EVENT_COUNT
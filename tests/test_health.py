@@ -0,0 +1,112 @@
+"""
+Test cases for the health module.
+"""
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+from pytest_asyncio import fixture
+
+from src import cache
+from src.database import engine
+from src.health import HealthProber, health_prober
+from src.ingestion import batch_queue
+from src.main import app
+
+
+@fixture
+async def prober():
+    """Yield a fresh prober with Redis connected, closing pools afterwards."""
+    await cache.init_redis()
+    yield HealthProber()
+    await cache.close_redis()
+    await engine.dispose()
+
+
+@pytest.fixture
+def drain_queue():
+    """Empty the shared ingestion queue after a test."""
+    yield batch_queue
+    while batch_queue.qsize():
+        batch_queue.get_nowait()
+
+
+@pytest.mark.asyncio
+async def test_not_ready_before_first_probe():
+    """Test that a new prober reports starting and not ready."""
+    prober = HealthProber()
+    assert not prober.ready
+    assert json.loads(prober.body)["status"] == "starting"
+
+
+@pytest.mark.asyncio
+async def test_ready_when_dependencies_are_up(prober, override_config):
+    """Test that a passing probe caches a ready body with each check."""
+    override_config("features", ENABLE_STREAM_INGESTION=False)
+    assert await prober.check()
+    body = json.loads(prober.body)
+    assert body["status"] == "ready"
+    assert set(body["checks"]) == {"postgres", "redis", "queue"}
+    assert all(check["ok"] for check in body["checks"].values())
+
+
+@pytest.mark.asyncio
+async def test_not_ready_above_queue_high_water(
+    prober, drain_queue, monkeypatch, override_config
+):
+    """Test that a backlog above the high-water mark fails readiness."""
+    override_config("features", ENABLE_STREAM_INGESTION=False)
+    override_config("monitoring", HEALTH_QUEUE_HIGH_WATER=0.5)
+    monkeypatch.setattr(batch_queue, "maxsize", 4)
+    for _ in range(2):
+        batch_queue.put_nowait([])
+    assert not await prober.check()
+    queue = json.loads(prober.body)["checks"]["queue"]
+    assert (queue["ok"], queue["depth"], queue["high_water"]) == (False, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_slow_dependency_times_out(prober, monkeypatch, override_config):
+    """Test that a probe slower than the timeout fails readiness."""
+    override_config("monitoring", HEALTH_PROBE_TIMEOUT_MS=10)
+
+    async def hang(self):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(HealthProber, "_check_redis", hang)
+    assert not await prober.check()
+    assert json.loads(prober.body)["checks"]["redis"]["error"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_start_and_stop(prober, override_config):
+    """Test that the prober refreshes in the background until stopped."""
+    override_config("monitoring", HEALTH_CHECK_INTERVAL_MS=10)
+    await prober.start()
+    first = prober.body
+    await asyncio.sleep(0.1)
+    assert prober.body != first
+    await prober.stop()
+    assert not prober.ready
+    assert json.loads(prober.body)["status"] == "stopping"
+
+
+@pytest.mark.asyncio
+async def test_endpoints_serve_cached_state(monkeypatch):
+    """Test that the endpoints return the cached bodies and status codes."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+        monkeypatch.setattr(health_prober, "ready", False)
+        response = await client.get("/health/ready")
+        assert response.status_code == 503
+
+        monkeypatch.setattr(health_prober, "ready", True)
+        monkeypatch.setattr(health_prober, "body", b'{"status":"ready"}')
+        response = await client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"status": "ready"}
@@ -0,0 +1,104 @@
+"""
+Test cases for the http_metrics module.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.http_metrics import HTTPMetricsMiddleware, route_template
+from src.main import app
+
+
+def requests_total(method, route, status):
+    """Read the request counter for one label set."""
+    value = REGISTRY.get_sample_value(
+        "http_requests_total", {"method": method, "route": route, "status": status}
+    )
+    return value or 0
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI application."""
+    return TestClient(app)
+
+
+def test_requests_are_labelled_by_route_template(client):
+    """Test path parameters do not leak into labels."""
+    before = requests_total("PUT", "/admin/log-levels/{name}", "403")
+    for name in ("src.search", "src.export"):
+        client.put(f"/admin/log-levels/{name}", json={"level": "DEBUG"})
+    assert requests_total("PUT", "/admin/log-levels/{name}", "403") == before + 2
+
+    before = requests_total("GET", "unmatched", "404")
+    client.get("/no/such/path")
+    assert requests_total("GET", "unmatched", "404") == before + 1
+
+    before = requests_total("GET", "/metrics", "200")
+    client.get("/metrics/")
+    assert requests_total("GET", "/metrics", "200") == before + 1
+
+
+def test_duration_and_sizes_recorded(client):
+    """Test latency and body sizes are observed for each request."""
+    labels = {"method": "GET", "route": "/health"}
+    count = REGISTRY.get_sample_value("http_request_duration_seconds_count", labels)
+    sent = REGISTRY.get_sample_value("http_response_size_bytes_sum", labels)
+    response = client.get("/health")
+    assert (
+        REGISTRY.get_sample_value("http_request_duration_seconds_count", labels)
+        == (count or 0) + 1
+    )
+    assert REGISTRY.get_sample_value("http_response_size_bytes_sum", labels) == (
+        sent or 0
+    ) + len(response.content)
+    assert REGISTRY.get_sample_value("http_requests_in_flight") == 0
+
+
+@pytest.mark.asyncio
+async def test_chunked_request_size_recorded():
+    """Test bodies without a Content-Length are counted as they stream in."""
+    chunks = [b"{}\n", b"{}\n", b""]
+
+    async def receive():
+        body = chunks.pop(0)
+        return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+
+    async def reading_app(scope, receive, send):
+        while (await receive())["more_body"]:
+            pass
+
+    middleware = HTTPMetricsMiddleware(reading_app)
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"transfer-encoding", b"chunked")],
+    }
+    labels = {"method": "POST", "route": "unmatched"}
+    before = REGISTRY.get_sample_value("http_request_size_bytes_sum", labels)
+    await middleware(scope, receive, None)
+    assert (
+        REGISTRY.get_sample_value("http_request_size_bytes_sum", labels)
+        == (before or 0) + 6
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_count_as_500():
+    """Test an exception before the response starts is recorded as a 500."""
+
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    middleware = HTTPMetricsMiddleware(failing_app)
+    scope = {"type": "http", "method": "BREW", "path": "/", "headers": []}
+    before = requests_total("OTHER", "unmatched", "500")
+    with pytest.raises(RuntimeError):
+        await middleware(scope, None, None)
+    assert requests_total("OTHER", "unmatched", "500") == before + 1
+
+
+def test_route_template_without_routing():
+    """Test scopes that were never routed share the unmatched label."""
+    assert route_template({"type": "http"}) == "unmatched"
@@ -0,0 +1,120 @@
+"""
+Test cases for the ingestion module.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from src.ingestion import BatchQueue, QueueFullError, parse_batch
+
+
+def make_records(count):
+    """Build raw record dicts for tests."""
+    return [
+        {
+            "timestamp": "2024-01-01T00:00:00",
+            "level": "info",
+            "service": "api",
+            "message": f"event {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_parse_json_array():
+    """Test parsing a JSON array body."""
+    records = parse_batch(json.dumps(make_records(3)).encode())
+    assert len(records) == 3
+    assert records[0].level == "INFO"
+    assert records[0].timestamp.tzinfo == timezone.utc
+    assert records[2].message == "event 2"
+
+
+def test_parse_ndjson():
+    """Test parsing an NDJSON body, ignoring blank lines."""
+    body = "\n".join(json.dumps(r) for r in make_records(3)) + "\n\n"
+    records = parse_batch(body.encode(), "application/x-ndjson; charset=utf-8")
+    assert [r.message for r in records] == ["event 0", "event 1", "event 2"]
+
+
+def test_parse_ndjson_reports_line_numbers():
+    """Test each NDJSON line must hold one object and errors name the line."""
+    first, second = (json.dumps(r) for r in make_records(2))
+    body = f"{first}\n\n{first},{second}\n"
+    with pytest.raises(ValidationError) as info:
+        parse_batch(body.encode(), "application/x-ndjson")
+    assert [error["loc"] for error in info.value.errors()] == [("line", 3)]
+    assert info.value.errors()[0]["type"] == "json_invalid"
+
+    raw = make_records(2)
+    raw[1]["level"] = "LOUD"
+    body = "\n".join(["", json.dumps(raw[0]), json.dumps(raw[1]), "[]"])
+    with pytest.raises(ValidationError) as info:
+        parse_batch(body.encode(), "application/x-ndjson")
+    assert [error["loc"] for error in info.value.errors()] == [
+        ("line", 3, "level"),
+        ("line", 4),
+    ]
+
+
+def test_parse_rejects_invalid_record():
+    """Test that one invalid record fails the whole batch."""
+    raw = make_records(2)
+    raw[1]["level"] = "LOUD"
+    with pytest.raises(ValidationError):
+        parse_batch(json.dumps(raw).encode())
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("message", "bad\u0000byte"), ("attributes", {"nested": ["x\u0000"]})],
+)
+def test_parse_rejects_nul(field, value):
+    """Test that NUL characters, which PostgreSQL cannot store, are rejected."""
+    raw = make_records(1)
+    raw[0][field] = value
+    with pytest.raises(ValidationError, match="NUL"):
+        parse_batch(json.dumps(raw).encode())
+
+
+def test_parse_rejects_far_future_timestamps(override_config):
+    """Test events dated beyond the pre-created partitions are rejected."""
+    override_config("logging", LOG_PARTITION_PRECREATE_DAYS=3)
+    now = datetime.now(timezone.utc)
+    raw = make_records(2)
+    raw[0]["timestamp"] = (now + timedelta(days=2)).isoformat()
+    assert len(parse_batch(json.dumps(raw).encode())) == 2
+    raw[1]["timestamp"] = (now + timedelta(days=4)).isoformat()
+    with pytest.raises(ValidationError, match="3 days in the future"):
+        parse_batch(json.dumps(raw).encode())
+
+
+def test_queue_bounds_batches():
+    """Test the queue bound is expressed in batches, not records."""
+    queue = BatchQueue(maxsize=2)
+    queue.put_nowait(parse_batch(json.dumps(make_records(5)).encode()))
+    queue.put_nowait(parse_batch(json.dumps(make_records(1)).encode()))
+    assert queue.qsize() == 2
+    assert queue.records == 6
+    with pytest.raises(QueueFullError):
+        queue.put_nowait([])
+
+    assert len(queue.get_nowait()) == 5
+    assert queue.records == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_get_waits_for_batch():
+    """Test that get() wakes up when a batch is enqueued."""
+    queue = BatchQueue(maxsize=10)
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    assert not getter.done()
+
+    batch = parse_batch(json.dumps(make_records(2)).encode())
+    queue.put_nowait(batch)
+    assert await asyncio.wait_for(getter, timeout=1) is batch
+    assert queue.qsize() == 0
@@ -0,0 +1,229 @@
+"""
+Test cases for the log_handlers module.
+"""
+import gzip
+import logging
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from src.log_handlers import (
+    BackgroundListener,
+    BoundedQueueHandler,
+    CompressingFileHandler,
+)
+
+
+def make_record(message, level=logging.INFO):
+    """Build a log record for tests."""
+    return logging.LogRecord("test", level, __file__, 1, message, None, None)
+
+
+def queued_messages(log_queue):
+    """Drain a queue and return the messages of the records on it."""
+    messages = []
+    while not log_queue.empty():
+        messages.append(log_queue.get_nowait().msg)
+    return messages
+
+
+def test_unknown_policy_rejected():
+    """Test an unknown overflow policy raises ValueError."""
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(1), policy="spill")
+
+
+def test_records_are_queued_unformatted():
+    """Test emitting does not render the record on the caller's thread."""
+    log_queue = queue.Queue(10)
+    handler = BoundedQueueHandler(log_queue)
+    record = logging.LogRecord(
+        "test", logging.INFO, __file__, 1, {"event": "hello"}, None, None
+    )
+    handler.handle(record)
+    assert log_queue.get_nowait().msg == {"event": "hello"}
+
+
+def test_drop_oldest_policy():
+    """Test a full queue evicts its oldest records."""
+    log_queue = queue.Queue(2)
+    handler = BoundedQueueHandler(log_queue, policy="drop_oldest")
+    for i in range(5):
+        handler.handle(make_record(f"event {i}"))
+    assert queued_messages(log_queue) == ["event 3", "event 4"]
+    assert handler.dropped == 3
+
+
+def test_block_policy_waits_then_drops(monkeypatch):
+    """Test a full queue blocks the caller, and drops once the wait expires."""
+    monkeypatch.setattr("src.log_handlers.BLOCK_TIMEOUT", 0.01)
+    log_queue = queue.Queue(1)
+    handler = BoundedQueueHandler(log_queue, policy="block")
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+    assert handler.dropped == 1
+
+    timer = threading.Timer(0.005, log_queue.get_nowait)
+    monkeypatch.setattr("src.log_handlers.BLOCK_TIMEOUT", 5)
+    timer.start()
+    handler.handle(make_record("third"))
+    timer.join()
+    assert queued_messages(log_queue) == ["third"]
+    assert handler.dropped == 1
+
+
+def test_sample_policy_thins_info_but_keeps_warnings():
+    """Test sampling past the high-water mark keeps one in N low-level records."""
+    log_queue = queue.Queue(100)
+    handler = BoundedQueueHandler(log_queue, policy="sample", sample_rate=10)
+    for i in range(150):
+        handler.handle(make_record(f"info {i}"))
+    handler.handle(make_record("warning", logging.WARNING))
+    messages = queued_messages(log_queue)
+    # 50 records fill to the high-water mark, then one in ten of the next 100
+    assert len(messages) == 61
+    assert messages[-1] == "warning"
+    assert handler.dropped == 90
+
+
+def test_listener_writes_on_background_thread():
+    """Test records are formatted and written on the listener's thread."""
+    threads = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            threads.append((threading.current_thread(), self.format(record)))
+
+    log_queue = queue.Queue(10)
+    handler = BoundedQueueHandler(log_queue)
+    listener = BackgroundListener(log_queue, RecordingHandler())
+    listener.start()
+    handler.handle(make_record("hello"))
+    listener.stop()
+
+    [(thread, message)] = threads
+    assert message == "hello"
+    assert thread is not threading.current_thread()
+
+
+def test_listener_stops_with_full_queue():
+    """Test stopping waits for room for the sentinel instead of raising."""
+    log_queue = queue.Queue(1)
+    listener = BackgroundListener(log_queue, logging.NullHandler())
+    log_queue.put_nowait(make_record("pending"))
+    listener.start()
+    listener.stop()
+    assert log_queue.empty()
+
+
+@pytest.fixture
+def file_handler(tmp_path):
+    """Create a file handler with a tiny rotation size and no periodic sync."""
+    handler = CompressingFileHandler(
+        str(tmp_path / "app.log"), max_bytes=100, retention_days=1, fsync_interval=60
+    )
+    yield handler
+    handler.close()
+
+
+def test_file_writes_are_buffered(file_handler):
+    """Test records stay in the write buffer until the handler syncs."""
+    file_handler.handle(make_record("buffered"))
+    assert os.path.getsize(file_handler.baseFilename) == 0
+    file_handler.sync()
+    with open(file_handler.baseFilename) as log_file:
+        assert log_file.read() == "buffered\n"
+
+
+def test_fsync_does_not_block_emit(file_handler, monkeypatch):
+    """Test records can be written while the sync thread waits on fsync."""
+    fsyncing, release = threading.Event(), threading.Event()
+
+    def slow_fsync(fd):
+        fsyncing.set()
+        release.wait(5)
+
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+    file_handler.handle(make_record("first"))
+    syncer = threading.Thread(target=file_handler.sync)
+    syncer.start()
+    assert fsyncing.wait(5)
+    emitter = threading.Thread(target=file_handler.handle, args=(make_record("next"),))
+    emitter.start()
+    emitter.join(1)
+    try:
+        assert not emitter.is_alive()
+    finally:
+        release.set()
+        syncer.join()
+        emitter.join()
+
+
+def test_rotation_compresses_segments(file_handler, tmp_path):
+    """Test full files rotate into gzip segments holding every record."""
+    for i in range(10):
+        file_handler.handle(make_record(f"record {i:02d} " + "x" * 30))
+    file_handler.close()
+
+    segments = sorted(tmp_path.glob("app.log.*"))
+    assert segments and all(path.suffix == ".gz" for path in segments)
+    lines = []
+    for path in segments:
+        with gzip.open(path, "rt") as segment:
+            lines.extend(segment.read().splitlines())
+    lines.extend((tmp_path / "app.log").read_text().splitlines())
+    assert [line[:9] for line in lines] == [f"record {i:02d}" for i in range(10)]
+
+
+def test_shared_file_rotates_without_losing_records(tmp_path):
+    """Test handlers in different workers rotate one file once, losing nothing."""
+    path = str(tmp_path / "app.log")
+    first, second = (
+        CompressingFileHandler(path, max_bytes=200, retention_days=1, fsync_interval=60)
+        for _ in range(2)
+    )
+    for i in range(20):
+        handler = first if i % 2 else second
+        handler.handle(make_record(f"record {i:02d} " + "x" * 30))
+        if i == 9:
+            # The other worker follows the rotation at its next sync
+            first.sync()
+            second.sync()
+            assert os.fstat(first.stream.fileno()).st_ino == os.stat(path).st_ino
+            assert os.fstat(second.stream.fileno()).st_ino == os.stat(path).st_ino
+    second.close()
+    first.close()
+
+    lines = []
+    for segment in tmp_path.glob("app.log.*"):
+        with gzip.open(segment, "rt") as log_file:
+            lines.extend(log_file.read().splitlines())
+    lines.extend((tmp_path / "app.log").read_text().splitlines())
+    assert sorted(line[:9] for line in lines) == [f"record {i:02d}" for i in range(20)]
+    assert len(list(tmp_path.glob("app.log.*"))) > 1
+
+
+def test_retention_prunes_old_segments(tmp_path):
+    """Test segments older than the retention window are deleted on startup."""
+    old = tmp_path / "app.log.20200101T000000000000Z.gz"
+    recent = tmp_path / "app.log.20990101T000000000000Z.gz"
+    for path in (old, recent):
+        path.write_bytes(b"")
+    stale = time.time() - 3 * 86400
+    os.utime(old, (stale, stale))
+
+    handler = CompressingFileHandler(
+        str(tmp_path / "app.log"), max_bytes=100, retention_days=2
+    )
+    handler.close()
+    assert not old.exists()
+    assert recent.exists()
+
+
+def test_unavailable_compression_rejected(tmp_path):
+    """Test unknown compression names raise ValueError."""
+    with pytest.raises(ValueError):
+        CompressingFileHandler(str(tmp_path / "app.log"), 100, 1, compression="lz4")
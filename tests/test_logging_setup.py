@@ -0,0 +1,164 @@
+"""
+Test cases for the logging_setup module.
+"""
+import io
+import json
+import logging
+
+import pytest
+import structlog
+
+from src.config import config
+from src.log_handlers import BoundedQueueHandler, CompressingFileHandler
+from src.logging_setup import (
+    EventSampler,
+    configure_logging,
+    get_listener,
+    get_logger_levels,
+    set_logger_level,
+    stop_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    """Reconfigure logging from the real settings after each test."""
+    yield
+    configure_logging()
+
+
+def capture_output():
+    """Point the console handler at a buffer and return the buffer."""
+    stream = io.StringIO()
+    listener = get_listener()
+    handlers = listener.handlers if listener else logging.getLogger().handlers
+    handlers[0].setStream(stream)
+    return stream
+
+
+def test_async_logging_uses_queue_handler(override_config):
+    """Test ENABLE_ASYNC_LOGGING puts a bounded queue in front of the handlers."""
+    override_config("features", ENABLE_ASYNC_LOGGING=True)
+    override_config("logging", LOG_QUEUE_OVERFLOW="sample")
+    configure_logging()
+    [handler] = logging.getLogger().handlers
+    assert isinstance(handler, BoundedQueueHandler)
+    assert handler.policy == "sample"
+    assert handler.queue.maxsize == config.logging.LOG_QUEUE_SIZE
+
+    stream = capture_output()
+    structlog.get_logger("test").info("queued event", user="alice")
+    stop_logging()
+    event = json.loads(stream.getvalue())
+    assert event["event"] == "queued event"
+    assert event["user"] == "alice"
+    assert event["level"] == "info"
+    assert event["logger"] == "test"
+    assert "timestamp" in event
+    # Stopping hands the original handlers back to the root logger
+    assert not isinstance(logging.getLogger().handlers[0], BoundedQueueHandler)
+
+
+def test_async_logging_keeps_tracebacks(override_config):
+    """Test exceptions logged through the queue are rendered with a traceback."""
+    override_config("features", ENABLE_ASYNC_LOGGING=True)
+    configure_logging()
+    stream = capture_output()
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        structlog.get_logger("test").exception("failed")
+    stop_logging()
+    event = json.loads(stream.getvalue())
+    assert "Traceback" in event["exception"]
+    assert "RuntimeError: boom" in event["exception"]
+
+
+def test_sync_logging_writes_directly(override_config):
+    """Test handlers stay on the root logger when async logging is off."""
+    override_config("features", ENABLE_ASYNC_LOGGING=False)
+    configure_logging()
+    assert get_listener() is None
+    stream = capture_output()
+    logging.getLogger("uvicorn").warning("plain %s", "record")
+    event = json.loads(stream.getvalue())
+    assert event["event"] == "plain record"
+    assert event["level"] == "warning"
+
+
+def test_file_output(override_config, tmp_path):
+    """Test LOG_OUTPUT=file writes rendered records to a rotating file."""
+    path = tmp_path / "logs" / "app.log"
+    override_config("features", ENABLE_ASYNC_LOGGING=False)
+    override_config("logging", LOG_OUTPUT="file")
+    override_config("logging", LOG_FILE_PATH=str(path))
+    override_config("logging", LOG_ROTATION_SIZE="1KB")
+    configure_logging()
+    [handler] = logging.getLogger().handlers
+    assert isinstance(handler, CompressingFileHandler)
+    assert handler.max_bytes == 1024
+
+    structlog.get_logger("test").info("to file")
+    handler.sync()
+    assert json.loads(path.read_text())["event"] == "to file"
+
+
+def test_event_sampler_keeps_one_in_n():
+    """Test sampled events are thinned per event name and warnings are kept."""
+    sampler = EventSampler({"noisy": 10})
+    kept = []
+    for _ in range(100):
+        try:
+            kept.append(sampler(None, "info", {"event": "noisy"}))
+        except structlog.DropEvent:
+            pass
+    assert len(kept) == 10
+    assert kept[0]["sample_rate"] == 10
+    assert sampler(None, "info", {"event": "other"}) == {"event": "other"}
+    assert sampler(None, "warning", {"event": "noisy"}) == {"event": "noisy"}
+
+
+def test_disabled_levels_skip_processors(override_config):
+    """Test calls below a logger's level never reach the processor chain."""
+    override_config("features", ENABLE_ASYNC_LOGGING=False)
+    configure_logging()
+    stream = capture_output()
+    calls = []
+    structlog.get_config()["processors"].insert(
+        0, lambda logger, method, event_dict: calls.append(1) or event_dict
+    )
+    log = structlog.get_logger("test.levels")
+    try:
+        log.debug("hidden")
+        assert calls == []
+
+        set_logger_level("test.levels", "debug")
+        log.debug("shown")
+        assert calls == [1]
+        assert json.loads(stream.getvalue())["event"] == "shown"
+        assert get_logger_levels()["test.levels"] == "DEBUG"
+    finally:
+        logging.getLogger("test.levels").setLevel(logging.NOTSET)
+    with pytest.raises(ValueError):
+        set_logger_level("test.levels", "LOUD")
+
+
+def test_custom_numeric_levels(override_config):
+    """Test a custom level renders as the standard level just below it."""
+    override_config("features", ENABLE_ASYNC_LOGGING=False)
+    configure_logging()
+    stream = capture_output()
+    log = structlog.get_logger("test.custom")
+    try:
+        set_logger_level("test.custom", "info")
+        log.log(5, "hidden")
+        log.log(25, "notice")
+        event = json.loads(stream.getvalue())
+        assert event["event"] == "notice"
+        assert event["level"] == "info"
+
+        logging.getLogger("test.custom").setLevel(30)
+        log.log(25, "filtered")
+        assert stream.getvalue().count("\n") == 1
+    finally:
+        logging.getLogger("test.custom").setLevel(logging.NOTSET)
@@ -1,34 +1,44 @@
 """
 Test cases for the main module.
 """
+import json
 import os
+import uuid
 from datetime import datetime
 
 import pytest
 from fastapi.testclient import TestClient
 
-from src.main import app, startup_event, shutdown_event
-from src.config import Config, config
+from src.config import config
+from src.main import app, shutdown_event, startup_event
+
 
 @pytest.fixture(autouse=True)
 def reset_config():
     """Reset config after each test."""
+    original_env = dict(os.environ)
     yield
+    os.environ.clear()
+    os.environ.update(original_env)
     # Reset environment variables to default values
-    os.environ.update({
-        "APP_NAME": "logging_service",
-        "ENVIRONMENT": "development",
-        "DEBUG": "True",
-        "LOG_LEVEL": "INFO",
-        "LOG_FORMAT": "json",
-        "LOG_OUTPUT": "stdout"
-    })
+    os.environ.update(
+        {
+            "APP_NAME": "logging_service",
+            "ENVIRONMENT": "development",
+            "DEBUG": "True",
+            "LOG_LEVEL": "INFO",
+            "LOG_FORMAT": "json",
+            "LOG_OUTPUT": "stdout",
+        }
+    )
+
 
 @pytest.fixture
 def client():
     """Create a test client for the FastAPI application."""
     return TestClient(app)
 
+
 @pytest.fixture
 def mock_env(monkeypatch):
     """Set up test environment variables."""
@@ -38,15 +48,16 @@ def mock_env(monkeypatch):
         "DEBUG": "True",
         "LOG_LEVEL": "DEBUG",
         "LOG_FORMAT": "json",
-        "LOG_OUTPUT": "stdout"
+        "LOG_OUTPUT": "stdout",
     }
     for key, value in env_vars.items():
         monkeypatch.setenv(key, value)
-    
+
     # Recreate config instance with new environment variables
     config.__init__()
     return env_vars
 
+
 def test_root_endpoint(client, mock_env):
     """Test the root endpoint returns correct service information."""
     response = client.get("/")
@@ -56,6 +67,7 @@ def test_root_endpoint(client, mock_env):
     assert data["environment"] == "testing"
     assert data["status"] == "operational"
 
+
 def test_health_check_endpoint(client):
     """Test the health check endpoint returns correct status."""
     response = client.get("/health")
@@ -66,6 +78,7 @@ def test_health_check_endpoint(client):
     # Verify timestamp is in ISO format
     datetime.fromisoformat(data["timestamp"])
 
+
 def test_config_endpoint_debug_mode(client, mock_env):
     """Test the config endpoint in debug mode."""
     response = client.get("/config")
@@ -75,30 +88,35 @@ def test_config_endpoint_debug_mode(client, mock_env):
     assert data["environment"] == "testing"
     assert data["debug"] is True
 
+
 def test_config_endpoint_production_mode(client):
     """Test the config endpoint is disabled in production mode."""
-    os.environ.update({
-        "ENVIRONMENT": "production",
-        "DEBUG": "False",
-        "SECRET_KEY": "test_production_key",
-        "DB_PASSWORD": "test_db_password",
-        "REDIS_PASSWORD": "test_redis_password",
-        "ALLOWED_HOSTS": "prod1.example.com,prod2.example.com"
-    })
+    os.environ.update(
+        {
+            "ENVIRONMENT": "production",
+            "DEBUG": "False",
+            "SECRET_KEY": "test_production_key",
+            "DB_PASSWORD": "test_db_password",
+            "REDIS_PASSWORD": "test_redis_password",
+            "ALLOWED_HOSTS": "prod1.example.com,prod2.example.com",
+        }
+    )
     # Recreate config instance with new environment
     config.__init__()
-    
+
     response = client.get("/config")
     assert response.status_code == 403
     data = response.json()
     assert "Configuration endpoint only available in debug mode" in data["detail"]
 
+
 def test_metrics_endpoint(client):
     """Test the metrics endpoint is accessible."""
     response = client.get("/metrics")
     assert response.status_code == 200
     assert "text/plain" in response.headers["content-type"]
 
+
 def test_cors_headers(client):
     """Test CORS headers are properly set."""
     response = client.options(
@@ -114,6 +132,7 @@ def test_cors_headers(client):
     assert "access-control-allow-methods" in response.headers
     assert "access-control-allow-headers" in response.headers
 
+
 @pytest.mark.asyncio
 async def test_startup_event():
     """Test the startup event handler."""
@@ -121,6 +140,7 @@ async def test_startup_event():
     await startup_event()
     # No assertion needed as we're just ensuring it runs without errors
 
+
 @pytest.mark.asyncio
 async def test_shutdown_event():
     """Test the shutdown event handler."""
@@ -128,6 +148,7 @@ async def test_shutdown_event():
     await shutdown_event()
     # No assertion needed as we're just ensuring it runs without errors
 
+
 def test_cors_headers_preflight(client):
     """Test CORS preflight request headers."""
     headers = {
@@ -142,6 +163,7 @@ def test_cors_headers_preflight(client):
     assert "Content-Type" in response.headers["access-control-allow-headers"]
     assert "Authorization" in response.headers["access-control-allow-headers"]
 
+
 def test_metrics_endpoint_content(client):
     """Test the metrics endpoint returns proper Prometheus metrics."""
     response = client.get("/metrics")
@@ -151,4 +173,179 @@ def test_metrics_endpoint_content(client):
     assert "# HELP" in content
     assert "# TYPE" in content
     assert "process_" in content  # Common process metrics
-    assert "python_" in content   # Python runtime metrics 
\ No newline at end of file
+    assert "python_" in content  # Python runtime metrics
+
+
+@pytest.fixture
+def batch_enabled(monkeypatch):
+    """Enable batch processing and start from an empty ingestion queue."""
+    from src.ingestion import batch_queue
+
+    monkeypatch.setenv("ENABLE_BATCH_PROCESSING", "true")
+    config.__init__()
+    while batch_queue.qsize():
+        batch_queue.get_nowait()
+    yield batch_queue
+    while batch_queue.qsize():
+        batch_queue.get_nowait()
+    monkeypatch.delenv("ENABLE_BATCH_PROCESSING")
+    config.__init__()
+
+
+def test_batch_endpoint_disabled(client):
+    """Test the batch endpoint is rejected when the feature is off."""
+    response = client.post("/logs/batch", json=[])
+    assert response.status_code == 403
+
+
+def test_batch_endpoint_accepts_json_and_ndjson(client, batch_enabled):
+    """Test the batch endpoint queues JSON array and NDJSON bodies."""
+    record = {
+        "timestamp": "2024-01-01T00:00:00Z",
+        "level": "ERROR",
+        "service": "api",
+        "message": "boom",
+    }
+    response = client.post("/logs/batch", json=[record, record])
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 2}
+
+    ndjson = "\n".join([json.dumps(record)] * 3)
+    response = client.post(
+        "/logs/batch",
+        content=ndjson,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 3}
+    assert batch_enabled.qsize() == 2
+    assert batch_enabled.records == 5
+
+
+def test_batch_endpoint_rejects_invalid(client, batch_enabled):
+    """Test the batch endpoint returns 422 for invalid records."""
+    response = client.post("/logs/batch", json=[{"message": "missing fields"}])
+    assert response.status_code == 422
+    future = {"timestamp": "2999-01-01T00:00:00Z", "service": "api", "message": "x"}
+    response = client.post("/logs/batch", json=[future])
+    assert response.status_code == 422
+    assert batch_enabled.qsize() == 0
+
+
+def test_batch_endpoint_queue_full(client, batch_enabled, monkeypatch):
+    """Test the batch endpoint sheds load when the queue is full."""
+    monkeypatch.setattr(batch_enabled, "maxsize", 0)
+    record = {"timestamp": "2024-01-01T00:00:00Z", "service": "api", "message": "x"}
+    response = client.post("/logs/batch", json=[record])
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_batch_endpoint_rejects_large_bodies(client, batch_enabled, override_config):
+    """Test oversized bodies are refused by length and while streaming."""
+    override_config("performance", MAX_BODY_SIZE="1KB")
+    record = {"timestamp": "2024-01-01T00:00:00Z", "service": "api", "message": "x"}
+    response = client.post("/logs/batch", json=[record] * 50)
+    assert response.status_code == 413
+
+    def chunks():
+        for _ in range(50):
+            yield (json.dumps(record) + "\n").encode()
+
+    response = client.post(
+        "/logs/batch",
+        content=chunks(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 413
+    assert batch_enabled.qsize() == 0
+
+
+def test_batch_endpoint_stream_ingestion(
+    client, batch_enabled, monkeypatch, override_config
+):
+    """Test batches go to the Redis stream instead of the in-process queue."""
+    import redis
+
+    from src.streams import stream_ingestor
+
+    stream = f"test:{uuid.uuid4()}:ingest"
+    override_config("features", ENABLE_STREAM_INGESTION=True)
+    monkeypatch.setattr(stream_ingestor, "stream", stream)
+    record = {"timestamp": "2024-01-01T00:00:00Z", "service": "api", "message": "x"}
+    response = client.post("/logs/batch", json=[record, record])
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 2}
+    assert batch_enabled.qsize() == 0
+
+    sync_client = redis.Redis(
+        host=config.redis.REDIS_HOST, port=config.redis.REDIS_PORT
+    )
+    try:
+        assert sync_client.xlen(stream) == 1
+    finally:
+        sync_client.delete(stream)
+        sync_client.close()
+
+
+def test_search_endpoint_rejects_bad_parameters(client):
+    """Test malformed cursors and oversized pages are rejected up front."""
+    response = client.get("/logs/search", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    response = client.get("/logs/search", params={"limit": 100000})
+    assert response.status_code == 422
+
+
+def test_create_app_builds_independent_apps():
+    """Test each call builds a fresh application with every route."""
+    from src.main import create_app
+
+    first, second = create_app(), create_app()
+    assert first is not second
+    paths = {route.path for route in first.routes}
+    assert {"/health/ready", "/logs/batch", "/admin/config/reload"} <= paths
+
+
+def test_import_is_cheap():
+    """Test importing src.main builds no app or engine and skips heavy imports.
+
+    Tracks the startup benchmark: a regression that pulls a deferred module
+    back into import time fails here rather than only slowing worker spawn.
+    """
+    import subprocess
+    import sys
+
+    from benchmarks.bench_startup import import_profile, is_deferred
+
+    assert not [name for name in import_profile("src.main") if is_deferred(name)]
+    probe = (
+        "import src.main, src.database; "
+        "print(sorted({'app', 'engine', 'AsyncSessionLocal', 'read_replicas'} "
+        "& (vars(src.main).keys() | vars(src.database).keys())))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_lifespan_warms_up_before_serving(monkeypatch):
+    """Test startup warms up before the first request and shutdown drains."""
+    from src import main
+    from src.health import health_prober
+    from src.writer import log_writer
+
+    calls = []
+    warm_up = main.warm_up
+
+    async def recording_warm_up():
+        calls.append("warm_up")
+        return await warm_up()
+
+    monkeypatch.setattr(main, "warm_up", recording_warm_up)
+    with TestClient(main.create_app()) as lifespan_client:
+        assert calls == ["warm_up"]
+        assert lifespan_client.get("/health/ready").status_code == 200
+        assert log_writer.running
+    assert not health_prober.ready
+    assert not log_writer.running
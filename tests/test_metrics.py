@@ -0,0 +1,69 @@
+"""
+Test cases for the metrics module.
+"""
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+from prometheus_client import multiprocess
+
+from src.metrics import metrics_app, multiprocess_enabled
+
+WORKER_SCRIPT = """
+import os
+from src.ingestion import QUEUE_BATCHES, RECORDS_ACCEPTED
+RECORDS_ACCEPTED.inc(3)
+QUEUE_BATCHES.set(2)
+print(os.getpid())
+"""
+
+
+def run_worker(env):
+    """Record metrics in a separate process, as a gunicorn worker would."""
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return int(result.stdout)
+
+
+def scrape():
+    """Fetch the exposition text from the /metrics app."""
+    return TestClient(metrics_app()).get("/").text
+
+
+def sample(text, name):
+    """Return the value of an unlabelled sample in exposition text."""
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[1])
+    return None
+
+
+def test_single_process_uses_default_registry(monkeypatch):
+    """Test the default registry is served without a multiprocess directory."""
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    assert not multiprocess_enabled()
+    assert "python_info" in scrape()
+
+
+def test_multiprocess_metrics_are_aggregated(monkeypatch, tmp_path):
+    """Test counters and live gauges are summed across worker processes."""
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    pids = [run_worker(env), run_worker(env)]
+    assert multiprocess_enabled()
+
+    text = scrape()
+    assert sample(text, "log_records_accepted_total") == 6
+    assert sample(text, "log_ingest_queue_batches") == 4
+
+    # A dead worker's counters are kept but its live gauges are dropped
+    multiprocess.mark_process_dead(pids[0])
+    text = scrape()
+    assert sample(text, "log_records_accepted_total") == 6
+    assert sample(text, "log_ingest_queue_batches") == 2
@@ -1,43 +1,49 @@
 """
 Test cases for the models module.
 """
-from datetime import datetime
+import time
 import uuid
+from datetime import datetime
+
 import pytest
-from sqlalchemy import Column, String, event
-from sqlalchemy.sql import functions
+from pytest_asyncio import fixture
+from sqlalchemy import Column, String, event, func, select, text
+
+from src.config import config
+from src.database import AsyncSessionLocal, init_db
+from src.models import LogEvent
+from src.models.base import Base, chunked
+from src.models.ids import uuid7
 
-from src.models.base import Base
 
 class TestModel(Base):
     """Test model for testing base functionality."""
+
     __tablename__ = "test_models"
     name = Column(String)
 
+
 @pytest.fixture(autouse=True)
 def setup_model_events():
     """Set up model events for testing."""
+
     @event.listens_for(TestModel, "init")
     def init_model(target, args, kwargs):
         target.id = kwargs.get("id", uuid.uuid4())
         target.created_at = kwargs.get("created_at", datetime.utcnow())
         target.updated_at = kwargs.get("updated_at", datetime.utcnow())
-    
+
     yield
-    
+
     # Remove the event listener after the test
     event.remove(TestModel, "init", init_model)
 
+
 def test_model_initialization():
     """Test model initialization with timestamps."""
     now = datetime.utcnow()
     test_id = uuid.uuid4()
-    model = TestModel(
-        id=test_id,
-        name="test",
-        created_at=now,
-        updated_at=now
-    )
+    model = TestModel(id=test_id, name="test", created_at=now, updated_at=now)
     assert model.name == "test"
     assert isinstance(model.created_at, datetime)
     assert isinstance(model.updated_at, datetime)
@@ -46,6 +52,7 @@ def test_model_initialization():
     assert isinstance(model.id, uuid.UUID)
     assert model.id == test_id
 
+
 def test_model_to_dict():
     """Test model serialization to dictionary."""
     test_id = uuid.uuid4()
@@ -56,7 +63,7 @@ def test_model_to_dict():
         created_at=now,
         updated_at=now,
         created_by="user1",
-        updated_by="user1"
+        updated_by="user1",
     )
     data = model.to_dict()
     assert data["id"] == test_id
@@ -66,35 +73,29 @@ def test_model_to_dict():
     assert data["created_by"] == "user1"
     assert data["updated_by"] == "user1"
 
+
 def test_model_update():
     """Test model update method."""
     now = datetime.utcnow()
     test_id = uuid.uuid4()
-    model = TestModel(
-        id=test_id,
-        name="test",
-        created_at=now,
-        updated_at=now
-    )
+    model = TestModel(id=test_id, name="test", created_at=now, updated_at=now)
     original_created_at = model.created_at
-    
+
     # Update with new values
-    model.update(
-        name="updated",
-        created_by="user1",
-        updated_by="user2"
-    )
-    
+    model.update(name="updated", created_by="user1", updated_by="user2")
+
     assert model.name == "updated"
     assert model.id == test_id  # Should not change
     assert model.created_at == original_created_at  # Should not change
     assert model.created_by == "user1"
     assert model.updated_by == "user2"
 
+
 def test_model_tablename():
     """Test automatic table name generation."""
     assert TestModel.__tablename__ == "test_models"
 
+
 def test_model_default_values():
     """Test model default values."""
     model = TestModel(name="test")
@@ -105,4 +106,122 @@ def test_model_default_values():
     assert model.updated_at is not None
     assert isinstance(model.updated_at, datetime)
     assert model.created_by is None
-    assert model.updated_by is None 
\ No newline at end of file
+    assert model.updated_by is None
+
+
+@fixture
+async def db():
+    """Create the model tables and provide a session."""
+    engine = await init_db()
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.rollback()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def test_chunked():
+    """Test sequences are split into bounded consecutive slices."""
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert list(chunked([], 2)) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert(db):
+    """Test rows are inserted across several chunks."""
+    rows = [{"id": uuid.uuid4(), "name": f"row {i}"} for i in range(25)]
+    assert await TestModel.bulk_insert(db, rows, chunk_size=10) == 25
+    result = await db.execute(select(func.count()).select_from(TestModel))
+    assert result.scalar() == 25
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert(db):
+    """Test conflicting rows are updated and audit columns set server-side."""
+    ids = [uuid.uuid4() for _ in range(3)]
+    await TestModel.bulk_insert(
+        db, [{"id": ids[0], "name": "old"}, {"id": ids[1], "name": "same"}]
+    )
+    await db.execute(text("UPDATE test_models SET updated_at = '2000-01-01'"))
+
+    rows = [
+        {"id": ids[0], "name": "new"},
+        {"id": ids[1], "name": "same"},
+        {"id": ids[2], "name": "inserted"},
+    ]
+    assert await TestModel.bulk_upsert(db, rows, updated_by="sync") == 3
+
+    result = await db.execute(
+        select(TestModel.id, TestModel.name, TestModel.updated_at, TestModel.updated_by)
+    )
+    found = {row.id: row for row in result}
+    assert found[ids[0]].name == "new"
+    assert found[ids[0]].updated_by == "sync"
+    assert found[ids[0]].updated_at.year > 2000
+    # Unchanged rows are left untouched
+    assert found[ids[1]].updated_by is None
+    assert found[ids[1]].updated_at.year == 2000
+    assert found[ids[2]].name == "inserted"
+
+    # Key-only rows insert missing keys and never touch existing ones
+    ids.append(uuid.uuid4())
+    key_rows = [{"id": ids[1]}, {"id": ids[3]}]
+    assert await TestModel.bulk_upsert(db, key_rows, updated_by="sync") == 2
+    result = await db.execute(select(TestModel).where(TestModel.id.in_(ids[1::2])))
+    found = {row.id: row for row in result.scalars()}
+    assert found[ids[1]].updated_by is None
+    assert found[ids[1]].updated_at.year == 2000
+    assert found[ids[3]].name is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_update(db):
+    """Test rows are updated by primary key, grouped by the columns they set."""
+    ids = [uuid.uuid4() for _ in range(5)]
+    await TestModel.bulk_insert(db, [{"id": id_, "name": "before"} for id_ in ids])
+    await db.execute(text("UPDATE test_models SET updated_at = '2000-01-01'"))
+
+    rows = [
+        {"id": ids[0], "name": "after"},
+        {"id": ids[1], "name": "after"},
+        {"id": ids[2], "created_by": "importer"},
+        {"id": ids[3], "name": "before"},
+        {"id": ids[4]},
+    ]
+    assert await TestModel.bulk_update(db, rows, chunk_size=1) == 4
+
+    result = await db.execute(select(TestModel))
+    found = {row.id: row for row in result.scalars()}
+    assert [found[id_].name for id_ in ids[:3]] == ["after", "after", "before"]
+    assert found[ids[2]].created_by == "importer"
+    # Without an explicit actor the database role is recorded
+    assert found[ids[0]].updated_by == config.database.DB_USER
+    assert found[ids[0]].updated_at.year > 2000
+    # Unchanged and key-only rows are left untouched
+    for id_ in ids[3:]:
+        assert found[id_].updated_by is None
+        assert found[id_].updated_at.year == 2000
+
+    with pytest.raises(KeyError):
+        await TestModel.bulk_update(db, [{"name": "no key"}])
+
+
+def test_uuid7_is_versioned_and_time_ordered():
+    """Test UUIDv7 values carry version 7 and sort in creation order."""
+    ids = [uuid7() for _ in range(1000)]
+    assert {value.version for value in ids} == {7}
+    assert {value.variant for value in ids} == {uuid.RFC_4122}
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    # The leading 48 bits are the Unix time in milliseconds
+    now_ms = time.time_ns() // 1_000_000
+    assert abs((ids[-1].int >> 80) - now_ms) < 1000
+
+
+def test_id_generator_is_opt_in():
+    """Test models default to UUIDv4 and LogEvent opts in to UUIDv7."""
+    assert TestModel.__id_generator__ is uuid.uuid4
+    assert LogEvent.__id_generator__ is uuid7
+    assert TestModel.__table__.c.id.default.arg.__wrapped__ is uuid.uuid4
+    assert LogEvent.__table__.c.id.default.arg.__wrapped__ is uuid7
@@ -0,0 +1,95 @@
+"""
+Test cases for the partitions module.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from pytest_asyncio import fixture
+from sqlalchemy import func, select
+
+from src.database import AsyncSessionLocal, init_db
+from src.models import Base, LogEvent
+from src.partitions import PartitionManager, log_partitions
+from src.schemas import LogRecord
+from src.writer import write_log_records
+
+
+@fixture(scope="function")
+async def partitioned():
+    """Create the log tables and yield a fresh partition manager."""
+    engine = await init_db()
+    manager = PartitionManager(LogEvent.__table__)
+    log_partitions.reset()
+    yield manager
+    log_partitions.reset()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def test_partition_naming():
+    """Test partition names round-trip to the covered day."""
+    manager = PartitionManager(LogEvent.__table__)
+    name = manager.partition_name(date(2024, 3, 9))
+    assert name == "log_events_p20240309"
+    assert manager.partition_day(name) == date(2024, 3, 9)
+    assert manager.partition_day("log_events_default") is None
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_is_idempotent(partitioned):
+    """Test that partitions are created once and then served from cache."""
+    days = [date(2024, 1, 1), date(2024, 1, 2)]
+    created = await partitioned.ensure_partitions(days)
+    assert created == ["log_events_p20240101", "log_events_p20240102"]
+    assert await partitioned.ensure_partitions(days) == []
+
+    # A second manager sees the existing partitions in the catalog
+    other = PartitionManager(LogEvent.__table__)
+    assert await other.ensure_partitions(days) == []
+
+
+@pytest.mark.asyncio
+async def test_drop_expired_partitions(partitioned):
+    """Test that only partitions fully outside retention are dropped."""
+    today = date(2024, 1, 31)
+    await partitioned.ensure_partitions(today - timedelta(days=n) for n in range(5))
+    dropped = await partitioned.drop_expired(retention_days=2, today=today)
+    assert dropped == ["log_events_p20240127", "log_events_p20240128"]
+
+    async with AsyncSessionLocal() as session:
+        conn = await session.connection()
+        remaining = await partitioned.list_partitions(conn)
+    assert remaining == [
+        "log_events_p20240129",
+        "log_events_p20240130",
+        "log_events_p20240131",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_write_creates_partitions_and_skips_expired(partitioned):
+    """Test the writer creates partitions on demand and drops rows outside them."""
+    now = datetime.now(timezone.utc)
+    records = [
+        LogRecord(timestamp=now, service="api", message="fresh"),
+        LogRecord(timestamp=now - timedelta(days=1), service="api", message="older"),
+        LogRecord(timestamp=now - timedelta(days=400), service="api", message="stale"),
+        # Queued before the window shrank: validation no longer accepts it
+        LogRecord.model_construct(
+            timestamp=now + timedelta(days=400),
+            level="INFO",
+            service="api",
+            message="future",
+            attributes={},
+        ),
+    ]
+    assert await write_log_records(records) == 2
+    future = log_partitions.partition_name((now + timedelta(days=400)).date())
+    async with AsyncSessionLocal() as session:
+        conn = await session.connection()
+        assert future not in await log_partitions.list_partitions(conn)
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(func.count()).select_from(LogEvent))
+        assert result.scalar() == 2
@@ -0,0 +1,175 @@
+"""
+Test cases for the rate limiting module.
+"""
+import hashlib
+import uuid
+
+import pytest
+import redis.asyncio as redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pytest_asyncio import fixture
+
+from src import rate_limit
+from src.config import config
+from src.rate_limit import (
+    GCRA_SCRIPT,
+    RateLimiter,
+    RateLimitMiddleware,
+    client_identity,
+)
+
+
+class CountingClient:
+    """Wrap a Redis client and count script invocations."""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = 0
+
+    def register_script(self, source):
+        script = self.client.register_script(source)
+
+        async def run(**kwargs):
+            self.calls += 1
+            return await script(**kwargs)
+
+        return run
+
+
+@pytest.fixture
+def rate(monkeypatch):
+    """Set the rate limit for a test and return a unique client identity."""
+
+    def apply(value, prefetch=10):
+        monkeypatch.setenv("RATE_LIMIT_DEFAULT", value)
+        monkeypatch.setenv("RATE_LIMIT_PREFETCH", str(prefetch))
+        config.__init__()
+        return f"test:{uuid.uuid4()}"
+
+    yield apply
+    monkeypatch.undo()
+    config.__init__()
+
+
+@fixture
+async def counting_client():
+    """Provide a counting Redis client from RedisConfig."""
+    client = redis.Redis(
+        host=config.redis.REDIS_HOST,
+        port=config.redis.REDIS_PORT,
+        db=config.redis.REDIS_DB,
+        password=config.redis.REDIS_PASSWORD or None,
+    )
+    yield CountingClient(client)
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_limiter_enforces_limit(rate, counting_client):
+    """Test that requests beyond the limit are rejected with a retry delay."""
+    identity = rate("5/minute")
+    limiter = RateLimiter(lambda: counting_client)
+    results = [await limiter.acquire(identity) for _ in range(6)]
+    assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+    assert 0 < results[-1][1] <= 12
+
+
+@pytest.mark.asyncio
+async def test_limiter_prefetches_tokens(rate, counting_client):
+    """Test that reserved tokens are served without a Redis round trip."""
+    identity = rate("1000/minute", prefetch=10)
+    limiter = RateLimiter(lambda: counting_client)
+    for _ in range(30):
+        assert (await limiter.acquire(identity))[0]
+    assert counting_client.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_limiter_shared_across_workers(rate, counting_client):
+    """Test that separate limiter instances share one budget."""
+    identity = rate("10/minute")
+    workers = [RateLimiter(lambda: counting_client) for _ in range(2)]
+    allowed = [(await workers[i % 2].acquire(identity))[0] for i in range(12)]
+    assert allowed.count(True) == 10
+
+
+@pytest.mark.asyncio
+async def test_prime_loads_script(counting_client):
+    """Test priming loads the GCRA script before the first request."""
+    client = counting_client.client
+    await client.script_flush()
+    sha = hashlib.sha1(GCRA_SCRIPT.encode()).hexdigest()
+    await RateLimiter(lambda: client).prime()
+    assert await client.script_exists(sha) == [True]
+
+
+@pytest.mark.asyncio
+async def test_limiter_fails_open():
+    """Test that an unreachable Redis does not block requests."""
+
+    class BrokenClient:
+        def register_script(self, source):
+            async def run(**kwargs):
+                raise ConnectionError("redis down")
+
+            return run
+
+    limiter = RateLimiter(BrokenClient)
+    assert await limiter.acquire("ip:1.2.3.4") == (True, 0.0)
+
+
+def test_client_identity(override_config):
+    """Test identities prefer known API keys, then a trusted proxy's X-Real-IP."""
+    override_config("security", API_KEYS=["secret"], TRUSTED_PROXIES=["10.0.0.0/8"])
+    scope = {"headers": [(b"x-api-key", b"secret")], "client": ("10.0.0.1", 1)}
+    assert client_identity(scope).startswith("key:")
+    assert "secret" not in client_identity(scope)
+    scope = {"headers": [(b"x-real-ip", b"1.2.3.4")], "client": ("10.0.0.1", 1)}
+    assert client_identity(scope) == "ip:1.2.3.4"
+    assert client_identity({"headers": [], "client": ("10.0.0.1", 1)}) == "ip:10.0.0.1"
+
+
+def test_client_identity_ignores_unknown_keys_and_spoofed_headers(override_config):
+    """Test random API keys and X-Real-IP from untrusted peers are not trusted."""
+    override_config("security", API_KEYS=["secret"], TRUSTED_PROXIES=["10.0.0.1"])
+    headers = [(b"x-api-key", b"random"), (b"x-real-ip", b"1.2.3.4")]
+    scope = {"headers": headers, "client": ("203.0.113.9", 1)}
+    assert client_identity(scope) == "ip:203.0.113.9"
+
+
+def test_reservations_are_bounded(monkeypatch):
+    """Test local reservations evict the least recently used client."""
+    monkeypatch.setattr(rate_limit, "MAX_LOCAL_KEYS", 3)
+    limiter = RateLimiter()
+    for key in "abc":
+        limiter._remember(key, 5, float("inf"))
+    limiter._reservations.move_to_end("a")
+    limiter._remember("d", 5, float("inf"))
+    assert list(limiter._reservations) == ["c", "a", "d"]
+
+
+def test_middleware_returns_429(override_config):
+    """Test the middleware rejects limited requests and skips exempt paths."""
+
+    class DenyingLimiter:
+        async def acquire(self, identity):
+            return False, 2.5
+
+    override_config("rate_limit", RATE_LIMIT_ENABLED=True)
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiter=DenyingLimiter())
+
+    @app.get("/")
+    async def index():
+        return {}
+
+    @app.get("/health")
+    async def health():
+        return {}
+
+    client = TestClient(app)
+    response = client.get("/")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,275 @@
+"""
+Test cases for the reload module.
+"""
+import asyncio
+import logging
+import os
+import signal
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from pytest_asyncio import fixture
+
+from src import cache
+from src.config import config
+from src.ingestion import batch_queue
+from src.main import app
+from src.reload import (
+    CHANNEL,
+    CONFIG_RELOADS,
+    ConfigReloader,
+    config_reloader,
+    load_config,
+    sign,
+    verify,
+)
+from src.serialization import dumps
+from src.writer import log_writer
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Restore the environment and every reloaded setting after a test."""
+    environ = dict(os.environ)
+    yield
+    os.environ.clear()
+    os.environ.update(environ)
+    config.__init__()
+    config_reloader.overrides.clear()
+    batch_queue.maxsize = config.performance.MAX_QUEUE_SIZE
+    log_writer.batch_size = config.performance.WRITER_BATCH_SIZE
+
+
+@fixture
+async def redis_client():
+    """Provide the shared Redis client and close the pool afterwards."""
+    client = await cache.init_redis()
+    yield client
+    await cache.close_redis()
+
+
+async def wait_for(condition, timeout=2.0):
+    """Poll until a condition holds or the timeout passes."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_config_and_notifies_subscribers():
+    """Test only subscribers of changed settings run, after the swap."""
+    reloader = ConfigReloader()
+    seen = []
+
+    @reloader.on_change("MAX_QUEUE_SIZE")
+    def queue_changed(new):
+        seen.append(new.performance.MAX_QUEUE_SIZE)
+
+    @reloader.on_change("LOG_FORMAT")
+    async def format_changed(new):
+        seen.append(new.logging.LOG_FORMAT)
+
+    os.environ["MAX_QUEUE_SIZE"] = "42"
+    result = await reloader.reload(publish=False)
+    assert result == {"changed": ["MAX_QUEUE_SIZE"], "restart_required": []}
+    assert seen == [42]
+    assert config.performance.MAX_QUEUE_SIZE == 42
+
+
+@pytest.mark.asyncio
+async def test_invalid_reload_changes_nothing():
+    """Test a rejected reload leaves the config and environment alone."""
+    reloader = ConfigReloader()
+    with pytest.raises(AssertionError, match="Invalid LOG_FORMAT"):
+        await reloader.reload({"LOG_FORMAT": "xml", "MAX_QUEUE_SIZE": "7"})
+    assert config.logging.LOG_FORMAT == "json"
+    assert "MAX_QUEUE_SIZE" not in os.environ
+    assert reloader.overrides == {}
+
+
+def test_settings_removed_from_env_file_are_unset(tmp_path, monkeypatch):
+    """Test a reload matches a fresh start after a .env line is deleted."""
+    env_file = tmp_path / ".env"
+    monkeypatch.setattr("src.reload.ENV_FILE", str(env_file))
+    env_file.write_text("EXPORT_FETCH_SIZE=250\n")
+    assert load_config({}).performance.EXPORT_FETCH_SIZE == 250
+
+    env_file.write_text("")
+    assert load_config({}).performance.EXPORT_FETCH_SIZE == 1000
+    assert "EXPORT_FETCH_SIZE" not in os.environ
+
+
+@pytest.mark.asyncio
+async def test_startup_only_settings_are_reported():
+    """Test settings needing a worker restart are listed separately."""
+    result = await ConfigReloader().reload({"DB_POOL_SIZE": "7"}, publish=False)
+    assert result == {"changed": ["DB_POOL_SIZE"], "restart_required": ["DB_POOL_SIZE"]}
+
+
+@pytest.mark.asyncio
+async def test_components_follow_reload():
+    """Test the queue bound and writer triggers change without a restart."""
+    await config_reloader.reload(
+        {"MAX_QUEUE_SIZE": "3", "WRITER_BATCH_SIZE": "10"}, publish=False
+    )
+    assert batch_queue.maxsize == 3
+    assert log_writer.batch_size == 10
+
+    # Overrides survive a later reload of the environment
+    await config_reloader.reload(publish=False)
+    assert batch_queue.maxsize == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reloads_are_serialized():
+    """Test a reload waits for the subscribers of the one in progress."""
+    reloader = ConfigReloader()
+    events = []
+
+    @reloader.on_change("MAX_QUEUE_SIZE")
+    async def queue_changed(new):
+        events.append(("start", new.performance.MAX_QUEUE_SIZE))
+        await asyncio.sleep(0.05)
+        events.append(("end", new.performance.MAX_QUEUE_SIZE))
+
+    await asyncio.gather(
+        reloader.reload({"MAX_QUEUE_SIZE": "21"}, publish=False),
+        reloader.reload({"MAX_QUEUE_SIZE": "22"}, publish=False),
+    )
+    assert events == [("start", 21), ("end", 21), ("start", 22), ("end", 22)]
+    assert config.performance.MAX_QUEUE_SIZE == 22
+
+
+def test_verify_rejects_unsigned_and_stale_messages(monkeypatch):
+    """Test only fresh messages signed with SECRET_KEY are accepted."""
+    monkeypatch.setenv("SECRET_KEY", TOKEN)
+    config.__init__()
+    message = {"origin": "x", "overrides": {"MAX_QUEUE_SIZE": "1"}}
+    assert verify(dumps(message)) is None
+    assert verify(b"0" * 64 + b"." + dumps(message)) is None
+    assert verify(sign(dumps({**message, "sent_at": 0}))) is None
+
+    signed = sign(dumps({**message, "sent_at": time.time()}))
+    assert verify(signed)["overrides"] == {"MAX_QUEUE_SIZE": "1"}
+
+    monkeypatch.setenv("SECRET_KEY", "another-key")
+    config.__init__()
+    assert verify(signed) is None
+
+
+async def wait_subscribed(redis_client):
+    """Wait until a reloader has subscribed to the reload channel."""
+    for _ in range(200):
+        if dict(await redis_client.pubsub_numsub(CHANNEL))[CHANNEL.encode()]:
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_reload_propagates_to_other_workers(redis_client, monkeypatch):
+    """Test a published reload is applied by another worker's reloader."""
+    monkeypatch.setenv("SECRET_KEY", TOKEN)
+    config.__init__()
+    sender, receiver = ConfigReloader(), ConfigReloader()
+    receiver.origin = "other-worker"
+    await receiver.start()
+    try:
+        await wait_subscribed(redis_client)
+        await sender.reload({"MAX_QUEUE_SIZE": "11"})
+        # Both share this process, so the receiver only records the override
+        await wait_for(lambda: receiver.overrides == {"MAX_QUEUE_SIZE": "11"})
+    finally:
+        await receiver.stop()
+
+
+@pytest.mark.asyncio
+async def test_log_levels_propagate_to_other_workers(redis_client, monkeypatch):
+    """Test a published logger level is set by another worker's reloader."""
+    monkeypatch.setenv("SECRET_KEY", TOKEN)
+    config.__init__()
+    receiver = ConfigReloader()
+    receiver.origin = "other-worker"
+    await receiver.start()
+    target = logging.getLogger("test.propagated")
+    try:
+        await wait_subscribed(redis_client)
+        await ConfigReloader().publish({}, log_levels={"test.propagated": "ERROR"})
+        await wait_for(lambda: target.level == logging.ERROR)
+        assert receiver.overrides == {}
+    finally:
+        await receiver.stop()
+        target.setLevel(logging.NOTSET)
+
+
+@pytest.mark.asyncio
+async def test_unsigned_reload_is_ignored(redis_client, monkeypatch):
+    """Test a message without a valid signature changes nothing."""
+    monkeypatch.setenv("SECRET_KEY", TOKEN)
+    config.__init__()
+    receiver = ConfigReloader()
+    receiver.origin = "other-worker"
+    await receiver.start()
+    rejected = CONFIG_RELOADS.labels(source="remote", result="rejected")
+    before = rejected._value.get()
+    try:
+        await wait_subscribed(redis_client)
+        forged = {"origin": "attacker", "overrides": {"MAX_QUEUE_SIZE": "1"}}
+        await redis_client.publish(CHANNEL, dumps(forged))
+        await redis_client.publish(CHANNEL, sign(dumps({**forged, "sent_at": 0})))
+        await wait_for(lambda: rejected._value.get() == before + 2)
+    finally:
+        await receiver.stop()
+    assert receiver.overrides == {}
+    assert config.performance.MAX_QUEUE_SIZE != 1
+
+
+@pytest.mark.asyncio
+async def test_sighup_reloads(redis_client):
+    """Test SIGHUP re-reads the environment."""
+    reloader = ConfigReloader()
+    seen = []
+    reloader.on_change("MAX_QUEUE_SIZE")(seen.append)
+    await reloader.start()
+    try:
+        os.environ["MAX_QUEUE_SIZE"] = "13"
+        os.kill(os.getpid(), signal.SIGHUP)
+        await wait_for(lambda: seen)
+        assert config.performance.MAX_QUEUE_SIZE == 13
+    finally:
+        await reloader.stop()
+
+
+def test_admin_reload_endpoint(monkeypatch):
+    """Test the admin endpoint reloads, validating names and values."""
+    monkeypatch.setenv("SECRET_KEY", TOKEN)
+    config.__init__()
+    client = TestClient(app)
+    headers = {"X-Admin-Token": TOKEN}
+
+    response = client.post(
+        "/admin/config/reload",
+        json={"overrides": {"MAX_QUEUE_SIZE": "5"}},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"changed": ["MAX_QUEUE_SIZE"], "restart_required": []}
+    assert batch_queue.maxsize == 5
+
+    response = client.post(
+        "/admin/config/reload", json={"overrides": {"NOPE": "1"}}, headers=headers
+    )
+    assert response.status_code == 422
+
+    response = client.post(
+        "/admin/config/reload",
+        json={"overrides": {"LOG_OUTPUT": "tape"}},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid LOG_OUTPUT"
+
+    assert client.post("/admin/config/reload").status_code == 401
@@ -0,0 +1,225 @@
+"""
+Test cases for the search module.
+"""
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from pytest_asyncio import fixture
+from sqlalchemy import func, select, text
+
+from src.database import AsyncSessionLocal, copy_records, init_db
+from src.main import app
+from src.models import Base, LogEvent
+from src.models.ids import uuid7
+from src.partitions import log_partitions
+from src.search import (
+    InvalidCursorError,
+    SearchFilters,
+    build_search_query,
+    decode_cursor,
+    encode_cursor,
+    escape_like,
+    search_logs,
+)
+from src.writer import COPY_COLUMNS
+
+EVENT_COUNT = 250
+
+
+@fixture(scope="function")
+async def events():
+    """Create the log tables and load events spread over two days."""
+    engine = await init_db()
+    log_partitions.reset()
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    rows = [
+        (
+            uuid7(),
+            # Three events per second so keyset ties are broken by id
+            now - timedelta(seconds=i // 3) - timedelta(days=i % 2),
+            "ERROR" if i % 5 == 0 else "INFO",
+            "api" if i % 2 == 0 else "worker",
+            f"request {i:04d} handled_ok",
+            json.dumps({"i": i}),
+        )
+        for i in range(EVENT_COUNT)
+    ]
+    await log_partitions.ensure_partitions({row[1].date() for row in rows})
+    await copy_records(LogEvent.__table__, COPY_COLUMNS, rows)
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE logging.log_events"))
+    yield rows
+    log_partitions.reset()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def explain(session, stmt):
+    """Return the plan PostgreSQL picks for a statement, with seq scans off.
+
+    Test tables are tiny, so sequential scans are disabled to check whether
+    an index is usable rather than whether it is cheaper on 250 rows.
+    """
+    conn = await session.connection()
+    await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    compiled = stmt.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await conn.exec_driver_sql("EXPLAIN " + str(compiled), params)
+    return "\n".join(line for line, in result)
+
+
+def test_cursor_round_trip():
+    """Test cursors decode to the position they were built from."""
+    timestamp = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+    event_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(timestamp, event_id)) == (timestamp, event_id)
+
+
+@pytest.mark.parametrize("token", ["", "not-a-cursor", "bm8gc2VwYXJhdG9y"])
+def test_decode_cursor_rejects_garbage(token):
+    """Test malformed cursors raise InvalidCursorError."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token)
+
+
+def test_escape_like():
+    """Test LIKE wildcards in search terms are matched literally."""
+    assert escape_like("100%_done\\") == "100\\%\\_done\\\\"
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_visits_every_row_once(events):
+    """Test paging through all results returns each event exactly once."""
+    seen, after = [], None
+    async with AsyncSessionLocal() as session:
+        while True:
+            page = await search_logs(session, SearchFilters(), limit=40, after=after)
+            seen.extend(page["items"])
+            if page["next_cursor"] is None:
+                break
+            after = decode_cursor(page["next_cursor"])
+
+    assert len(seen) == EVENT_COUNT
+    assert len({item["id"] for item in seen}) == EVENT_COUNT
+    keys = [(item["timestamp"], item["id"]) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_search_filters(events):
+    """Test substring, regex, level, service and time filters."""
+    async with AsyncSessionLocal() as session:
+        page = await search_logs(session, SearchFilters(query="0042"))
+        assert [item["message"] for item in page["items"]] == [
+            "request 0042 handled_ok"
+        ]
+
+        # LIKE wildcards are literal: "_" must not match any character
+        page = await search_logs(session, SearchFilters(query="handled_o"))
+        assert len(page["items"]) == 100
+        page = await search_logs(session, SearchFilters(query="handled%ok"))
+        assert page["items"] == []
+
+        page = await search_logs(
+            session, SearchFilters(query=r"^request 00[0-4]0 ", regex=True)
+        )
+        assert len(page["items"]) == 5
+
+        filters = SearchFilters(levels=["error"], service="api")
+        page = await search_logs(session, filters, limit=EVENT_COUNT)
+        assert len(page["items"]) == 25
+        assert {item["level"] for item in page["items"]} == {"ERROR"}
+
+        cutoff = events[0][1] - timedelta(hours=1)
+        page = await search_logs(
+            session, SearchFilters(start=cutoff), limit=EVENT_COUNT
+        )
+        assert len(page["items"]) == EVENT_COUNT // 2
+
+
+@pytest.mark.asyncio
+async def test_keyset_query_uses_index_and_prunes_partitions(events):
+    """Test seeking past a cursor is an index scan on older partitions only."""
+    today = events[0][1]
+    after = (today - timedelta(days=1), uuid.uuid4())
+    async with AsyncSessionLocal() as session:
+        plan = await explain(session, build_search_query(SearchFilters(), 100, after))
+
+    assert "Seq Scan" not in plan
+    assert "Sort" not in plan.replace("Sort Key", "")
+    assert "timestamp_id_idx" in plan
+    assert log_partitions.partition_name(today.date()) not in plan
+
+
+@pytest.mark.asyncio
+async def test_service_filter_uses_index(events):
+    """Test service filters seek on (service, timestamp, id)."""
+    filters = SearchFilters(service="api")
+    async with AsyncSessionLocal() as session:
+        plan = await explain(session, build_search_query(filters, 100))
+
+    assert "Seq Scan" not in plan
+    assert "service_timestamp_id_idx" in plan
+
+
+@pytest.mark.asyncio
+async def test_message_search_uses_trigram_index(events):
+    """Test substring and regex search use the trigram GIN index."""
+    async with AsyncSessionLocal() as session:
+        available = await session.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        )
+        if available.scalar() is None:
+            pytest.skip("pg_trgm is not installed on this server")
+        await session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        with open("init-scripts/05-log-search.sql") as script:
+            for statement in script.read().split(";"):
+                if statement.strip():
+                    await session.execute(text(statement))
+
+        for filters in (
+            SearchFilters(query="0042"),
+            SearchFilters(query="request 00[0-4]2", regex=True),
+        ):
+            plan = await explain(session, build_search_query(filters, 100))
+            assert "Seq Scan" not in plan
+            assert "message_idx" in plan or "message_trgm" in plan
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint(events):
+    """Test the endpoint serializes a page and follows its cursor."""
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/logs/search", params={"limit": 200})
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) == 200
+        uuid.UUID(page["items"][0]["id"])
+
+        response = await client.get(
+            "/logs/search", params={"limit": 200, "cursor": page["next_cursor"]}
+        )
+        assert len(response.json()["items"]) == EVENT_COUNT - 200
+        assert response.json()["next_cursor"] is None
+
+        response = await client.get("/logs/search", params={"q": "(", "regex": True})
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_times_out(events, override_config, monkeypatch):
+    """Test slow searches are cancelled by the statement timeout."""
+    override_config("performance", SEARCH_TIMEOUT_MS=50)
+    monkeypatch.setattr(
+        "src.search.build_search_query", lambda *args: select(func.pg_sleep(1))
+    )
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/logs/search", params={"q": "x", "regex": True})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
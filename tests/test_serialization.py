@@ -0,0 +1,81 @@
+"""
+Test cases for the serialization module.
+"""
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from asyncpg.pgproto import pgproto
+
+from src.models import LogEvent
+from src.serialization import (
+    ORJSONResponse,
+    dumps,
+    model_serializer,
+    rows_to_dicts,
+    serialize_models,
+)
+
+
+def make_event(i=0):
+    """Build a transient log event with every column set."""
+    now = datetime(2024, 1, 1, 12, 0, i, tzinfo=timezone.utc)
+    return LogEvent(
+        id=uuid.uuid4(),
+        timestamp=now,
+        level="INFO",
+        service="api",
+        message=f"event {i}",
+        attributes={"i": i},
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_model_serializer_is_cached_per_class():
+    """Test the serializer is built once per mapped class."""
+    assert model_serializer(LogEvent) is model_serializer(LogEvent)
+
+
+def test_model_serializer_matches_column_walk():
+    """Test the cached serializer produces the same dictionary as a column walk."""
+    event = make_event()
+    expected = {
+        column.name: getattr(event, column.name)
+        for column in LogEvent.__table__.columns
+    }
+    assert model_serializer(LogEvent)(event) == expected
+    assert event.to_dict() == expected
+    assert serialize_models([event, make_event(1)])[1]["message"] == "event 1"
+    assert serialize_models([]) == []
+
+
+def test_rows_to_dicts():
+    """Test Core row tuples are zipped with their column names."""
+    rows = [(1, "a"), (2, "b")]
+    assert rows_to_dicts(["n", "s"], rows) == [{"n": 1, "s": "a"}, {"n": 2, "s": "b"}]
+
+
+def test_dumps_encodes_uuid_and_datetime():
+    """Test UUIDs, including asyncpg's subclass, and datetimes encode natively."""
+    event_id = uuid.uuid4()
+    content = {
+        "id": event_id,
+        "pg_id": pgproto.UUID(str(event_id)),
+        "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+    assert json.loads(dumps(content)) == {
+        "id": str(event_id),
+        "pg_id": str(event_id),
+        "timestamp": "2024-01-01T00:00:00+00:00",
+    }
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_orjson_response():
+    """Test the response class renders with orjson."""
+    response = ORJSONResponse({"id": uuid.UUID(int=1)})
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"id": str(uuid.UUID(int=1))}
@@ -0,0 +1,217 @@
+"""
+Test cases for the streams module.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from pytest_asyncio import fixture
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src import cache
+from src.schemas import LogRecord
+from src.streams import StreamFullError, StreamIngestor
+
+
+def make_batch(count):
+    """Build validated records for tests."""
+    now = datetime.now(timezone.utc)
+    return [
+        LogRecord(timestamp=now, service="api", message=f"event {i}")
+        for i in range(count)
+    ]
+
+
+class RecordingSink:
+    """Sink that records every written batch and rejects "poison" records."""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        if any(record.message == "poison" for record in records):
+            raise ValueError("invalid byte sequence")
+        self.batches.append(list(records))
+        return len(records)
+
+
+@fixture
+async def redis_client():
+    """Provide the shared client and close the pool afterwards."""
+    client = await cache.init_redis()
+    yield client
+    await cache.close_redis()
+
+
+@fixture
+async def ingestor(redis_client):
+    """Provide an ingestor on a unique stream and delete it afterwards."""
+    stream = f"test:{uuid.uuid4()}:ingest"
+    ingestor = StreamIngestor(stream=stream, sink=RecordingSink())
+    await ingestor.ensure_group()
+    yield ingestor
+    await ingestor.stop()
+    await redis_client.delete(stream, ingestor.dead_letter_stream)
+
+
+@pytest.mark.asyncio
+async def test_append_and_consume(ingestor, redis_client):
+    """Test appended batches are written, acknowledged and deleted."""
+    await ingestor.append(make_batch(3))
+    await ingestor.append(make_batch(2))
+    await ingestor.start(consumers=2)
+    for _ in range(100):
+        if sum(len(batch) for batch in ingestor.sink.batches) == 5:
+            break
+        await asyncio.sleep(0.01)
+    await ingestor.stop()
+
+    assert sum(len(batch) for batch in ingestor.sink.batches) == 5
+    assert ingestor.sink.batches[0][0].service == "api"
+    assert await redis_client.xlen(ingestor.stream) == 0
+    pending = await redis_client.xpending(ingestor.stream, ingestor.group)
+    assert pending["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_consumers_create_group_once_redis_is_back(redis_client, monkeypatch):
+    """Test starting without Redis succeeds and consuming resumes later."""
+    ingestor = StreamIngestor(
+        stream=f"test:{uuid.uuid4()}:ingest", sink=RecordingSink()
+    )
+    create = redis_client.xgroup_create
+    outages = [RedisConnectionError("Redis unavailable")]
+
+    async def xgroup_create(*args, **kwargs):
+        if outages:
+            raise outages.pop()
+        return await create(*args, **kwargs)
+
+    monkeypatch.setattr(redis_client, "xgroup_create", xgroup_create)
+    try:
+        await ingestor.start(consumers=1)
+        await ingestor.append(make_batch(2))
+        for _ in range(300):
+            if ingestor.sink.batches:
+                break
+            await asyncio.sleep(0.01)
+        assert sum(len(batch) for batch in ingestor.sink.batches) == 2
+    finally:
+        await ingestor.stop()
+        await redis_client.delete(ingestor.stream)
+
+
+@pytest.mark.asyncio
+async def test_append_rejects_when_full(ingestor, override_config):
+    """Test the stream refuses entries beyond STREAM_MAX_LENGTH."""
+    override_config("performance", STREAM_MAX_LENGTH=2)
+    await ingestor.append(make_batch(1))
+    await ingestor.append(make_batch(1))
+    with pytest.raises(StreamFullError):
+        await ingestor.append(make_batch(1))
+
+
+@pytest.mark.asyncio
+async def test_failed_write_stays_pending(ingestor, redis_client):
+    """Test entries are not acknowledged when the sink fails."""
+    ingestor.sink.failures = 1
+    await ingestor.append(make_batch(2))
+    response = await redis_client.xreadgroup(
+        ingestor.group, "worker-a", {ingestor.stream: ">"}
+    )
+    with pytest.raises(ConnectionError):
+        await ingestor.process("worker-a", response[0][1])
+
+    pending = await redis_client.xpending(ingestor.stream, ingestor.group)
+    assert pending["pending"] == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_idle_recovers_dead_consumer(ingestor, redis_client):
+    """Test entries read by a consumer that never acked are reclaimed."""
+    await ingestor.append(make_batch(4))
+    # A consumer reads the entry and dies before writing it
+    await redis_client.xreadgroup(ingestor.group, "dead", {ingestor.stream: ">"})
+
+    assert await ingestor.claim_idle("survivor", min_idle_ms=60000) == 0
+    await asyncio.sleep(0.02)
+    assert await ingestor.claim_idle("survivor", min_idle_ms=10) == 1
+
+    assert [len(batch) for batch in ingestor.sink.batches] == [4]
+    pending = await redis_client.xpending(ingestor.stream, ingestor.group)
+    assert pending["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_undecodable_entry_is_discarded(ingestor, redis_client):
+    """Test a malformed entry is acknowledged instead of retried forever."""
+    await redis_client.xadd(ingestor.stream, {"records": b"not json"})
+    response = await redis_client.xreadgroup(
+        ingestor.group, "worker-a", {ingestor.stream: ">"}
+    )
+    assert await ingestor.process("worker-a", response[0][1]) == 0
+    assert ingestor.sink.batches == []
+    assert await redis_client.xlen(ingestor.stream) == 0
+
+
+def poison_batch():
+    """Build a batch the sink always rejects."""
+    batch = make_batch(1)
+    batch[0].message = "poison"
+    return batch
+
+
+@pytest.mark.asyncio
+async def test_append_uses_registered_script(ingestor, redis_client):
+    """Test appends run the cached script by SHA instead of sending its body."""
+    await ingestor.append(make_batch(1))
+    await ingestor.append(make_batch(1))
+    assert await redis_client.script_exists(ingestor._script.sha) == [True]
+    assert await redis_client.xlen(ingestor.stream) == 2
+
+
+@pytest.mark.asyncio
+async def test_poison_entry_does_not_block_others(ingestor, redis_client):
+    """Test healthy entries read with a failing one are still written."""
+    await ingestor.append(make_batch(2))
+    await ingestor.append(poison_batch())
+    await ingestor.append(make_batch(3))
+    response = await redis_client.xreadgroup(
+        ingestor.group, "worker-a", {ingestor.stream: ">"}
+    )
+    with pytest.raises(ValueError):
+        await ingestor.process("worker-a", response[0][1])
+
+    assert [len(batch) for batch in ingestor.sink.batches] == [2, 3]
+    pending = await redis_client.xpending(ingestor.stream, ingestor.group)
+    assert pending["pending"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeatedly_failing_entry_is_dead_lettered(
+    ingestor, redis_client, override_config
+):
+    """Test an entry past STREAM_MAX_DELIVERIES moves to the dead-letter stream."""
+    override_config("performance", STREAM_MAX_DELIVERIES=2)
+    await ingestor.append(poison_batch())
+    await redis_client.xreadgroup(ingestor.group, "worker-a", {ingestor.stream: ">"})
+
+    # Second delivery: still retried, and still failing
+    await asyncio.sleep(0.02)
+    assert await ingestor.claim_idle("survivor", min_idle_ms=10) == 1
+    assert await redis_client.xlen(ingestor.dead_letter_stream) == 0
+
+    # Third delivery exceeds the limit
+    await asyncio.sleep(0.02)
+    assert await ingestor.claim_idle("survivor", min_idle_ms=10) == 1
+    [(_, fields)] = await redis_client.xrange(ingestor.dead_letter_stream)
+    assert fields[b"deliveries"] == b"3"
+    assert b"poison" in fields[b"records"]
+    assert await redis_client.xlen(ingestor.stream) == 0
+    pending = await redis_client.xpending(ingestor.stream, ingestor.group)
+    assert pending["pending"] == 0
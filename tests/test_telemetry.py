@@ -0,0 +1,177 @@
+"""
+Test cases for the telemetry module.
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+from opentelemetry import trace
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.instrumentation.redis import RedisInstrumentor
+from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import text
+
+from src import cache, database, telemetry
+from src.database import AsyncSessionLocal, close_db
+from src.telemetry import build_tracer_provider, init_tracing, instrument
+
+MS = 1_000_000
+
+
+@pytest.fixture
+def exporter():
+    """Provide an in-memory span exporter."""
+    return InMemorySpanExporter()
+
+
+def make_trace(tracer, name, duration_ms=1, error=False, children=1):
+    """Record a root span with children, at explicit times."""
+    start = 1_000_000_000 * MS
+    root = tracer.start_span(name, start_time=start)
+    with trace.use_span(root):
+        for i in range(children):
+            child = tracer.start_span(f"{name}.child{i}", start_time=start)
+            if error:
+                child.set_status(Status(StatusCode.ERROR))
+            child.end(end_time=start + MS)
+    root.end(end_time=start + duration_ms * MS)
+
+
+def exported_names(provider, exporter):
+    """Flush the provider and return the names of exported spans."""
+    provider.force_flush()
+    return sorted(span.name for span in exporter.get_finished_spans())
+
+
+def test_tail_sampling_keeps_slow_and_failed_traces(override_config, exporter):
+    """Test whole slow or failed traces are exported and fast ones dropped."""
+    override_config("monitoring", TRACE_TAIL_SAMPLING=True)
+    override_config("monitoring", TRACE_SAMPLE_RATIO=0.0)
+    override_config("monitoring", TRACE_SLOW_THRESHOLD_MS=100)
+    provider = build_tracer_provider(exporter)
+    tracer = provider.get_tracer(__name__)
+
+    make_trace(tracer, "fast")
+    make_trace(tracer, "slow", duration_ms=250)
+    make_trace(tracer, "failed", error=True)
+
+    assert exported_names(provider, exporter) == [
+        "failed",
+        "failed.child0",
+        "slow",
+        "slow.child0",
+    ]
+    provider.shutdown()
+
+
+def test_tail_sampling_baseline_ratio(override_config, exporter):
+    """Test ordinary traces are kept at TRACE_SAMPLE_RATIO."""
+    override_config("monitoring", TRACE_TAIL_SAMPLING=True)
+    override_config("monitoring", TRACE_SAMPLE_RATIO=1.0)
+    provider = build_tracer_provider(exporter)
+    make_trace(provider.get_tracer(__name__), "fast", children=2)
+    assert exported_names(provider, exporter) == ["fast", "fast.child0", "fast.child1"]
+    provider.shutdown()
+
+
+@pytest.mark.parametrize("ratio, exported", [(0.0, 0), (1.0, 2)])
+def test_head_sampling(override_config, exporter, ratio, exported):
+    """Test head sampling decides at the root without tail buffering."""
+    override_config("monitoring", TRACE_TAIL_SAMPLING=False)
+    override_config("monitoring", TRACE_SAMPLE_RATIO=ratio)
+    provider = build_tracer_provider(exporter)
+    make_trace(provider.get_tracer(__name__), "request")
+    assert len(exported_names(provider, exporter)) == exported
+    provider.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_instrumentation_traces_requests_queries_and_redis(
+    override_config, exporter
+):
+    """Test FastAPI, SQLAlchemy and Redis spans share one trace."""
+    override_config("monitoring", TRACE_TAIL_SAMPLING=False)
+    override_config("monitoring", TRACE_SAMPLE_RATIO=1.0)
+    provider = build_tracer_provider(exporter)
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("SELECT 1"))
+        await cache.get_redis().ping()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    instrument(app, provider)
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            assert (await client.get("/ping")).status_code == 200
+            assert (await client.get("/health")).status_code == 200
+    finally:
+        FastAPIInstrumentor.uninstrument_app(app)
+        SQLAlchemyInstrumentor().uninstrument()
+        RedisInstrumentor().uninstrument()
+        await cache.close_redis()
+        await close_db()
+
+    provider.force_flush()
+    spans = exporter.get_finished_spans()
+    [server] = [span for span in spans if span.kind is SpanKind.SERVER]
+    assert server.name == "GET /ping"
+    clients = [span for span in spans if span.kind is SpanKind.CLIENT]
+    assert {span.attributes.get("db.system") for span in clients} >= {
+        "postgresql",
+        "redis",
+    }
+    assert {span.context.trace_id for span in spans} == {server.context.trace_id}
+    provider.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_every_app_is_traced_without_building_engines(
+    override_config, exporter, monkeypatch
+):
+    """Test each app is instrumented and engines built later are traced."""
+    override_config("monitoring", ENABLE_TRACING=True)
+    override_config("monitoring", TRACE_TAIL_SAMPLING=False)
+    override_config("monitoring", TRACE_SAMPLE_RATIO=1.0)
+    provider = build_tracer_provider(exporter)
+    monkeypatch.setattr(telemetry, "_provider", provider)
+    for name in ("engine", "read_replicas", "AsyncSessionLocal"):
+        monkeypatch.delitem(vars(database), name, raising=False)
+
+    apps = [FastAPI(), FastAPI()]
+    for app in apps:
+
+        @app.get("/ping")
+        async def ping():
+            async with database.get_sessionmaker()() as session:
+                await session.execute(text("SELECT 1"))
+            return {"ok": True}
+
+        assert init_tracing(app) is provider
+    assert "engine" not in vars(database)
+    try:
+        for app in apps:
+            async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+                assert (await client.get("/ping")).status_code == 200
+    finally:
+        for app in apps:
+            FastAPIInstrumentor.uninstrument_app(app)
+        SQLAlchemyInstrumentor().uninstrument()
+        RedisInstrumentor().uninstrument()
+        await close_db()
+
+    provider.force_flush()
+    spans = exporter.get_finished_spans()
+    assert len([span for span in spans if span.kind is SpanKind.SERVER]) == 2
+    clients = [span for span in spans if span.kind is SpanKind.CLIENT]
+    assert {span.attributes.get("db.system") for span in clients} == {"postgresql"}
+    queries = [span for span in clients if span.name.startswith("SELECT")]
+    assert len(queries) == 2
+    provider.shutdown()
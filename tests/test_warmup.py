@@ -0,0 +1,89 @@
+"""
+Test cases for the warmup module.
+"""
+import asyncio
+
+import pytest
+from pytest_asyncio import fixture
+from sqlalchemy import text
+
+from src import cache, warmup
+from src.database import close_db, get_engine, init_db, warm_pool
+from src.models import Base
+from src.partitions import log_partitions
+
+
+@fixture
+async def tables():
+    """Create the log tables, dropping them and closing pools afterwards."""
+    engine = await init_db()
+    log_partitions.reset()
+    yield engine
+    log_partitions.reset()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await cache.close_redis()
+    await close_db()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_pools_and_prepares_statements(tables):
+    """Test every pooled connection is open and has the hot statements."""
+    opened = await warmup.warm_up()
+    size = tables.pool.size()
+    assert opened["primary"] == size
+    assert opened["redis"] == 4
+    assert tables.pool.checkedin() == size
+    assert log_partitions._known
+
+    async with tables.connect() as conn:
+        prepared = await conn.scalar(
+            text("SELECT count(*) FROM pg_prepared_statements")
+        )
+    assert prepared >= len(warmup.read_statements())
+    assert tables.pool.checkedin() == size
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_releases_connections_on_failure(tables):
+    """Test a failing connection releases the others and raises."""
+    calls = []
+
+    async def prepare(conn):
+        calls.append(conn)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await warm_pool(get_engine(), prepare)
+    assert get_engine().pool.checkedout() == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_up_failures_do_not_block_startup(tables, monkeypatch):
+    """Test a failed step is logged and the other step still counts."""
+
+    async def broken():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(warmup, "warm_redis", broken)
+    opened = await warmup.warm_up()
+    assert "redis" not in opened
+    assert opened["primary"] == tables.pool.size()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_timeout_and_disabled(monkeypatch, override_config):
+    """Test warm-up gives up after its timeout and can be turned off."""
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(warmup, "warm_postgres", slow)
+    override_config("performance", WARMUP_TIMEOUT_MS=10)
+    assert await warmup.warm_up() == {}
+
+    override_config("features", ENABLE_WARMUP=False)
+    monkeypatch.setattr(warmup, "warm_redis", slow)
+    assert await asyncio.wait_for(warmup.warm_up(), 0.1) == {}
+    await cache.close_redis()
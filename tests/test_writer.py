@@ -0,0 +1,151 @@
+"""
+Test cases for the writer module.
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from src.ingestion import BatchQueue
+from src.schemas import LogRecord
+from src.writer import ROWS_FAILED, LogWriter
+
+
+def make_batch(count):
+    """Build validated records for tests."""
+    now = datetime.now(timezone.utc)
+    return [
+        LogRecord(timestamp=now, service="api", message=f"event {i}")
+        for i in range(count)
+    ]
+
+
+class RecordingSink:
+    """Sink that records every flushed batch."""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(records))
+        return len(records)
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_on_size():
+    """Test that reaching batch_size triggers an immediate flush."""
+    queue = BatchQueue(maxsize=10)
+    sink = RecordingSink()
+    writer = LogWriter(queue, sink)
+    await writer.start()
+    writer.batch_size, writer.flush_interval = 5, 60
+
+    queue.put_nowait(make_batch(3))
+    queue.put_nowait(make_batch(3))
+    for _ in range(50):
+        if sink.batches:
+            break
+        await asyncio.sleep(0.01)
+    assert [len(batch) for batch in sink.batches] == [6]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_on_interval():
+    """Test that a partial batch is flushed once the interval elapses."""
+    queue = BatchQueue(maxsize=10)
+    sink = RecordingSink()
+    writer = LogWriter(queue, sink)
+    await writer.start()
+    writer.batch_size, writer.flush_interval = 1000, 0.05
+
+    queue.put_nowait(make_batch(2))
+    await asyncio.sleep(0.2)
+    assert [len(batch) for batch in sink.batches] == [2]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_writer_stop_drains_queue():
+    """Test that stopping the writer flushes everything still queued."""
+    queue = BatchQueue(maxsize=10)
+    sink = RecordingSink()
+    writer = LogWriter(queue, sink)
+    writer.batch_size = 4
+    for _ in range(3):
+        queue.put_nowait(make_batch(2))
+
+    writer._task = asyncio.create_task(asyncio.sleep(60))
+    await writer.stop(timeout=1)
+    assert [len(batch) for batch in sink.batches] == [4, 2]
+    assert queue.qsize() == 0
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_writer_stop_waits_for_flush_in_progress():
+    """Test stopping during a slow flush loses none of its records."""
+    queue = BatchQueue(maxsize=10)
+    written = []
+    started = asyncio.Event()
+
+    async def slow_sink(records):
+        started.set()
+        await asyncio.sleep(0.1)
+        written.extend(records)
+        return len(records)
+
+    writer = LogWriter(queue, slow_sink)
+    await writer.start()
+    writer.flush_interval = 0
+    queue.put_nowait(make_batch(3))
+    await started.wait()
+    queue.put_nowait(make_batch(2))
+    await writer.stop(timeout=5)
+    assert len(written) == 5
+    assert queue.qsize() == 0
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_writer_retries_failed_flush(monkeypatch):
+    """Test that transient sink failures are retried."""
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+    queue = BatchQueue(maxsize=10)
+    sink = RecordingSink(failures=2)
+    writer = LogWriter(queue, sink)
+    queue.put_nowait(make_batch(3))
+    await writer.drain()
+    assert [len(batch) for batch in sink.batches] == [3]
+
+
+@pytest.mark.asyncio
+async def test_writer_isolates_rejected_batch(monkeypatch):
+    """Test one batch the database rejects does not drop the other batches."""
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+    written = []
+
+    async def sink(records):
+        if any(record.message == "poison" for record in records):
+            raise ValueError("invalid byte sequence")
+        written.extend(records)
+        return len(records)
+
+    queue = BatchQueue(maxsize=10)
+    writer = LogWriter(queue, sink)
+    poison = make_batch(2)
+    poison[1].message = "poison"
+    for batch in (make_batch(3), poison, make_batch(4)):
+        queue.put_nowait(batch)
+    failed = ROWS_FAILED._value.get()
+    await writer.drain()
+    assert len(written) == 7
+    assert ROWS_FAILED._value.get() == failed + 2
+
+
+async def _no_sleep(delay):
+    """Skip retry backoff in tests."""